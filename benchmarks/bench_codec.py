@@ -0,0 +1,76 @@
+"""
+Decode cost per message for each installed JSON backend.
+
+Usage: python benchmarks/bench_codec.py [-n ITERATIONS]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+# Run from a checkout without installing: put the repository root on the path.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from kalshi import codec
+
+DELTA = json.dumps(
+    {
+        "type": "orderbook_delta",
+        "sid": 2,
+        "seq": 3,
+        "msg": {
+            "market_ticker": "KXBTCD-25JAN1821-T104249.99",
+            "price": 96,
+            "delta": -54,
+            "side": "yes",
+        },
+    }
+).encode()
+
+TRADES_PAGE = json.dumps(
+    {
+        "cursor": "CgsI2YuNwQYQiO",
+        "trades": [
+            {
+                "trade_id": f"00000000-0000-0000-0000-{i:012d}",
+                "ticker": "KXBTCD-25JAN1821-T104249.99",
+                "count": i % 50 + 1,
+                "created_time": "2025-01-18T20:59:59.123456Z",
+                "yes_price": i % 99 + 1,
+                "no_price": 99 - i % 99,
+                "taker_side": "yes" if i % 2 else "no",
+            }
+            for i in range(1000)
+        ],
+    }
+).encode()
+
+
+def bench(loads, payload: bytes, n: int) -> float:
+    start = time.perf_counter()
+    for _ in range(n):
+        loads(payload)
+    return (time.perf_counter() - start) / n
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("-n", type=int, default=200_000, help="orderbook_delta decodes per backend")
+    args = parser.parse_args()
+
+    print(f"{'backend':<10}{'delta frame':>16}{'1000-trade page':>20}")
+    for name in codec.BACKENDS:
+        try:
+            codec.use(name)
+        except ImportError:
+            print(f"{name:<10}{'not installed':>16}")
+            continue
+        delta = bench(codec.loads, DELTA, args.n)
+        page = bench(codec.loads, TRADES_PAGE, max(1, args.n // 1000))
+        print(f"{name:<10}{delta * 1e9:>13.0f} ns{page * 1e6:>17.1f} us")
+    codec.use()
+
+
+if __name__ == "__main__":
+    main()
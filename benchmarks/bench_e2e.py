@@ -0,0 +1,233 @@
+"""
+End-to-end throughput and latency of the clients against the local mock exchange.
+
+Starts benchmarks/mock_server.py in a subprocess and drives it through a KalshiClient:
+the sync client sequentially and from a thread pool, the async transport with many
+requests in flight, and a websocket client keeping OrderBooks current from an
+orderbook_delta stream. Reports requests/s or messages/s with p50/p99 latency.
+Request latency includes signing, rate limiting and any retries of 429 responses.
+Websocket latency runs from the server's send to on_message, so with the default
+unthrottled stream it is mostly queueing; pass a --message-rate below the measured
+rate to see the unloaded delivery latency.
+
+The client's rate limiters are opened up unless --tier is given, so the numbers show
+the client cost rather than the exchange limits. Client and server share the machine.
+
+Usage: python benchmarks/bench_e2e.py [-n REQUESTS] [--threads N] [--concurrency N]
+    [--messages N] [--markets M] [--latency S] [--jitter S] [--reject-rate P]
+    [--retry-after S] [--message-rate N] [--tier TIER]
+
+Requires aiohttp.
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+# Run from a checkout without installing: put the repository root on the path.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_sign import write_key
+
+from kalshi import KalshiClient
+from kalshi.rest import retry
+from kalshi.websocket import OrderBooks
+from kalshi.websocket.client import Client
+
+SERVER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "mock_server.py")
+TICKER = "KXMOCK-25JAN01-T{}"
+
+
+def percentiles(latencies: list) -> tuple:
+    cuts = statistics.quantiles(latencies, n=100)
+    return cuts[49], cuts[98]
+
+
+def report(label: str, count: int, elapsed: float, latencies: list, unit: str, errors: int = 0):
+    p50, p99 = percentiles(latencies)
+    line = (
+        f"{label:<34}{count / elapsed:>10.0f} {unit}/s"
+        f"{p50 * 1e3:>9.2f} ms p50{p99 * 1e3:>9.2f} ms p99"
+    )
+    print(line + (f"  {errors} errors" if errors else ""))
+
+
+def calls(resources, markets: int) -> dict:
+    """
+    The measured endpoints as ``name: call(i)``: a public read, a signed read and a
+    signed write.
+    """
+    return {
+        "GetMarket": lambda i: resources.market.GetMarket(TICKER.format(i % markets)),
+        "GetBalance": lambda i: resources.portfolio.GetBalance(),
+        "CreateOrder": lambda i: resources.portfolio.CreateOrder(
+            "buy", str(uuid.uuid4()), 1, "yes", TICKER.format(i % markets), "limit", yes_price=1
+        ),
+    }
+
+
+def run_sync(call, n: int, threads: int) -> tuple:
+    latencies = [0.0] * n
+    errors = 0
+
+    def one(i):
+        nonlocal errors
+        start = time.perf_counter()
+        try:
+            call(i)
+        except Exception:
+            errors += 1
+        latencies[i] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    if threads == 1:
+        for i in range(n):
+            one(i)
+    else:
+        with ThreadPoolExecutor(threads) as pool:
+            list(pool.map(one, range(n)))
+    return time.perf_counter() - start, latencies, errors
+
+
+async def run_async(call, n: int, concurrency: int) -> tuple:
+    latencies = [0.0] * n
+    errors = 0
+    indices = iter(range(n))
+
+    async def worker():
+        nonlocal errors
+        for i in indices:
+            start = time.perf_counter()
+            try:
+                await call(i)
+            except Exception:
+                errors += 1
+            latencies[i] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return time.perf_counter() - start, latencies, errors
+
+
+class Receiver(Client):
+    """
+    Subscribes to ``tickers`` and closes after ``target`` deltas, timing each one
+    from its ``sent_ns`` to on_message.
+    """
+
+    tickers = ()
+    target = 0
+
+    async def on_open(self):
+        self.latencies = []
+        await self.subscribe(["orderbook_delta"], list(self.tickers))
+
+    async def on_message(self, message):
+        if message["type"] != "orderbook_delta":
+            return
+        latencies = self.latencies
+        latencies.append((time.time_ns() - message["msg"]["sent_ns"]) / 1e9)
+        if len(latencies) == 1:
+            self.started = time.perf_counter()
+        elif len(latencies) == self.target:
+            self.elapsed = time.perf_counter() - self.started
+            await self.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("-n", type=int, default=2000, help="requests per measurement")
+    parser.add_argument("--threads", type=int, default=8, help="threads for the pooled sync run")
+    parser.add_argument("--concurrency", type=int, default=32, help="async requests in flight")
+    parser.add_argument("--messages", type=int, default=200_000, help="websocket deltas")
+    parser.add_argument("--markets", type=int, default=100, help="markets requested and streamed")
+    parser.add_argument("--latency", type=float, default=0.0, help="server delay in s")
+    parser.add_argument("--jitter", type=float, default=0.0, help="further uniform server delay")
+    parser.add_argument("--reject-rate", type=float, default=0.0, help="share of 429 responses")
+    parser.add_argument("--retry-after", type=float, default=None, help="Retry-After of 429s")
+    parser.add_argument(
+        "--message-rate", type=float, default=0.0, help="deltas per second, 0 = unthrottled"
+    )
+    parser.add_argument("--tier", default=None, help="apply this tier's rate limits")
+    args = parser.parse_args()
+
+    command = [
+        sys.executable,
+        SERVER,
+        "--port=0",
+        f"--latency={args.latency}",
+        f"--jitter={args.jitter}",
+        f"--reject-rate={args.reject_rate}",
+        f"--message-rate={args.message_rate}",
+        f"--markets={args.markets}",
+    ]
+    if args.retry_after is not None:
+        command.append(f"--retry-after={args.retry_after}")
+    server = subprocess.Popen(command, stdout=subprocess.PIPE, text=True)
+    try:
+        base_url = server.stdout.readline().strip()
+        if not base_url:
+            raise SystemExit("mock server failed to start")
+        with tempfile.TemporaryDirectory() as tmp:
+            key_path = os.path.join(tmp, "key.pem")
+            write_key(key_path)
+            limits = {} if args.tier else {"read_rate": 1e6, "write_rate": 1e6}
+            client = KalshiClient(
+                "benchmark",
+                key_path,
+                base_url=base_url,
+                tier=args.tier,
+                pool_maxsize=max(args.threads, 10),
+                connection_limit=args.concurrency,
+                **limits,
+            )
+            bench(client, args)
+        with urllib.request.urlopen(f"{base_url}/_mock/stats") as response:
+            stats = json.load(response)
+        print(f"server: {stats['requests']} requests, {stats['rejected']} rejected with 429")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def bench(client: KalshiClient, args) -> None:
+    retry.configure()
+    for name, call in calls(client, args.markets).items():
+        call(0)
+        for threads in (1, args.threads):
+            elapsed, latencies, errors = run_sync(call, args.n, threads)
+            report(f"sync {name} x{threads}", args.n, elapsed, latencies, "req", errors)
+
+    async def measure_async():
+        for name, call in calls(client.aio, args.markets).items():
+            await call(0)
+            elapsed, latencies, errors = await run_async(call, args.n, args.concurrency)
+            report(f"async {name} x{args.concurrency}", args.n, elapsed, latencies, "req", errors)
+        await client.aio.close()
+
+    asyncio.run(measure_async())
+
+    receiver = client.websocket(OrderBooks(), cls=Receiver)
+    receiver.tickers = [TICKER.format(i) for i in range(args.markets)]
+    receiver.target = args.messages
+    asyncio.run(receiver.connect())
+    report(
+        "websocket orderbook_delta",
+        args.messages,
+        receiver.elapsed,
+        receiver.latencies,
+        "msg",
+    )
+    client.close()
+
+
+if __name__ == "__main__":
+    main()
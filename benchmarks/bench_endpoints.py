@@ -0,0 +1,107 @@
+"""
+Per-call client overhead of the REST endpoint methods, with the network stubbed out.
+
+Compares the generated methods from kalshi.rest.endpoints against the previous
+style of hand-written methods that captured their arguments with get_kwargs().
+
+Usage: python benchmarks/bench_endpoints.py [-n CALLS]
+"""
+import argparse
+import os
+import sys
+import time
+
+# Run from a checkout without installing: put the repository root on the path.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import kalshi.constants
+from kalshi.rest import endpoints
+from kalshi.rest.cache import cached
+from kalshi.rest.rest import Resource, drop_none, get_kwargs
+
+
+def _stub_get(url, headers=None, **kwargs):
+    for i in kwargs:
+        if isinstance(kwargs[i], bool):
+            kwargs[i] = str(kwargs[i]).lower()
+    return url, kwargs or None
+
+
+class LegacyMarket:
+    """
+    The endpoint methods as they were written before the declarative table.
+    """
+
+    def GetTrades(
+        self,
+        cursor: str = None,
+        limit: int = 100,
+        ticker: str = None,
+        min_ts: int = None,
+        max_ts: int = None,
+    ):
+        return _stub_get(
+            f"{kalshi.constants.BASE_URL}{kalshi.constants.BASE_PATH}/markets/trades",
+            **drop_none(get_kwargs()),
+        )
+
+    def GetEvents(
+        self,
+        limit: int = 100,
+        cursor: str = None,
+        status: str = None,
+        series_ticker: str = None,
+        with_nested_markets: bool = False,
+    ):
+        return _stub_get(
+            f"{kalshi.constants.BASE_URL}{kalshi.constants.BASE_PATH}/events",
+            **drop_none(get_kwargs()),
+        )
+
+    @cached
+    def GetMarket(self, ticker: str):
+        return _stub_get(
+            f"{kalshi.constants.BASE_URL}{kalshi.constants.BASE_PATH}/markets/{ticker}"
+        )
+
+
+class StubResource(Resource):
+    def _request(self, endpoint, method, url, params, body, auth):
+        return url, params
+
+
+@endpoints.define(endpoints.MARKET)
+class GeneratedMarket(StubResource):
+    pass
+
+
+CALLS = {
+    "GetTrades(ticker=..., min_ts=...)": lambda m: m.GetTrades(ticker="KXBTC", min_ts=1700000000),
+    "GetEvents(with_nested_markets=True)": lambda m: m.GetEvents(with_nested_markets=True),
+    "GetMarket(ticker)": lambda m: m.GetMarket("KXBTC"),
+}
+
+
+def per_call(fn, market, n: int) -> float:
+    start = time.perf_counter()
+    for _ in range(n):
+        fn(market)
+    return (time.perf_counter() - start) / n
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("-n", type=int, default=200000, help="calls per measurement")
+    args = parser.parse_args()
+
+    legacy, generated = LegacyMarket(), GeneratedMarket()
+    print(f"{'call':<40}{'get_kwargs':>12}{'generated':>12}{'speedup':>10}")
+    for label, fn in CALLS.items():
+        assert fn(legacy) == fn(generated), label
+        before = per_call(fn, legacy, args.n)
+        after = per_call(fn, generated, args.n)
+        print(f"{label:<40}{before * 1e6:>9.2f} us{after * 1e6:>9.2f} us{before / after:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
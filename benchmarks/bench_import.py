@@ -0,0 +1,92 @@
+"""
+Import cost of the package entry points, each measured in fresh interpreters.
+
+Usage: python benchmarks/bench_import.py [-n RUNS] [--check] [--max-ms MS]
+
+With --check the script exits non-zero if an entry point loads a heavy
+dependency it does not need, or (with --max-ms) takes longer than MS to import.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+# Run from a checkout without installing: the probes import from the repository root.
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PYTHONPATH = os.environ.get("PYTHONPATH")
+
+HEAVY = (
+    "aiohttp",
+    "asyncio",
+    "cryptography",
+    "matplotlib",
+    "numpy",
+    "pandas",
+    "requests",
+    "websockets",
+)
+
+# Entry point -> heavy modules it is allowed to load.
+CASES = {
+    "import kalshi": (),
+    "import kalshi.utils": (),
+    "import kalshi.codec": (),
+    "from kalshi.rest import market": ("requests",),
+    "from kalshi.rest import portfolio": ("requests",),
+    "from kalshi.rest import limiter": ("requests",),
+    "import kalshi.websocket": (),
+    "from kalshi.websocket import OrderBook": (),
+    "from kalshi.websocket import Dispatcher": ("asyncio",),
+    "from kalshi.websocket import Recorder": ("asyncio",),
+    "from kalshi.websocket import PortfolioState": ("asyncio",),
+    "from kalshi.websocket import Client": ("asyncio", "websockets"),
+}
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"ms": elapsed * 1000, "loaded": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def measure(statement: str) -> dict:
+    out = subprocess.run(
+        [sys.executable, "-c", PROBE.format(statement=statement, heavy=HEAVY)],
+        check=True,
+        capture_output=True,
+        env={**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, (ROOT, PYTHONPATH)))},
+        text=True,
+    ).stdout
+    return json.loads(out)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("-n", type=int, default=5, help="fresh interpreters per entry point")
+    parser.add_argument("--check", action="store_true", help="fail on unexpected heavy imports")
+    parser.add_argument("--max-ms", type=float, help="fail if a median import exceeds this")
+    args = parser.parse_args()
+
+    failures = []
+    for statement, allowed in CASES.items():
+        runs = [measure(statement) for _ in range(args.n)]
+        median = statistics.median(r["ms"] for r in runs)
+        loaded = runs[-1]["loaded"]
+        print(f"{statement:<42}{median:>9.1f} ms   loads: {', '.join(loaded) or '-'}")
+        unexpected = sorted(set(loaded) - set(allowed))
+        if unexpected:
+            failures.append(f"{statement!r} loads {', '.join(unexpected)}")
+        if args.max_ms is not None and median > args.max_ms:
+            failures.append(f"{statement!r} takes {median:.1f} ms (limit {args.max_ms} ms)")
+
+    if args.check and failures:
+        print("\n".join(["", "FAILED:"] + failures))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Frame log throughput: recording, reading and replaying synthetic order book traffic.
+
+Records N orderbook_delta frames over a few hundred markets with
+kalshi.websocket.Recorder, then measures how fast kalshi.websocket.Replay reads
+them back and how fast it replays them through a Client keeping OrderBooks.
+
+Usage: python benchmarks/bench_replay.py [-n FRAMES] [--markets M] [--compression zlib|none]
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+
+# Run from a checkout without installing: put the repository root on the path.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from kalshi import codec
+from kalshi.websocket import OrderBooks, Recorder, Replay
+from kalshi.websocket.client import Client
+
+
+def synthetic_frames(n: int, markets: int) -> list:
+    rng = random.Random(0)
+    tickers = [f"KXBENCH-25JAN01-T{i}" for i in range(markets)]
+    frames = [
+        codec.dumpb(
+            {
+                "type": "orderbook_snapshot",
+                "sid": 1,
+                "seq": i + 1,
+                "msg": {"market_ticker": t, "yes": [[50, 100]], "no": [[49, 100]]},
+            }
+        )
+        for i, t in enumerate(tickers)
+    ]
+    for seq in range(markets + 1, n + 1):
+        frames.append(
+            codec.dumpb(
+                {
+                    "type": "orderbook_delta",
+                    "sid": 1,
+                    "seq": seq,
+                    "msg": {
+                        "market_ticker": tickers[rng.randrange(markets)],
+                        "price": rng.randint(1, 99),
+                        "delta": rng.randint(1, 20),
+                        "side": "yes" if rng.random() < 0.5 else "no",
+                    },
+                }
+            )
+        )
+    return frames
+
+
+class Quiet(Client):
+    async def on_message(self, message):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("-n", type=int, default=1_000_000, help="frames to record")
+    parser.add_argument("--markets", type=int, default=500, help="distinct market tickers")
+    parser.add_argument("--compression", default="zlib", choices=("zlib", "none"))
+    args = parser.parse_args()
+
+    frames = synthetic_frames(args.n, args.markets)
+    with tempfile.TemporaryDirectory() as path:
+        start = time.perf_counter()
+        with Recorder(path, compression=args.compression) as recorder:
+            record = recorder.record
+            ts = time.time_ns()
+            for i, frame in enumerate(frames):
+                record(frame, ts + i * 1000)
+        elapsed = time.perf_counter() - start
+        stats = recorder.stats()
+        size = sum(os.path.getsize(os.path.join(path, f)) for f in os.listdir(path))
+        print(
+            f"record   {args.n / elapsed / 1e6:8.2f} M frames/s  "
+            f"{stats['bytes'] / 1e6:.0f} MB -> {size / 1e6:.1f} MB on disk"
+        )
+
+        replay = Replay(path)
+        start = time.perf_counter()
+        count = sum(len(frames) for _, frames in replay.blocks())
+        elapsed = time.perf_counter() - start
+        assert count == args.n
+        print(f"blocks   {count / elapsed / 1e6:8.2f} M frames/s")
+
+        start = time.perf_counter()
+        for _ in replay.frames():
+            pass
+        elapsed = time.perf_counter() - start
+        print(f"frames   {count / elapsed / 1e6:8.2f} M frames/s")
+
+        client = Quiet(orderbooks=OrderBooks())
+        start = time.perf_counter()
+        count = asyncio.run(replay.run(client))
+        elapsed = time.perf_counter() - start
+        print(f"replay   {count / elapsed / 1e6:8.2f} M frames/s  through Client with OrderBooks")
+
+
+if __name__ == "__main__":
+    main()
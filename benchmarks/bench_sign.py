@@ -0,0 +1,77 @@
+"""
+Request signing throughput: signatures per second for the signing paths.
+
+Usage: python benchmarks/bench_sign.py [-n SIGNATURES] [--workers N]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+# Run from a checkout without installing: put the repository root on the path.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+from kalshi.auth import Auth
+
+URL = "https://api.elections.kalshi.com/trade-api/v2/portfolio/orders"
+
+
+def write_key(path: str) -> None:
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    with open(path, "wb") as f:
+        f.write(
+            key.private_bytes(
+                serialization.Encoding.PEM,
+                serialization.PrivateFormat.PKCS8,
+                serialization.NoEncryption(),
+            )
+        )
+
+
+def report(label: str, n: int, elapsed: float) -> None:
+    print(f"{label:<40}{n / elapsed:>10.0f} sig/s{elapsed / n * 1e6:>10.0f} us/sig")
+
+
+async def burst(auth: Auth, n: int) -> float:
+    start = time.perf_counter()
+    await asyncio.gather(*(auth.request_headers_async("POST", URL) for _ in range(n)))
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("-n", type=int, default=2000, help="signatures per measurement")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="pool size")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        key_path = os.path.join(tmp, "key.pem")
+        write_key(key_path)
+        auth = Auth()
+        auth.set_key("benchmark", key_path)
+
+        start = time.perf_counter()
+        for _ in range(args.n):
+            auth.signer.sign("1700000000000POST/trade-api/v2/portfolio/orders")
+        report("Signer.sign", args.n, time.perf_counter() - start)
+
+        start = time.perf_counter()
+        for _ in range(args.n):
+            auth.request_headers("POST", URL)
+        report("Auth.request_headers", args.n, time.perf_counter() - start)
+
+        for kind in ("thread", "process"):
+            auth.use_sign_pool(kind, args.workers)
+            asyncio.run(burst(auth, args.workers))  # warm up the pool
+            elapsed = asyncio.run(burst(auth, args.n))
+            report(f"request_headers_async ({kind} x{args.workers})", args.n, elapsed)
+        auth.use_sign_pool(None)
+
+
+if __name__ == "__main__":
+    main()
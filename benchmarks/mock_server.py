@@ -0,0 +1,509 @@
+"""
+Local stand-in for the Kalshi exchange, for benchmarks and offline testing.
+
+Serves every REST endpoint declared in kalshi.rest.endpoints under BASE_PATH with
+plausible synthetic responses, and the websocket protocol under WS_PATH:
+subscribe, update_subscription and unsubscribe, with an orderbook_snapshot per
+market followed by a stream of orderbook_delta messages. Order books are shared
+between the two, so GetMarketOrderbook matches what the websocket has sent.
+
+Authenticated endpoints require the KALSHI-ACCESS-* headers but signatures are not
+verified. Each REST response can be delayed by a fixed latency plus uniform
+jitter, and a share of requests is answered with 429 (optionally with
+Retry-After). Deltas are generated at a fixed rate across all subscribed markets,
+or as fast as the clients read them with --message-rate 0. Each delta carries its
+send time in ns as msg["sent_ns"], which the real exchange does not send.
+
+GET /_mock/stats returns the request, rejection and message counters.
+
+Usage: python benchmarks/mock_server.py [--port PORT] [--latency S] [--jitter S]
+    [--reject-rate P] [--retry-after S] [--message-rate N] [--markets M]
+
+Requires aiohttp. The first line printed is the base URL, e.g. http://127.0.0.1:8000.
+"""
+import argparse
+import asyncio
+import os
+import random
+import socket
+import sys
+import time
+import uuid
+
+# Run from a checkout without installing: put the repository root on the path.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aiohttp import web
+
+from kalshi import codec
+from kalshi.constants import BASE_PATH, WS_PATH
+from kalshi.rest.endpoints import COLLECTION, EXCHANGE, MARKET, PORTFOLIO
+
+AUTH_HEADER = "KALSHI-ACCESS-KEY"
+# Records a paginated endpoint returns across all of its pages.
+PAGE_TOTAL = 1000
+
+
+def _market(ticker: str) -> dict:
+    return {
+        "ticker": ticker,
+        "event_ticker": ticker.rsplit("-", 1)[0],
+        "status": "active",
+        "yes_bid": 49,
+        "yes_ask": 51,
+        "no_bid": 49,
+        "no_ask": 51,
+        "last_price": 50,
+        "volume": 1000,
+        "open_interest": 500,
+    }
+
+
+def _order(ticker: str = "KXMOCK-25JAN01-T0", **fields) -> dict:
+    order = {
+        "order_id": str(uuid.uuid4()),
+        "ticker": ticker,
+        "status": "resting",
+        "action": "buy",
+        "side": "yes",
+        "type": "limit",
+        "yes_price": 50,
+        "no_price": 50,
+        "remaining_count": 1,
+        "created_time": "2025-01-01T00:00:00Z",
+    }
+    order.update(fields)
+    return order
+
+
+# Synthetic record of each paginated endpoint, given its index.
+RECORDS = {
+    "GetTrades": lambda i: {
+        "trade_id": str(i),
+        "ticker": "KXMOCK-25JAN01-T0",
+        "yes_price": 50,
+        "no_price": 50,
+        "count": 1 + i % 10,
+        "taker_side": "yes" if i % 2 else "no",
+        "created_time": "2025-01-01T00:00:00Z",
+    },
+    "GetMarkets": lambda i: _market(f"KXMOCK-25JAN01-T{i}"),
+    "GetEvents": lambda i: {"event_ticker": f"KXMOCK-25JAN{i:02d}", "series_ticker": "KXMOCK"},
+    "GetFills": lambda i: {"trade_id": str(i), "ticker": "KXMOCK-25JAN01-T0", "count": 1},
+    "GetOrders": lambda i: _order(order_id=str(i)),
+    "GetPositions": lambda i: {"ticker": f"KXMOCK-25JAN01-T{i}", "position": 1},
+    "GetPortfolioSettlements": lambda i: {"ticker": f"KXMOCK-25JAN01-T{i}", "revenue": 0},
+    "GetMultivariateEventCollections": lambda i: {"collection_ticker": f"KXMVE-{i}"},
+}
+
+
+class Connection:
+    """
+    One websocket connection and its subscriptions.
+    """
+
+    def __init__(self, ws):
+        self.ws = ws
+        self.channels = {}  # sid -> channel
+        self.seqs = {}  # sid -> seq of the last message sent
+        self.tickers = {}  # sid -> subscribed market tickers
+        self.next_sid = 1
+
+    def open(self, channel: str) -> int:
+        sid = self.next_sid
+        self.next_sid += 1
+        self.channels[sid] = channel
+        self.seqs[sid] = 0
+        self.tickers[sid] = set()
+        return sid
+
+    def close(self, sid: int) -> set:
+        del self.channels[sid], self.seqs[sid]
+        return self.tickers.pop(sid)
+
+    async def send(self, sid: int, kind: str, msg: dict) -> None:
+        seq = self.seqs[sid] = self.seqs[sid] + 1
+        await self.ws.send_str(codec.dumps({"type": kind, "sid": sid, "seq": seq, "msg": msg}))
+
+    async def reply(self, reply: dict, **fields) -> None:
+        await self.ws.send_str(codec.dumps({**reply, **fields}))
+
+
+class MockExchange:
+    """
+    Mock exchange state and the aiohttp handlers serving it.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        reject_rate: float = 0.0,
+        retry_after: float = None,
+        message_rate: float = 1000.0,
+        markets: int = 100,
+        seed: int = 0,
+    ):
+        """
+        :param latency: Seconds every REST response is delayed by.
+        :param jitter: Up to this many further seconds, uniformly distributed.
+        :param reject_rate: Share of REST requests answered with 429.
+        :param retry_after: Retry-After seconds sent with each 429 (default = no header).
+        :param message_rate: orderbook_delta messages per second across all subscribed
+            markets; 0 sends them as fast as the connections accept them.
+        :param markets: Markets KXMOCK-25JAN01-T0 ... T{markets - 1} with order books.
+            Other tickers get an empty book on first use.
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.reject_rate = reject_rate
+        self.retry_after = retry_after
+        self.message_rate = message_rate
+        self.random = random.Random(seed)
+        self.books = {}
+        for i in range(markets):
+            self._book(f"KXMOCK-25JAN01-T{i}")
+        # ticker -> {Connection: sid} of every orderbook_delta subscription carrying it.
+        self.subscribers = {}
+        self.requests = 0
+        self.rejected = 0
+        self.messages = 0
+        self._wake = asyncio.Event()
+
+    def _book(self, ticker: str) -> dict:
+        book = self.books.get(ticker)
+        if book is None:
+            rng = self.random
+            book = self.books[ticker] = {
+                "yes": {p: rng.randint(1, 100) for p in range(40, 50)},
+                "no": {p: rng.randint(1, 100) for p in range(40, 50)},
+            }
+        return book
+
+    def snapshot(self, ticker: str) -> dict:
+        book = self._book(ticker)
+        return {
+            "market_ticker": ticker,
+            "yes": [[p, q] for p, q in sorted(book["yes"].items()) if q],
+            "no": [[p, q] for p, q in sorted(book["no"].items()) if q],
+        }
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get(WS_PATH, self.websocket)
+        app.router.add_get("/_mock/stats", self.stats)
+        specs = MARKET + EXCHANGE + COLLECTION + PORTFOLIO
+        # Fixed paths first, so "/portfolio/orders/batched" is not taken for an order id.
+        for spec in sorted(specs, key=lambda spec: len(spec.path_params)):
+            app.router.add_route(spec.method, BASE_PATH + spec.path, self._handler(spec))
+        app.on_startup.append(self._start_pump)
+        app.on_cleanup.append(self._stop_pump)
+        return app
+
+    async def stats(self, request) -> web.Response:
+        return web.json_response(
+            {"requests": self.requests, "rejected": self.rejected, "messages": self.messages}
+        )
+
+    # REST
+
+    def _handler(self, spec):
+        respond = getattr(self, f"_{spec.name}", None)
+
+        async def handle(request):
+            self.requests += 1
+            if self.latency or self.jitter:
+                await asyncio.sleep(self.latency + self.random.uniform(0, self.jitter))
+            if self.reject_rate and self.random.random() < self.reject_rate:
+                self.rejected += 1
+                headers = {}
+                if self.retry_after is not None:
+                    headers["Retry-After"] = str(self.retry_after)
+                return web.json_response(
+                    {"error": {"code": "too_many_requests"}}, status=429, headers=headers
+                )
+            if spec.auth and AUTH_HEADER not in request.headers:
+                return web.json_response({"error": {"code": "unauthorized"}}, status=401)
+            args = dict(request.query)
+            if request.can_read_body:
+                args.update(await request.json(loads=codec.loads))
+            args.update(request.match_info)
+            if respond is not None:
+                body = respond(args)
+            elif spec.page is not None:
+                body = self._page(spec, args)
+            else:
+                body = {}
+            return web.json_response(
+                body, status=201 if spec.method == "POST" else 200, dumps=codec.dumps
+            )
+
+        return handle
+
+    def _page(self, spec, args: dict) -> dict:
+        start = int(args.get("cursor") or 0)
+        end = min(start + int(args.get("limit") or 100), PAGE_TOTAL)
+        record = RECORDS.get(spec.name, lambda i: {"id": i})
+        return {
+            spec.page: [record(i) for i in range(start, end)],
+            "cursor": str(end) if end < PAGE_TOTAL else "",
+        }
+
+    def _GetMarket(self, args):
+        return {"market": _market(args["ticker"])}
+
+    def _GetMarketOrderbook(self, args):
+        snapshot = self.snapshot(args["ticker"])
+        return {"orderbook": {"yes": snapshot["yes"], "no": snapshot["no"]}}
+
+    def _GetEvent(self, args):
+        return {"event": {"event_ticker": args["event_ticker"]}, "markets": []}
+
+    def _GetSeries(self, args):
+        return {"series": {"ticker": args["series_ticker"]}}
+
+    def _GetMarketCandlesticks(self, args):
+        period = int(args["period_interval"]) * 60
+        start = int(args["start_ts"]) // period * period + period
+        return {
+            "ticker": args["ticker"],
+            "candlesticks": [
+                {
+                    "end_period_ts": ts,
+                    "price": {"open": 50, "high": 51, "low": 49, "close": 50},
+                    "volume": 10,
+                    "open_interest": 100,
+                }
+                for ts in range(start, int(args["end_ts"]) + 1, period)
+            ],
+        }
+
+    def _GetMultivariateEventCollection(self, args):
+        return {"multivariate_contract": {"collection_ticker": args["collection_ticker"]}}
+
+    def _GetExchangeStatus(self, args):
+        return {"exchange_active": True, "trading_active": True}
+
+    def _GetExchangeSchedule(self, args):
+        return {"schedule": {"standard_hours": [], "maintenance_windows": []}}
+
+    def _GetExchangeAnnouncements(self, args):
+        return {"announcements": []}
+
+    def _GetBalance(self, args):
+        return {"balance": 100_000}
+
+    def _GetPortfolioRestingOrderTotalValue(self, args):
+        return {"total_resting_order_value": 0}
+
+    def _GetOrder(self, args):
+        return {"order": _order(order_id=args["order_id"])}
+
+    def _CreateOrder(self, args):
+        return {"order": _order(args["ticker"], client_order_id=args.get("client_order_id"))}
+
+    def _BatchCreateOrders(self, args):
+        return {"orders": [self._CreateOrder(order) | {"error": None} for order in args["orders"]]}
+
+    def _AmendOrder(self, args):
+        return {
+            "old_order": _order(args["ticker"], order_id=args["order_id"]),
+            "order": _order(args["ticker"], order_id=args["order_id"]),
+        }
+
+    def _DecreaseOrder(self, args):
+        return {"order": _order(order_id=args["order_id"])}
+
+    def _CancelOrder(self, args):
+        return {"order": _order(order_id=args["order_id"], status="canceled"), "reduced_by": 1}
+
+    def _BatchCancelOrders(self, args):
+        return {
+            "orders": [
+                {"order": _order(order_id=i, status="canceled"), "reduced_by": 1, "error": None}
+                for i in args["ids"]
+            ]
+        }
+
+    # Websocket
+
+    async def websocket(self, request) -> web.WebSocketResponse:
+        if AUTH_HEADER not in request.headers:
+            return web.Response(status=401)
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        connection = Connection(ws)
+        try:
+            async for raw in ws:
+                if raw.type == web.WSMsgType.TEXT:
+                    await self._command(connection, codec.loads(raw.data))
+        finally:
+            for tickers in connection.tickers.values():
+                self._remove(connection, tickers)
+        return ws
+
+    def _remove(self, connection, tickers) -> None:
+        for ticker in tickers:
+            subscribers = self.subscribers.get(ticker)
+            if subscribers is not None:
+                subscribers.pop(connection, None)
+                if not subscribers:
+                    del self.subscribers[ticker]
+
+    async def _add(self, connection, sid: int, tickers: list) -> None:
+        connection.tickers[sid].update(tickers)
+        if connection.channels[sid] != "orderbook_delta":
+            return
+        for ticker in tickers:
+            self.subscribers.setdefault(ticker, {})[connection] = sid
+            await connection.send(sid, "orderbook_snapshot", self.snapshot(ticker))
+        self._wake.set()
+
+    async def _command(self, connection, command: dict) -> None:
+        params = command.get("params", {})
+        cmd = command.get("cmd")
+        reply = {"id": command.get("id")}
+        if cmd == "subscribe":
+            for channel in params.get("channels", []):
+                sid = connection.open(channel)
+                await connection.reply(
+                    reply, type="subscribed", msg={"channel": channel, "sid": sid}
+                )
+                await self._add(connection, sid, params.get("market_tickers", []))
+        elif cmd == "update_subscription":
+            tickers = params.get("market_tickers", [])
+            for sid in params.get("sids", []):
+                if sid not in connection.channels:
+                    continue
+                if params.get("action") == "add_markets":
+                    await self._add(connection, sid, tickers)
+                else:
+                    self._remove(connection, tickers)
+                    connection.tickers[sid].difference_update(tickers)
+                connection.seqs[sid] += 1
+                await connection.reply(
+                    reply,
+                    type="ok",
+                    sid=sid,
+                    seq=connection.seqs[sid],
+                    msg={"market_tickers": sorted(connection.tickers[sid])},
+                )
+        elif cmd == "unsubscribe":
+            for sid in params.get("sids", []):
+                if sid in connection.channels:
+                    self._remove(connection, connection.close(sid))
+                    await connection.reply(reply, type="unsubscribed", sid=sid)
+        else:
+            await connection.reply(reply, type="error", msg={"code": 8, "msg": "Unknown command"})
+
+    def _delta(self, ticker: str) -> dict:
+        rng = self.random
+        side = "yes" if rng.random() < 0.5 else "no"
+        levels = self.books[ticker][side]
+        price = rng.randint(30, 49)
+        quantity = levels.get(price, 0)
+        delta = rng.randint(-quantity, 20) or 1
+        levels[price] = quantity + delta
+        return {
+            "market_ticker": ticker,
+            "price": price,
+            "delta": delta,
+            "side": side,
+            "sent_ns": time.time_ns(),
+        }
+
+    async def _pump(self) -> None:
+        """
+        Send orderbook_delta messages for random subscribed markets at ``message_rate``.
+        """
+        rate = self.message_rate
+        batch = 100
+        sent = 0
+        started = time.perf_counter()
+        while True:
+            if not self.subscribers:
+                self._wake.clear()
+                await self._wake.wait()
+                sent = 0
+                started = time.perf_counter()
+            if rate:
+                due = int((time.perf_counter() - started) * rate) - sent
+                if due <= 0:
+                    await asyncio.sleep(max(1 / rate, 0.001))
+                    continue
+                count = min(due, batch)
+            else:
+                count = batch
+            tickers = list(self.subscribers)
+            for ticker in self.random.choices(tickers, k=count):
+                connections = self.subscribers.get(ticker)
+                if not connections:
+                    continue
+                msg = self._delta(ticker)
+                for connection, sid in list(connections.items()):
+                    if not connection.ws.closed:
+                        await connection.send(sid, "orderbook_delta", msg)
+                        self.messages += 1
+            sent += count
+            # Let the connections read commands between batches.
+            await asyncio.sleep(0)
+
+    async def _start_pump(self, app) -> None:
+        app["pump"] = asyncio.create_task(self._pump())
+
+    async def _stop_pump(self, app) -> None:
+        app["pump"].cancel()
+
+
+async def serve(exchange: MockExchange, host: str = "127.0.0.1", port: int = 0):
+    """
+    Start serving ``exchange`` and return ``(runner, base_url)``. Port 0 picks a free port.
+    Stop with ``await runner.cleanup()``.
+    """
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    runner = web.AppRunner(exchange.app(), access_log=None)
+    await runner.setup()
+    await web.SockSite(runner, sock).start()
+    return runner, f"http://{host}:{sock.getsockname()[1]}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000, help="0 picks a free port")
+    parser.add_argument("--latency", type=float, default=0.0, help="REST response delay in s")
+    parser.add_argument("--jitter", type=float, default=0.0, help="further uniform delay in s")
+    parser.add_argument("--reject-rate", type=float, default=0.0, help="share of 429 responses")
+    parser.add_argument("--retry-after", type=float, default=None, help="Retry-After of 429s")
+    parser.add_argument(
+        "--message-rate", type=float, default=1000.0, help="deltas per second, 0 = unthrottled"
+    )
+    parser.add_argument("--markets", type=int, default=100, help="markets with order books")
+    args = parser.parse_args()
+
+    async def run():
+        exchange = MockExchange(
+            args.latency,
+            args.jitter,
+            args.reject_rate,
+            args.retry_after,
+            args.message_rate,
+            args.markets,
+        )
+        runner, url = await serve(exchange, args.host, args.port)
+        print(url, flush=True)
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await runner.cleanup()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
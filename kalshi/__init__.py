@@ -1,4 +1,29 @@
-from . import rest
-from .auth import auth
-from . import websocket
-from . import constants
+import importlib
+
+# Submodules are imported on first access, so ``import kalshi`` stays cheap and
+# e.g. ``kalshi.rest`` never pulls in websockets or the cryptography stack.
+_SUBMODULES = (
+    "auth",
+    "candles",
+    "client",
+    "codec",
+    "constants",
+    "rest",
+    "store",
+    "utils",
+    "websocket",
+)
+
+
+def __getattr__(name: str):
+    if name == "KalshiClient":
+        from .client import KalshiClient
+
+        return KalshiClient
+    if name in _SUBMODULES:
+        return importlib.import_module(f".{name}", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_SUBMODULES) | {"KalshiClient"})
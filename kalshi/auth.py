@@ -1,17 +1,33 @@
 import base64
-import datetime
+import functools
+import time
 import urllib.parse
-from cryptography.hazmat.primitives import hashes, serialization
-from cryptography.hazmat.primitives.asymmetric import padding, rsa
-from cryptography.exceptions import InvalidSignature
-from cryptography.hazmat.backends import default_backend
+
+# The cryptography stack is slow to import, so it is loaded by the first Signer.
+hashes = serialization = padding = InvalidSignature = default_backend = None
+
+
+def _load_cryptography() -> None:
+    global hashes, serialization, padding, InvalidSignature, default_backend
+    if hashes is None:
+        from cryptography.hazmat.primitives import hashes, serialization
+        from cryptography.hazmat.primitives.asymmetric import padding
+        from cryptography.exceptions import InvalidSignature
+        from cryptography.hazmat.backends import default_backend
 
 
 class Signer:
     def __init__(self, private_key_file: str, key_password: bytes = None):
-        self._private_key: rsa.RSAPrivateKey = self._load_private_key_from_file(
+        _load_cryptography()
+        self._private_key = self._load_private_key_from_file(
             private_key_file, key_password
         )
+        # The padding and hash objects are immutable, so build them once.
+        self._hash = hashes.SHA256()
+        self._padding = padding.PSS(
+            mgf=padding.MGF1(self._hash),
+            salt_length=padding.PSS.DIGEST_LENGTH,
+        )
 
     def _load_private_key_from_file(self, file_path: str, password: bytes = None):
         with open(file_path, "rb") as key_file:
@@ -23,48 +39,128 @@ class Signer:
         return private_key
 
     def sign(self, text: str) -> str:
-        message = text.encode("utf-8")
         try:
             signature = self._private_key.sign(
-                message,
-                padding.PSS(
-                    mgf=padding.MGF1(hashes.SHA256()),
-                    salt_length=padding.PSS.DIGEST_LENGTH,
-                ),
-                hashes.SHA256(),
+                text.encode("utf-8"), self._padding, self._hash
             )
-            return base64.b64encode(signature).decode("utf-8")
+            return base64.b64encode(signature).decode("ascii")
         except InvalidSignature as e:
             raise ValueError("RSA sign PSS failed") from e
 
 
+@functools.lru_cache(maxsize=4096)
+def _url_path(url: str) -> str:
+    return urllib.parse.urlparse(url).path
+
+
+# Signer owned by a signing worker process, loaded once by _init_sign_worker.
+_worker_signer = None
+
+
+def _init_sign_worker(private_key_path: str) -> None:
+    global _worker_signer
+    _worker_signer = Signer(private_key_path)
+
+
+def _sign_in_worker(text: str) -> str:
+    return _worker_signer.sign(text)
+
+
 class Auth:
     def __init__(self):
         self.API_PRIVATE_KEY_PATH = None
         self.API_ACCESS_KEY = None
         self.signer = None
+        self.sign_executor = None
 
     def set_key(self, access_key: str, private_key_path: str) -> None:
         self.API_PRIVATE_KEY_PATH = private_key_path
         self.API_ACCESS_KEY = access_key
         self.signer = Signer(self.API_PRIVATE_KEY_PATH)
 
-    def request_headers(self, method: str, url: str):
+    def _check_signer(self):
         if self.signer is None:
             raise RuntimeError(
                 "Kalshi credentials not configured. Call auth.set_key(...) before making requests."
             )
-        current_time = datetime.datetime.now()
-        timestamp = current_time.timestamp()
-        current_time_milliseconds = int(timestamp * 1000)
-        timestamp_str = str(current_time_milliseconds)
-        sig = self.signer.sign(timestamp_str + method + urllib.parse.urlparse(url).path)
-        headers = {
+
+    def _headers(self, timestamp_str: str, sig: str):
+        return {
             "KALSHI-ACCESS-KEY": self.API_ACCESS_KEY,
             "KALSHI-ACCESS-SIGNATURE": sig,
             "KALSHI-ACCESS-TIMESTAMP": timestamp_str,
         }
-        return headers
+
+    def request_headers(self, method: str, url: str):
+        self._check_signer()
+        timestamp_str = str(time.time_ns() // 1_000_000)
+        sig = self.signer.sign(timestamp_str + method + _url_path(url))
+        return self._headers(timestamp_str, sig)
+
+    def use_sign_pool(self, kind: str = "thread", workers: int = None):
+        """
+        Sign requests made through :meth:`request_headers_async` on a worker pool
+        so that bursts of orders do not block the event loop.
+
+        :param kind: ``"thread"`` or ``"process"``. Process workers load the private
+            key themselves, so set_key must be called first.
+        :param workers: Pool size (default = the executor's own default).
+        """
+        from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+        if self.sign_executor is not None:
+            self.sign_executor.shutdown(wait=False)
+            self.sign_executor = None
+        if kind == "thread":
+            self.sign_executor = ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix="kalshi-sign"
+            )
+        elif kind == "process":
+            self._check_signer()
+            self.sign_executor = ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_sign_worker,
+                initargs=(self.API_PRIVATE_KEY_PATH,),
+            )
+        elif kind is not None:
+            raise ValueError(f"kind must be 'thread', 'process' or None, not {kind!r}")
+
+    async def request_headers_async(self, method: str, url: str):
+        """
+        Like :meth:`request_headers`, but signs on the pool set up by
+        :meth:`use_sign_pool` when there is one.
+        """
+        import asyncio
+        from concurrent.futures import ProcessPoolExecutor
+
+        executor = self.sign_executor
+        if executor is None:
+            return self.request_headers(method, url)
+        self._check_signer()
+        timestamp_str = str(time.time_ns() // 1_000_000)
+        text = timestamp_str + method + _url_path(url)
+        sign = (
+            _sign_in_worker
+            if isinstance(executor, ProcessPoolExecutor)
+            else self.signer.sign
+        )
+        sig = await asyncio.get_running_loop().run_in_executor(executor, sign, text)
+        return self._headers(timestamp_str, sig)
 
 
 auth = Auth()
+
+
+# ``kalshi.auth`` is this module, so expose the default instance's API on it:
+# ``kalshi.auth.set_key(...)`` and ``from kalshi.auth import auth`` both work.
+set_key = auth.set_key
+request_headers = auth.request_headers
+request_headers_async = auth.request_headers_async
+use_sign_pool = auth.use_sign_pool
+
+
+def __getattr__(name: str):
+    try:
+        return getattr(auth, name)
+    except AttributeError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
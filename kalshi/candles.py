@@ -0,0 +1,268 @@
+"""
+Bulk candlestick fetching into an aligned time x ticker x field panel.
+"""
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Tuple
+
+from . import codec
+
+# Most candlesticks the API returns for one request.
+MAX_CANDLES = 5000
+# Panel fields, in order, along the last axis of :func:`get_candle_array`.
+FIELDS = ("open", "high", "low", "close", "volume", "open_interest")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS candle_windows (
+    base_url TEXT NOT NULL,
+    ticker TEXT NOT NULL,
+    period_interval INTEGER NOT NULL,
+    window_start INTEGER NOT NULL,
+    candles TEXT NOT NULL,
+    PRIMARY KEY (base_url, ticker, period_interval, window_start)
+);
+"""
+
+
+class CandleCache:
+    """
+    Candlestick windows kept on disk in SQLite.
+
+    Only complete windows that ended in the past are stored, so a cached window
+    never changes and is never refetched. Windows are keyed by the base URL they
+    were fetched from, so demo and production candles never mix.
+    """
+
+    def __init__(self, path: str):
+        """
+        :param path: SQLite database file, created if it does not exist.
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        columns = [row[1] for row in self._conn.execute("PRAGMA table_info(candle_windows)")]
+        if columns and "base_url" not in columns:
+            # Written before windows were keyed by environment: their origin is unknown.
+            self._conn.execute("DROP TABLE candle_windows")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def get(self, base_url: str, ticker: str, period_interval: int, window_start: int):
+        """
+        Cached candlesticks of one window, or None if the window is not cached.
+
+        :param base_url: Base URL of the API the window was fetched from.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT candles FROM candle_windows WHERE base_url = ? "
+                "AND ticker = ? AND period_interval = ? AND window_start = ?",
+                (base_url, ticker, period_interval, window_start),
+            ).fetchone()
+        return codec.loads(row[0]) if row else None
+
+    def put(
+        self, base_url: str, ticker: str, period_interval: int, window_start: int, candles: list
+    ) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO candle_windows VALUES (?, ?, ?, ?, ?)",
+                (base_url, ticker, period_interval, window_start, codec.dumps(candles)),
+            )
+
+    def clear(self, ticker: str = None) -> None:
+        """
+        Drop every cached window, or only those of ``ticker``.
+        """
+        with self._lock, self._conn:
+            if ticker is None:
+                self._conn.execute("DELETE FROM candle_windows")
+            else:
+                self._conn.execute("DELETE FROM candle_windows WHERE ticker = ?", (ticker,))
+
+
+def _windows(start_ts: int, end_ts: int, period_interval: int) -> List[Tuple[int, int, int]]:
+    """
+    Split ``[start_ts, end_ts]`` into requests of at most ``MAX_CANDLES`` candles.
+
+    Windows sit on a fixed grid of ``MAX_CANDLES`` periods so the same window is
+    produced whatever range is asked for. Returns ``(window_start, start, end)``
+    tuples, where ``start``/``end`` are the window clipped to the range.
+    """
+    span = MAX_CANDLES * period_interval * 60
+    windows = []
+    window_start = start_ts - start_ts % span
+    while window_start <= end_ts:
+        windows.append(
+            (window_start, max(start_ts, window_start), min(end_ts, window_start + span - 1))
+        )
+        window_start += span
+    return windows
+
+
+def _market(client):
+    if client is not None:
+        return client.market
+    from kalshi.rest import market
+
+    return market
+
+
+def _fetch_window(market, series_ticker, ticker, start, end, period_interval) -> list:
+    resp = market.GetMarketCandlesticks(ticker, series_ticker, start, end, period_interval)
+    return resp.get("candlesticks") or []
+
+
+def fetch_candles(
+    markets: List[Tuple[str, str]],
+    start_ts: int,
+    end_ts: int,
+    period_interval: int = 60,
+    max_workers: int = 8,
+    cache: CandleCache = None,
+    client=None,
+) -> dict:
+    """
+    Fetch candlesticks for many markets over any time range.
+
+    The range is split into windows the API accepts and every window of every
+    market is requested concurrently; each request still waits on the shared
+    read limiter. With a ``cache``, complete past windows are read from and
+    written to disk, so only new or still-open windows hit the network.
+
+    :param markets: ``(series_ticker, ticker)`` pairs.
+    :param start_ts: Range start, Unix seconds.
+    :param end_ts: Range end, Unix seconds.
+    :param period_interval: Candle length in minutes: 1, 60 or 1440 (default = 60).
+    :param max_workers: Requests in flight at once.
+    :param cache: Optional :class:`CandleCache`.
+    :param client: :class:`kalshi.client.KalshiClient` to fetch through (default = the module-level API).
+    :return: ``{ticker: [candlestick, ...]}`` ordered by ``end_period_ts``, limited to the range.
+    """
+    market = _market(client)
+    base_url = market._transport.base_url
+    now = int(time.time())
+    span = MAX_CANDLES * period_interval * 60
+    parts = {ticker: [] for _, ticker in markets}
+    jobs = []
+    for series_ticker, ticker in markets:
+        for window_start, start, end in _windows(start_ts, end_ts, period_interval):
+            candles = cache.get(base_url, ticker, period_interval, window_start) if cache else None
+            if candles is not None:
+                parts[ticker].append(candles)
+                continue
+            # Fetch whole windows when they can be cached, otherwise only the part needed.
+            cacheable = cache is not None and window_start + span <= now
+            if cacheable:
+                start, end = window_start, window_start + span - 1
+            jobs.append((series_ticker, ticker, window_start, start, end, cacheable))
+
+    if jobs:
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = [
+                pool.submit(_fetch_window, market, s, t, start, end, period_interval)
+                for s, t, _, start, end, _ in jobs
+            ]
+            for (_, ticker, window_start, _, _, cacheable), future in zip(jobs, futures):
+                candles = future.result()
+                if cacheable:
+                    cache.put(base_url, ticker, period_interval, window_start, candles)
+                parts[ticker].append(candles)
+
+    result = {}
+    for ticker, windows in parts.items():
+        seen = {}
+        for candles in windows:
+            for candle in candles:
+                ts = candle.get("end_period_ts")
+                if ts is not None and start_ts <= ts <= end_ts:
+                    seen[ts] = candle
+        result[ticker] = [seen[ts] for ts in sorted(seen)]
+    return result
+
+
+def _values(candle: dict) -> tuple:
+    price = candle.get("price") or {}
+    return (
+        price.get("open"),
+        price.get("high"),
+        price.get("low"),
+        price.get("close"),
+        candle.get("volume"),
+        candle.get("open_interest"),
+    )
+
+
+def get_candle_array(
+    markets: List[Tuple[str, str]],
+    start_ts: int,
+    end_ts: int,
+    period_interval: int = 60,
+    max_workers: int = 8,
+    cache: CandleCache = None,
+    client=None,
+):
+    """
+    Fetch candlesticks like :func:`fetch_candles` and align them on one time grid.
+
+    :return: ``(end_ts, values)``: the period end timestamps, shape ``(T,)``, and a
+        float64 array of shape ``(T, len(markets), len(FIELDS))``. Prices are in
+        cents; periods without a candle or without trades are NaN.
+    """
+    import numpy as np
+
+    step = period_interval * 60
+    first = -(-start_ts // step) * step
+    grid = np.arange(first, end_ts + 1, step, dtype=np.int64)
+    values = np.full((len(grid), len(markets), len(FIELDS)), np.nan)
+
+    candles = fetch_candles(
+        markets, start_ts, end_ts, period_interval, max_workers, cache, client
+    )
+    for column, (_, ticker) in enumerate(markets):
+        rows = candles[ticker]
+        if not rows:
+            continue
+        ts = np.fromiter((c["end_period_ts"] for c in rows), np.int64, len(rows))
+        data = np.array([_values(c) for c in rows], dtype=float)
+        index = (ts - first) // step
+        on_grid = (index >= 0) & (index < len(grid)) & ((ts - first) % step == 0)
+        values[index[on_grid], column] = data[on_grid]
+    return grid, values
+
+
+def get_candle_panel(
+    markets: List[Tuple[str, str]],
+    start_ts: int,
+    end_ts: int,
+    period_interval: int = 60,
+    max_workers: int = 8,
+    cache: CandleCache = None,
+    client=None,
+):
+    """
+    Fetch candlesticks like :func:`fetch_candles` as a pandas DataFrame indexed by
+    period end time (UTC), with ``(ticker, field)`` columns, e.g. ``panel["TICKER"]["close"]``.
+    """
+    import pandas as pd
+
+    grid, values = get_candle_array(
+        markets, start_ts, end_ts, period_interval, max_workers, cache, client
+    )
+    columns = pd.MultiIndex.from_product(
+        [[ticker for _, ticker in markets], FIELDS], names=["ticker", "field"]
+    )
+    index = pd.to_datetime(grid, unit="s", utc=True).rename("end_period")
+    return pd.DataFrame(values.reshape(len(grid), -1), index=index, columns=columns)
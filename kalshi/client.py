@@ -0,0 +1,236 @@
+"""
+Self-contained clients, one per account and environment.
+
+The module-level API shares one set of credentials (``kalshi.auth``), one
+environment (``kalshi.constants.BASE_URL``), one connection pool and one pair
+of rate limiters across the whole process. A :class:`KalshiClient` owns its
+own copy of each, so many accounts can trade concurrently from one process
+without spending each other's rate limits::
+
+    from kalshi.client import KalshiClient
+    from kalshi.constants import PROD_BASE_URL
+
+    alice = KalshiClient("key-a", "alice.pem", base_url=PROD_BASE_URL, tier="premier")
+    bob = KalshiClient("key-b", "bob.pem", base_url=PROD_BASE_URL)
+    alice.portfolio.GetBalance()
+    bob.market.GetMarket("TICKER")
+
+The module-level API is itself a thin default instance: its resources send
+through a transport that reads the module-wide settings on every call.
+"""
+import requests
+
+import kalshi.constants
+from .auth import Auth
+from .rest import limiter
+from .rest.collection import Collection
+from .rest.exchange import Exchange
+from .rest.market import Market
+from .rest.portfolio import Portfolio
+from .rest.rest import POOL_MAXSIZE, Transport
+
+
+class AsyncResources:
+    """
+    The async endpoint resources of a :class:`KalshiClient`. They share the
+    client's credentials, environment and rate limiters, and pool connections
+    in an aiohttp session of their own.
+    """
+
+    def __init__(self, transport):
+        from .rest.aio.collection import Collection
+        from .rest.aio.exchange import Exchange
+        from .rest.aio.market import Market
+        from .rest.aio.portfolio import Portfolio
+
+        self.transport = transport
+        self.market = Market(transport)
+        self.exchange = Exchange(transport)
+        self.collection = Collection(transport)
+        self.portfolio = Portfolio(transport)
+
+    async def close(self):
+        """
+        Close the pooled session. Call this before the event loop shuts down.
+        """
+        await self.transport.close()
+
+
+class KalshiClient:
+    """
+    One account in one environment, with its own signer, connection pool, rate
+    limiters and websocket connections.
+
+    The endpoint resources ``market``, ``exchange``, ``collection`` and
+    ``portfolio`` have the same methods as their module-level counterparts in
+    :mod:`kalshi.rest`; ``aio`` holds their async versions.
+    """
+
+    def __init__(
+        self,
+        access_key: str = None,
+        private_key_path: str = None,
+        base_url: str = None,
+        tier: str = None,
+        read_rate: float = None,
+        write_rate: float = None,
+        burst: float = None,
+        shared_limits: bool = False,
+        pool_maxsize: int = POOL_MAXSIZE,
+        connection_limit: int = None,
+    ):
+        """
+        :param access_key: API access key. Without one, only public endpoints can be used.
+        :param private_key_path: Path of the PEM private key belonging to ``access_key``.
+        :param base_url: Environment, e.g. ``kalshi.constants.PROD_BASE_URL``
+            (default = the current ``kalshi.constants.BASE_URL``).
+        :param tier: Access tier of the account, from ``limiter.TIERS`` (default = advanced).
+        :param read_rate: Reads per second, overriding the tier.
+        :param write_rate: Writes per second, overriding the tier.
+        :param burst: Bucket size for both limiters (default = one second of requests).
+        :param shared_limits: Share the limits with every process on this host
+            that creates a client for the same access key with shared_limits=True.
+        :param pool_maxsize: Pooled connections of the sync session.
+        :param connection_limit: Simultaneous connections of the async session
+            (default = ``kalshi.rest.aio.rest.CONNECTION_LIMIT``).
+        """
+        self.auth = Auth()
+        if access_key is not None:
+            self.auth.set_key(access_key, private_key_path)
+        self.base_url = base_url or kalshi.constants.BASE_URL
+        self.read_limiter, self.write_limiter = limiter.create(
+            tier,
+            read_rate,
+            write_rate,
+            burst,
+            shared_limits,
+            name=f"{access_key}-" if access_key else "",
+        )
+        self.session = requests.Session()
+        self.session.mount(
+            "https://", requests.adapters.HTTPAdapter(pool_maxsize=pool_maxsize)
+        )
+        self.transport = Transport(
+            self.session, self.read_limiter, self.write_limiter, self.auth, self.base_url
+        )
+        self.market = Market(self.transport)
+        self.exchange = Exchange(self.transport)
+        self.collection = Collection(self.transport)
+        self.portfolio = Portfolio(self.transport)
+        self.connection_limit = connection_limit
+        # Websocket clients created by websocket(), closed by aclose().
+        self.websockets = []
+        self._aio = None
+
+    def __repr__(self):
+        return f"KalshiClient(access_key={self.auth.API_ACCESS_KEY!r}, base_url={self.base_url!r})"
+
+    @property
+    def aio(self) -> AsyncResources:
+        """
+        The async endpoint resources, created on first use. Requires aiohttp.
+        """
+        if self._aio is None:
+            from .rest.aio.rest import Transport as AsyncTransport
+
+            self._aio = AsyncResources(
+                AsyncTransport(
+                    self.read_limiter,
+                    self.write_limiter,
+                    self.auth,
+                    self.base_url,
+                    self.connection_limit,
+                )
+            )
+        return self._aio
+
+    @property
+    def ws_url(self) -> str:
+        """
+        The websocket endpoint of the client's environment.
+        """
+        scheme, _, host = self.base_url.partition("://")
+        return f"{'ws' if scheme == 'http' else 'wss'}://{host}{kalshi.constants.WS_PATH}"
+
+    def websocket(self, orderbooks=None, dispatcher=None, cls=None, portfolio_state=None):
+        """
+        Create a websocket client signed with this client's credentials, connecting
+        to its environment and resyncing order books through its ``market``.
+
+        :param orderbooks: Passed to the websocket client.
+        :param dispatcher: Passed to the websocket client.
+        :param portfolio_state: Passed to the websocket client; see :meth:`portfolio_state`.
+        :param cls: :class:`kalshi.websocket.Client` subclass to instantiate
+            (default = ``Client`` itself).
+        """
+        if cls is None:
+            from .websocket.client import Client as cls
+        ws = cls(
+            orderbooks,
+            dispatcher,
+            auth=self.auth,
+            market=self.market,
+            url=self.ws_url,
+            portfolio_state=portfolio_state,
+        )
+        self.websockets.append(ws)
+        return ws
+
+    def portfolio_state(self, **kwargs):
+        """
+        Create a :class:`kalshi.websocket.PortfolioState` loading from this client's
+        ``portfolio``.
+
+        :param kwargs: Further arguments of ``PortfolioState``, e.g. ``reconcile_interval``.
+        """
+        from .websocket.portfolio import PortfolioState
+
+        return PortfolioState(self.portfolio, **kwargs)
+
+    def websocket_shards(
+        self, channels: list, tickers: list = (), shards: int = 4, cls=None, **kwargs
+    ):
+        """
+        Create a :class:`kalshi.websocket.ShardManager` spreading ``tickers`` over
+        ``shards`` connections signed with this client's credentials. Its shards are
+        closed by :meth:`aclose` too.
+
+        :param cls: ``ShardManager`` subclass to instantiate (default = ``ShardManager`` itself).
+        :param kwargs: Further arguments of ``ShardManager``, e.g. ``orderbooks``.
+        """
+        if cls is None:
+            from .websocket.shards import ShardManager as cls
+        manager = cls(
+            channels, tickers, shards, auth=self.auth, market=self.market, url=self.ws_url, **kwargs
+        )
+        self.websockets.extend(manager.shards)
+        return manager
+
+    def close(self) -> None:
+        """
+        Close the sync connection pool.
+        """
+        self.session.close()
+
+    async def aclose(self) -> None:
+        """
+        Close the websocket connections, the async session and the sync connection pool.
+        """
+        for ws in self.websockets:
+            await ws.close()
+        self.websockets.clear()
+        if self._aio is not None:
+            await self._aio.close()
+        self.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
@@ -0,0 +1,73 @@
+"""
+JSON encoding and decoding for REST responses and websocket frames.
+
+The fastest installed backend is selected at import time: orjson, then msgspec,
+then the standard library. Every backend decodes ``bytes`` directly, so
+callers should pass raw response bodies and frames without decoding them to
+``str`` first. Use :func:`use` to pick a backend explicitly.
+"""
+import json
+
+BACKENDS = ("orjson", "msgspec", "json")
+
+# Name of the active backend, and its functions: loads(bytes | str), dumps(obj) -> str
+# and dumpb(obj) -> bytes. All four are set by use().
+NAME = None
+loads = dumps = dumpb = None
+
+
+def _load_orjson():
+    import orjson
+
+    def dumps(obj) -> str:
+        return orjson.dumps(obj).decode("utf-8")
+
+    return orjson.loads, dumps, orjson.dumps
+
+
+def _load_msgspec():
+    import msgspec
+
+    decoder = msgspec.json.Decoder()
+    encoder = msgspec.json.Encoder()
+
+    def dumps(obj) -> str:
+        return encoder.encode(obj).decode("utf-8")
+
+    return decoder.decode, dumps, encoder.encode
+
+
+def _load_json():
+    def dumpb(obj) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+    return json.loads, json.dumps, dumpb
+
+
+_LOADERS = {"orjson": _load_orjson, "msgspec": _load_msgspec, "json": _load_json}
+
+
+def use(backend: str = None) -> str:
+    """
+    Select the JSON backend used by the REST and websocket clients.
+
+    :param backend: One of ``BACKENDS``, or None to pick the fastest one installed.
+    :return: The name of the backend now in use.
+    """
+    global NAME, loads, dumps, dumpb
+    if backend is not None:
+        if backend not in _LOADERS:
+            raise ValueError(f"Unknown JSON backend {backend!r}; expected one of {BACKENDS}")
+        loads, dumps, dumpb = _LOADERS[backend]()
+        NAME = backend
+        return NAME
+    for name in BACKENDS:
+        try:
+            loads, dumps, dumpb = _LOADERS[name]()
+        except ImportError:
+            continue
+        NAME = name
+        return NAME
+
+
+use()
@@ -1,6 +1,7 @@
 DEMO_BASE_URL = "https://demo-api.kalshi.co"
 PROD_BASE_URL = "https://api.elections.kalshi.com"
 BASE_PATH = "/trade-api/v2"
+WS_PATH = "/trade-api/ws/v2"
 
 BASE_URL = DEMO_BASE_URL
 
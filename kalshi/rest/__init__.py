@@ -2,3 +2,4 @@ from .market import market
 from .exchange import exchange
 from .collection import collection
 from .portfolio import portfolio
+from .rest import KalshiHTTPError
@@ -0,0 +1,5 @@
+from .market import market
+from .exchange import exchange
+from .collection import collection
+from .portfolio import portfolio
+from .rest import close
@@ -0,0 +1,10 @@
+from .rest import Resource
+from ..endpoints import COLLECTION, define
+
+
+@define(COLLECTION, asynchronous=True)
+class Collection(Resource):
+    pass
+
+
+collection = Collection()
@@ -0,0 +1,10 @@
+from .rest import Resource
+from ..endpoints import EXCHANGE, define
+
+
+@define(EXCHANGE, asynchronous=True)
+class Exchange(Resource):
+    pass
+
+
+exchange = Exchange()
@@ -0,0 +1,10 @@
+from .rest import Resource
+from ..endpoints import MARKET, define
+
+
+@define(MARKET, asynchronous=True)
+class Market(Resource):
+    pass
+
+
+market = Market()
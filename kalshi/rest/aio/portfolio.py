@@ -0,0 +1,10 @@
+from .rest import Resource
+from ..endpoints import PORTFOLIO, define
+
+
+@define(PORTFOLIO, asynchronous=True)
+class Portfolio(Resource):
+    pass
+
+
+portfolio = Portfolio()
@@ -0,0 +1,229 @@
+import asyncio
+import time
+
+try:
+    import aiohttp
+except ImportError as e:  # pragma: no cover - optional dependency
+    raise ImportError(
+        "kalshi.rest.aio requires aiohttp. "
+        "Install it with `pip install kalshi-python-unofficial[async]`."
+    ) from e
+
+import kalshi.auth
+from ..rest import KalshiHTTPError, _http_error, _json_body, _SUCCESS
+from .. import limiter, metrics, rest, retry
+from ... import codec
+
+# Errors raised before a response arrived, retried like a retryable status.
+_TRANSPORT_ERRORS = (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError, asyncio.TimeoutError)
+
+# Maximum number of simultaneous connections kept in the pool.
+CONNECTION_LIMIT = 100
+
+
+class Transport(rest.Transport):
+    """
+    Async counterpart of :class:`kalshi.rest.rest.Transport`. Each transport pools
+    its connections in its own aiohttp session, created for the running event loop
+    on first use.
+    """
+
+    def __init__(
+        self,
+        read_limiter: limiter.TokenBucket = None,
+        write_limiter: limiter.TokenBucket = None,
+        auth: kalshi.auth.Auth = None,
+        base_url: str = None,
+        connection_limit: int = None,
+    ):
+        """
+        :param connection_limit: Maximum number of simultaneous connections
+            (default = ``CONNECTION_LIMIT``).
+
+        The other arguments are those of :class:`kalshi.rest.rest.Transport`.
+        """
+        super().__init__(None, read_limiter, write_limiter, auth, base_url)
+        self.connection_limit = connection_limit
+        self._aio_session = None
+        self._aio_session_loop = None
+
+    def _get_session(self) -> "aiohttp.ClientSession":
+        """
+        Return the pooled session for the running event loop, creating it on first use.
+        """
+        loop = asyncio.get_running_loop()
+        session = self._aio_session
+        if session is None or session.closed or self._aio_session_loop is not loop:
+            session = self._aio_session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.connection_limit or CONNECTION_LIMIT)
+            )
+            self._aio_session_loop = loop
+        return session
+
+    async def close(self):
+        """
+        Close the pooled session. Call this before the event loop shuts down.
+        """
+        if self._aio_session is not None and not self._aio_session.closed:
+            await self._aio_session.close()
+        self._aio_session = None
+        self._aio_session_loop = None
+
+    async def _rate_limit(self, method):
+        if method == "GET":
+            await (self._read_limiter or limiter.read_limiter).acquire_async()
+        else:
+            await (self._write_limiter or limiter.write_limiter).acquire_async()
+
+    async def _send_instrumented(self, method, url, params, body, headers, sign, endpoint):
+        record = metrics.start(endpoint or method, method, url)
+        try:
+            t = time.perf_counter()
+            await self._rate_limit(method)
+            t = record.mark("limiter", t)
+            if sign is not None:
+                signed = await sign(method, url)
+                headers = {**headers, **signed} if headers else signed
+                t = record.mark("sign", t)
+            headers, data = _json_body(headers, body)
+            record.bytes_sent = len(data) if data else 0
+            sent = t
+            async with self._get_session().request(
+                method, url, params=params, headers=headers, data=data
+            ) as response:
+                record.mark("first_byte", sent)
+                record.status = response.status
+                content = await response.read()
+            t = record.mark("send", t)
+            record.bytes_received = len(content)
+            if response.status != _SUCCESS[method]:
+                raise _http_error(method, url, response.status, content, response.headers)
+            result = codec.loads(content)
+            record.mark("decode", t)
+            return result
+        except BaseException as e:
+            record.error = e
+            raise
+        finally:
+            metrics.finish(record)
+
+    async def _send(self, method, url, params, body, headers, sign, endpoint):
+        if metrics.active:
+            return await self._send_instrumented(method, url, params, body, headers, sign, endpoint)
+        await self._rate_limit(method)
+        if sign is not None:
+            signed = await sign(method, url)
+            headers = {**headers, **signed} if headers else signed
+        headers, data = _json_body(headers, body)
+        async with self._get_session().request(
+            method, url, params=params, headers=headers, data=data
+        ) as response:
+            content = await response.read()
+            if response.status != _SUCCESS[method]:
+                raise _http_error(method, url, response.status, content, response.headers)
+        return codec.loads(content)
+
+    async def _send_hedged(self, hedge, method, url, params, body, headers, sign, endpoint):
+        """
+        Async counterpart of :meth:`kalshi.rest.rest.Transport._send_hedged`. The slower
+        request is cancelled.
+        """
+        key = endpoint or method
+        args = (method, url, params, body, headers, sign, endpoint)
+
+        async def timed():
+            start = time.perf_counter()
+            result = await self._send(*args)
+            hedge.observe(key, time.perf_counter() - start)
+            return result
+
+        delay = hedge.delay(key)
+        if delay is None:
+            return await timed()
+        first = asyncio.ensure_future(timed())
+        done, _ = await asyncio.wait([first], timeout=delay)
+        if done:
+            return first.result()
+        hedge.sent()
+        second = asyncio.ensure_future(timed())
+        pending = {first, second}
+        error = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is second:
+                            hedge.won()
+                        return task.result()
+                    error = error or task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def request(self, method, url, params=None, body=None, headers=None, sign=None, endpoint=None):
+        """
+        Async counterpart of :meth:`kalshi.rest.rest.Transport.request`. ``sign`` is a
+        coroutine function.
+        """
+        attempt = 0
+        while True:
+            try:
+                hedge = retry.hedge
+                if hedge is not None and method == "GET":
+                    return await self._send_hedged(
+                        hedge, method, url, params, body, headers, sign, endpoint
+                    )
+                return await self._send(method, url, params, body, headers, sign, endpoint)
+            except KalshiHTTPError as e:
+                policy = retry.policy
+                attempt += 1
+                delay = policy and policy.delay(method, body, attempt, e.status, e.retry_after)
+                if delay is None:
+                    raise
+            except _TRANSPORT_ERRORS:
+                policy = retry.policy
+                attempt += 1
+                delay = policy and policy.delay(method, body, attempt)
+                if delay is None:
+                    raise
+            await asyncio.sleep(delay)
+
+
+# Transport of the module-level API, resolving every setting from the module-wide defaults.
+default_transport = Transport()
+request = default_transport.request
+close = default_transport.close
+
+
+async def get(url, headers=None, **kwargs):
+    for i in kwargs:
+        if isinstance(kwargs[i], bool):
+            kwargs[i] = str(kwargs[i]).lower()
+    return await request("GET", url, params=kwargs, headers=headers)
+
+
+async def post(url, headers=None, body=None):
+    return await request("POST", url, body=body, headers=headers)
+
+
+async def delete(url, headers=None, body=None):
+    return await request("DELETE", url, body=body, headers=headers)
+
+
+class Resource:
+    """
+    Base of the async REST endpoint classes; see :class:`kalshi.rest.rest.Resource`.
+    """
+
+    def __init__(self, transport: Transport = None):
+        """
+        :param transport: Where requests are sent (default = the module-wide defaults).
+        """
+        self._transport = transport or default_transport
+
+    async def _request(self, endpoint, method, url, params, body, auth):
+        transport = self._transport
+        sign = transport.auth.request_headers_async if auth else None
+        return await transport.request(method, url, params, body, None, sign, endpoint)
@@ -0,0 +1,219 @@
+"""
+Bulk order operations: batched creates and concurrent mass cancels.
+
+Every call still goes through the write limiter of the portfolio's transport:
+the module-wide one, or that of the ``client`` passed in. Batch requests are
+additionally charged for the orders they carry (``CREATE_COST`` and
+``CANCEL_COST`` write tokens per order), matching how the exchange counts them.
+Results are returned per order, in input order, as dicts with an ``ok`` flag
+and either the exchange's ``response`` or an ``error`` message.
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from .portfolio import portfolio as default_portfolio
+
+# Maximum number of orders accepted by one batch create or batch cancel request.
+MAX_BATCH_SIZE = 20
+# Write tokens consumed per order inside a batch create / batch cancel.
+CREATE_COST = 1.0
+CANCEL_COST = 0.2
+
+
+def _chunks(items: list, size: int) -> list:
+    if not 1 <= size <= MAX_BATCH_SIZE:
+        raise ValueError(f"batch_size must be between 1 and {MAX_BATCH_SIZE}")
+    return [items[i : i + size] for i in range(0, len(items), size)]
+
+
+def _extra_tokens(count: int, cost: float) -> float:
+    # The request itself already takes one token in rest.post/rest.delete.
+    return max(0.0, count * cost - 1)
+
+
+def _charge(portfolio, count: int, cost: float) -> None:
+    extra = _extra_tokens(count, cost)
+    if extra:
+        portfolio._transport.write_limiter.acquire(extra)
+
+
+async def _acharge(portfolio, count: int, cost: float) -> None:
+    extra = _extra_tokens(count, cost)
+    if extra:
+        await portfolio._transport.write_limiter.acquire_async(extra)
+
+
+def _failed(key: str, value, error) -> dict:
+    return {key: value, "ok": False, "error": str(error)}
+
+
+def _create_results(chunk: list, resp) -> list:
+    if isinstance(resp, Exception):
+        return [_failed("client_order_id", o.get("client_order_id"), resp) for o in chunk]
+    results = []
+    entries = resp.get("orders") or []
+    for i, order in enumerate(chunk):
+        entry = entries[i] if i < len(entries) else {}
+        error = entry.get("error")
+        result = {"client_order_id": order.get("client_order_id"), "ok": error is None}
+        if error is None:
+            result["response"] = entry.get("order")
+        else:
+            result["error"] = str(error)
+        results.append(result)
+    return results
+
+
+def _cancel_results(chunk: list, resp) -> list:
+    if isinstance(resp, Exception):
+        return [_failed("order_id", oid, resp) for oid in chunk]
+    entries = resp.get("orders") or []
+    by_id = {e.get("order_id"): e for e in entries if e.get("order_id")}
+    results = []
+    for i, oid in enumerate(chunk):
+        entry = by_id.get(oid) or (entries[i] if i < len(entries) else {})
+        error = entry.get("error")
+        result = {"order_id": oid, "ok": error is None}
+        if error is None:
+            result["response"] = entry
+        else:
+            result["error"] = str(error)
+        results.append(result)
+    return results
+
+
+def _call(fn, *args):
+    try:
+        return fn(*args)
+    except Exception as e:
+        return e
+
+
+async def _acall(coro):
+    try:
+        return await coro
+    except Exception as e:
+        return e
+
+
+def batch_create_orders(
+    orders: list, batch_size: int = MAX_BATCH_SIZE, max_workers: int = 8, client=None
+) -> list:
+    """
+    Create any number of orders as concurrent batch requests.
+
+    :param orders: Order dicts with the same fields as ``Portfolio.CreateOrder``.
+    :param batch_size: Orders per request, at most ``MAX_BATCH_SIZE``.
+    :param max_workers: Batch requests in flight at once.
+    :param client: :class:`kalshi.client.KalshiClient` to send through (default = the module-level API).
+    :return: One result per order: ``{"client_order_id", "ok", "response" | "error"}``.
+    """
+    portfolio = default_portfolio if client is None else client.portfolio
+    chunks = _chunks(list(orders), batch_size)
+
+    def send(chunk):
+        _charge(portfolio, len(chunk), CREATE_COST)
+        return _call(portfolio.BatchCreateOrders, chunk)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        responses = list(pool.map(send, chunks))
+    return [r for c, resp in zip(chunks, responses) for r in _create_results(c, resp)]
+
+
+def cancel_orders(
+    order_ids: list,
+    use_batch: bool = True,
+    batch_size: int = MAX_BATCH_SIZE,
+    max_workers: int = 8,
+    client=None,
+) -> list:
+    """
+    Cancel many orders concurrently and return once every cancel is acknowledged.
+
+    :param order_ids: Ids of the orders to cancel.
+    :param use_batch: Use the batch cancel endpoint (default = True); otherwise send one
+        CancelOrder per id.
+    :param batch_size: Ids per batch request, at most ``MAX_BATCH_SIZE``.
+    :param max_workers: Requests in flight at once.
+    :param client: :class:`kalshi.client.KalshiClient` to send through (default = the module-level API).
+    :return: One result per id: ``{"order_id", "ok", "response" | "error"}``.
+    """
+    portfolio = default_portfolio if client is None else client.portfolio
+    order_ids = list(order_ids)
+    if not use_batch:
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            responses = list(
+                pool.map(lambda oid: _call(portfolio.CancelOrder, oid), order_ids)
+            )
+        return [
+            _failed("order_id", oid, resp)
+            if isinstance(resp, Exception)
+            else {"order_id": oid, "ok": True, "response": resp}
+            for oid, resp in zip(order_ids, responses)
+        ]
+
+    chunks = _chunks(order_ids, batch_size)
+
+    def send(chunk):
+        _charge(portfolio, len(chunk), CANCEL_COST)
+        return _call(portfolio.BatchCancelOrders, chunk)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        responses = list(pool.map(send, chunks))
+    return [r for c, resp in zip(chunks, responses) for r in _cancel_results(c, resp)]
+
+
+def _aio_portfolio(client):
+    if client is not None:
+        return client.aio.portfolio
+    from .aio import portfolio
+
+    return portfolio
+
+
+async def abatch_create_orders(
+    orders: list, batch_size: int = MAX_BATCH_SIZE, client=None
+) -> list:
+    """
+    Async counterpart of :func:`batch_create_orders` using ``kalshi.rest.aio``,
+    or ``client.aio`` when a client is given.
+    """
+    aio_portfolio = _aio_portfolio(client)
+    chunks = _chunks(list(orders), batch_size)
+
+    async def send(chunk):
+        await _acharge(aio_portfolio, len(chunk), CREATE_COST)
+        return await _acall(aio_portfolio.BatchCreateOrders(chunk))
+
+    responses = await asyncio.gather(*(send(c) for c in chunks))
+    return [r for c, resp in zip(chunks, responses) for r in _create_results(c, resp)]
+
+
+async def acancel_orders(
+    order_ids: list, use_batch: bool = True, batch_size: int = MAX_BATCH_SIZE, client=None
+) -> list:
+    """
+    Async counterpart of :func:`cancel_orders` using ``kalshi.rest.aio``,
+    or ``client.aio`` when a client is given.
+    """
+    aio_portfolio = _aio_portfolio(client)
+    order_ids = list(order_ids)
+    if not use_batch:
+        responses = await asyncio.gather(
+            *(_acall(aio_portfolio.CancelOrder(oid)) for oid in order_ids)
+        )
+        return [
+            _failed("order_id", oid, resp)
+            if isinstance(resp, Exception)
+            else {"order_id": oid, "ok": True, "response": resp}
+            for oid, resp in zip(order_ids, responses)
+        ]
+
+    chunks = _chunks(order_ids, batch_size)
+
+    async def send(chunk):
+        await _acharge(aio_portfolio, len(chunk), CANCEL_COST)
+        return await _acall(aio_portfolio.BatchCancelOrders(chunk))
+
+    responses = await asyncio.gather(*(send(c) for c in chunks))
+    return [r for c, resp in zip(chunks, responses) for r in _cancel_results(c, resp)]
@@ -0,0 +1,245 @@
+"""
+Opt-in TTL/LRU cache for slow-changing read endpoints.
+
+Endpoints declared with ``cache=True`` in the :mod:`kalshi.rest.endpoints`
+tables go straight to the network until :func:`enable` installs a cache; their
+generated methods then check it inline. Entries are keyed by endpoint name, the
+base URL of the resource's transport and the call's arguments, so clients of
+different environments never share responses. Cached responses are shared
+between callers and must be treated as read-only.
+"""
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+
+import kalshi.constants
+
+# Seconds a response stays fresh, per endpoint method name.
+DEFAULT_TTLS = {
+    "GetSeries": 3600.0,
+    "GetEvent": 60.0,
+    "GetMarket": 5.0,
+    "GetExchangeSchedule": 3600.0,
+    "GetExchangeAnnouncements": 300.0,
+    "GetMultivariateEventCollection": 300.0,
+}
+
+
+class ResponseCache:
+    """
+    A size-bounded LRU map of responses, each expiring after its endpoint's TTL.
+
+    Concurrent misses for the same key are coalesced: one caller fetches while
+    the others wait for its result, from threads or coroutines alike.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttls: dict = None, default_ttl: float = 60.0):
+        """
+        :param maxsize: Maximum number of cached responses.
+        :param ttls: Per-endpoint TTLs in seconds, merged over ``DEFAULT_TTLS``.
+        :param default_ttl: TTL for endpoints missing from ``ttls``.
+        """
+        self.maxsize = maxsize
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.default_ttl = default_ttl
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._inflight = {}
+        self._ainflight = {}
+        self._lock = threading.Lock()
+
+    def _lookup(self, key):
+        """
+        Return ``(True, value)`` for a fresh entry, else ``(False, None)``. Caller holds the lock.
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires, value = entry
+            if expires > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True, value
+            del self._entries[key]
+        return False, None
+
+    def _store(self, key, value) -> None:
+        ttl = self.ttls.get(key[0], self.default_ttl)
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def get_or_fetch(self, key, fetch):
+        """
+        Return the cached response for ``key``, calling ``fetch()`` on a miss.
+        ``key[0]`` must be the endpoint name.
+        """
+        with self._lock:
+            found, value = self._lookup(key)
+            if found:
+                return value
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self._inflight[key] = Future()
+                self.misses += 1
+            else:
+                self.coalesced += 1
+        if not leader:
+            return future.result()
+        try:
+            value = fetch()
+        except BaseException as e:
+            with self._lock:
+                del self._inflight[key]
+            future.set_exception(e)
+            raise
+        with self._lock:
+            self._store(key, value)
+            del self._inflight[key]
+        future.set_result(value)
+        return value
+
+    async def aget_or_fetch(self, key, fetch):
+        """
+        Async counterpart of :meth:`get_or_fetch`; ``fetch()`` returns an awaitable.
+        If the caller fetching for the others is cancelled, one of them fetches instead.
+        """
+        import asyncio
+
+        while True:
+            with self._lock:
+                found, value = self._lookup(key)
+                if found:
+                    return value
+                future = self._ainflight.get(key)
+                leader = future is None
+                if leader:
+                    future = self._ainflight[key] = asyncio.get_running_loop().create_future()
+                    self.misses += 1
+                else:
+                    self.coalesced += 1
+            if not leader:
+                try:
+                    return await asyncio.shield(future)
+                except _LeaderCancelled:
+                    continue
+            try:
+                value = await fetch()
+            except BaseException as e:
+                with self._lock:
+                    del self._ainflight[key]
+                future.set_exception(
+                    _LeaderCancelled() if isinstance(e, asyncio.CancelledError) else e
+                )
+                # Mark the exception as retrieved in case no other caller was waiting.
+                future.exception()
+                raise
+            with self._lock:
+                self._store(key, value)
+                del self._ainflight[key]
+            future.set_result(value)
+            return value
+
+    def invalidate(self, endpoint=None, *args, base_url: str = None, **kwargs) -> None:
+        """
+        Drop cached responses.
+
+        With no arguments the whole cache is cleared. With only ``endpoint``, every
+        response of that endpoint is dropped. With arguments too, only the response
+        for that exact call is dropped, e.g. ``invalidate("GetMarket", "TICKER")``.
+
+        :param endpoint: Endpoint name, or an endpoint method such as
+            ``client.market.GetMarket``, whose resource then supplies the base URL.
+        :param base_url: Environment whose responses are dropped (default = the
+            method's, else the current ``kalshi.constants.BASE_URL``). With only
+            ``endpoint`` and no base URL given, every environment's are dropped.
+        """
+        if isinstance(endpoint, str):
+            name = endpoint
+        elif endpoint is not None:
+            name = endpoint.__name__
+            resource = getattr(endpoint, "__self__", None)
+            if base_url is None and resource is not None:
+                base_url = _base_url(resource)
+        with self._lock:
+            if endpoint is None:
+                self._entries.clear()
+            elif args or kwargs:
+                key = _key_builder(endpoint)(base_url or _base_url(None), args, kwargs)
+                self._entries.pop(key, None)
+            else:
+                for key in [
+                    k for k in self._entries if k[0] == name and base_url in (None, k[1])
+                ]:
+                    del self._entries[key]
+
+    def stats(self) -> dict:
+        """
+        Hit, miss, coalesced-miss and eviction counts, plus the current size.
+        """
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+response_cache = None
+
+
+class _LeaderCancelled(Exception):
+    """
+    Passed to coalesced waiters when the caller fetching for them was cancelled.
+    """
+
+
+def _key_builder(endpoint):
+    """
+    The ``(base_url, args, kwargs) -> key`` function of an endpoint name or method.
+    """
+    if isinstance(endpoint, str):
+        from .endpoints import KEYS
+
+        if endpoint not in KEYS:
+            raise ValueError(f"{endpoint!r} is not a cached endpoint")
+        key = KEYS[endpoint]
+        return lambda base_url, args, kwargs: key(base_url, *args, **kwargs)
+    return endpoint.cache_key
+
+
+def enable(maxsize: int = 1024, ttls: dict = None, default_ttl: float = 60.0) -> ResponseCache:
+    """
+    Start caching the ``cache=True`` endpoints and return the new cache.
+    Takes the same arguments as :class:`ResponseCache`.
+    """
+    global response_cache
+    response_cache = ResponseCache(maxsize, ttls, default_ttl)
+    return response_cache
+
+
+def disable() -> None:
+    """
+    Stop caching and drop every cached response.
+    """
+    global response_cache
+    response_cache = None
+
+
+def _base_url(resource) -> str:
+    """
+    Base URL of a resource's transport; None stands for the module-level API.
+    """
+    transport = getattr(resource, "_transport", None)
+    return kalshi.constants.BASE_URL if transport is None else transport.base_url
+
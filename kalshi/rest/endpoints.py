@@ -0,0 +1,446 @@
+"""
+Declarative table of the REST endpoints, compiled into resource class methods.
+
+Every endpoint is described once by an :class:`Endpoint`. :func:`define`
+turns the table into ordinary methods with the endpoint's real signature, for
+the sync classes in :mod:`kalshi.rest` and the async ones in
+:mod:`kalshi.rest.aio` alike. The generated code fills the query string or
+JSON body with one ``is not None`` test per parameter and formats bool, list
+and path values inline, so a call does no frame introspection and no generic
+argument scanning. Methods build their URL from ``self._transport.root`` and
+send their request through ``self._request``, which the resource base classes
+implement.
+"""
+import re
+
+from . import cache
+from .pagination import apaginate, paginate
+
+# Default marking a parameter as required.
+REQUIRED = object()
+
+
+class Endpoint:
+    """
+    One REST endpoint.
+
+    Parameters named in ``path`` are substituted into it. The others go into
+    the query string for GET requests and into the JSON body otherwise, and are
+    left out when None.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        method: str,
+        path: str,
+        params: tuple = (),
+        auth: bool = False,
+        page: str = None,
+        cache: bool = False,
+    ):
+        """
+        :param name: Method name, e.g. ``"GetTrades"``.
+        :param method: ``"GET"``, ``"POST"`` or ``"DELETE"``.
+        :param path: Path under ``BASE_PATH`` with ``{param}`` placeholders.
+        :param params: ``(name, type, default)`` tuples in signature order. Use
+            ``REQUIRED`` as the default of required parameters. In queries, bools
+            are sent as ``true``/``false`` and lists comma-separated.
+        :param auth: Sign the request with the access key.
+        :param page: Response field holding the records of a cursor-paginated
+            endpoint. An ``Iter`` method yielding every record is generated too.
+        :param cache: Serve responses from the response cache while it is enabled.
+        """
+        self.name = name
+        self.method = method
+        self.path = path
+        self.params = tuple(params)
+        self.auth = auth
+        self.page = page
+        self.cache = cache
+        self.path_params = frozenset(re.findall(r"{(\w+)}", path))
+
+
+MARKET = (
+    Endpoint(
+        "GetEvents",
+        "GET",
+        "/events",
+        (
+            ("limit", int, 100),
+            ("cursor", str, None),
+            ("status", str, None),
+            ("series_ticker", str, None),
+            ("with_nested_markets", bool, False),
+        ),
+        page="events",
+    ),
+    Endpoint(
+        "GetEvent",
+        "GET",
+        "/events/{event_ticker}",
+        (("event_ticker", str, REQUIRED), ("with_nested_markets", bool, False)),
+        cache=True,
+    ),
+    Endpoint(
+        "GetMarkets",
+        "GET",
+        "/markets",
+        (
+            ("limit", int, 100),
+            ("cursor", str, None),
+            ("event_ticker", str, None),
+            ("series_ticker", str, None),
+            ("max_close_ts", int, None),
+            ("min_close_ts", int, None),
+            ("status", str, None),
+            ("tickers", list, None),
+        ),
+        page="markets",
+    ),
+    Endpoint(
+        "GetTrades",
+        "GET",
+        "/markets/trades",
+        (
+            ("cursor", str, None),
+            ("limit", int, 100),
+            ("ticker", str, None),
+            ("min_ts", int, None),
+            ("max_ts", int, None),
+        ),
+        page="trades",
+    ),
+    Endpoint("GetMarket", "GET", "/markets/{ticker}", (("ticker", str, REQUIRED),), cache=True),
+    Endpoint(
+        "GetMarketOrderbook",
+        "GET",
+        "/markets/{ticker}/orderbook",
+        (("ticker", str, REQUIRED), ("depth", int, None)),
+    ),
+    Endpoint(
+        "GetSeries",
+        "GET",
+        "/series/{series_ticker}",
+        (("series_ticker", str, REQUIRED),),
+        cache=True,
+    ),
+    Endpoint(
+        "GetMarketCandlesticks",
+        "GET",
+        "/series/{series_ticker}/markets/{ticker}/candlesticks",
+        (
+            ("ticker", str, REQUIRED),
+            ("series_ticker", str, REQUIRED),
+            ("start_ts", int, REQUIRED),
+            ("end_ts", int, REQUIRED),
+            ("period_interval", int, REQUIRED),
+        ),
+    ),
+)
+
+EXCHANGE = (
+    Endpoint("GetExchangeAnnouncements", "GET", "/exchange/announcements", cache=True),
+    Endpoint("GetExchangeSchedule", "GET", "/exchange/schedule", cache=True),
+    Endpoint("GetExchangeStatus", "GET", "/exchange/status"),
+)
+
+COLLECTION = (
+    Endpoint(
+        "GetMultivariateEventCollections",
+        "GET",
+        "/multivariate_event_collections",
+        (
+            ("status", str, None),
+            ("associated_event_ticker", str, None),
+            ("series_ticker", str, None),
+            ("limit", int, None),
+            ("cursor", str, None),
+        ),
+        page="multivariate_contracts",
+    ),
+    Endpoint(
+        "GetMultivariateEventCollection",
+        "GET",
+        "/multivariate_event_collections/{collection_ticker}",
+        (("collection_ticker", str, REQUIRED),),
+        cache=True,
+    ),
+)
+
+PORTFOLIO = (
+    Endpoint("GetBalance", "GET", "/portfolio/balance", auth=True),
+    Endpoint(
+        "GetFills",
+        "GET",
+        "/portfolio/fills",
+        (
+            ("ticker", str, None),
+            ("order_id", str, None),
+            ("min_ts", int, None),
+            ("max_ts", int, None),
+            ("limit", int, 100),
+            ("cursor", str, None),
+        ),
+        auth=True,
+        page="fills",
+    ),
+    Endpoint(
+        "GetOrders",
+        "GET",
+        "/portfolio/orders",
+        (
+            ("ticker", str, None),
+            ("event_ticker", str, None),
+            ("min_ts", int, None),
+            ("max_ts", int, None),
+            ("status", str, None),
+            ("cursor", str, None),
+            ("limit", int, 100),
+        ),
+        auth=True,
+        page="orders",
+    ),
+    Endpoint(
+        "GetOrder",
+        "GET",
+        "/portfolio/orders/{order_id}",
+        (("order_id", str, REQUIRED),),
+        auth=True,
+    ),
+    Endpoint(
+        "GetPositions",
+        "GET",
+        "/portfolio/positions",
+        (
+            ("cursor", str, None),
+            ("limit", int, 100),
+            ("count_filter", str, None),
+            ("settlement_status", str, None),
+            ("ticker", str, None),
+            ("event_ticker", str, None),
+        ),
+        auth=True,
+        page="market_positions",
+    ),
+    Endpoint(
+        "GetPortfolioSettlements",
+        "GET",
+        "/portfolio/settlements",
+        (
+            ("limit", int, 100),
+            ("min_ts", int, None),
+            ("max_ts", int, None),
+            ("cursor", str, None),
+        ),
+        auth=True,
+        page="settlements",
+    ),
+    Endpoint(
+        "GetPortfolioRestingOrderTotalValue",
+        "GET",
+        "/portfolio/summary/total_resting_order_value",
+        auth=True,
+    ),
+    Endpoint(
+        "CreateOrder",
+        "POST",
+        "/portfolio/orders",
+        (
+            ("action", str, REQUIRED),
+            ("client_order_id", str, REQUIRED),
+            ("count", int, REQUIRED),
+            ("side", str, REQUIRED),
+            ("ticker", str, REQUIRED),
+            ("type", str, REQUIRED),
+            ("buy_max_cost", int, None),
+            ("expiration_ts", int, None),
+            ("no_price", int, None),
+            ("post_only", bool, None),
+            ("sell_position_floor", int, None),
+            ("yes_price", int, None),
+            ("time_in_force", str, None),
+        ),
+        auth=True,
+    ),
+    Endpoint(
+        "BatchCreateOrders",
+        "POST",
+        "/portfolio/orders/batched",
+        (("orders", list, REQUIRED),),
+        auth=True,
+    ),
+    Endpoint(
+        "AmendOrder",
+        "POST",
+        "/portfolio/orders/{order_id}/amend",
+        (
+            ("order_id", str, REQUIRED),
+            ("action", str, REQUIRED),
+            ("client_order_id", str, REQUIRED),
+            ("count", int, REQUIRED),
+            ("side", str, REQUIRED),
+            ("ticker", str, REQUIRED),
+            ("updated_client_order_id", str, REQUIRED),
+            ("no_price", int, None),
+            ("yes_price", int, None),
+        ),
+        auth=True,
+    ),
+    Endpoint(
+        "DecreaseOrder",
+        "POST",
+        "/portfolio/orders/{order_id}/decrease",
+        (
+            ("order_id", str, REQUIRED),
+            ("reduce_by", int, None),
+            ("reduce_to", int, None),
+        ),
+        auth=True,
+    ),
+    Endpoint(
+        "CancelOrder",
+        "DELETE",
+        "/portfolio/orders/{order_id}",
+        (("order_id", str, REQUIRED),),
+        auth=True,
+    ),
+    Endpoint(
+        "BatchCancelOrders",
+        "DELETE",
+        "/portfolio/orders/batched",
+        (("ids", list, REQUIRED),),
+        auth=True,
+    ),
+)
+
+
+def _signature(params) -> str:
+    parts = ["self"]
+    for name, type_, default in params:
+        annotation = f"{name}: {type_.__name__}"
+        parts.append(annotation if default is REQUIRED else f"{annotation} = {default!r}")
+    return ", ".join(parts)
+
+
+def _query_value(name: str, type_) -> str:
+    if type_ is bool:
+        return f'("true" if {name} else "false")'
+    if type_ is list:
+        return f'",".join({name})'
+    return name
+
+
+def _request_source(
+    spec: Endpoint, asynchronous: bool, name: str = None, cached: bool = False
+) -> str:
+    prefix = "async " if asynchronous else ""
+    lines = [f"{prefix}def {name or spec.name}({_signature(spec.params)}):"]
+    if cached:
+        # Checked inline so the default, cache-less call costs one global lookup.
+        forwarded = ", ".join(param for param, _, _ in spec.params)
+        if asynchronous:
+            fetch = "await response_cache.aget_or_fetch"
+        else:
+            fetch = "response_cache.get_or_fetch"
+        lines += [
+            "    response_cache = _cache.response_cache",
+            "    if response_cache is not None:",
+            f"        return {fetch}(",
+            f"            _key(_cache._base_url(self), {forwarded}),",
+            f"            lambda: _fetch(self, {forwarded}),",
+            "        )",
+        ]
+    lines.append(f'    url = f"{{self._transport.root}}{spec.path}"')
+    query = body = "None"
+    fields = [p for p in spec.params if p[0] not in spec.path_params]
+    if fields:
+        lines.append("    args = {}")
+        for name, type_, _ in fields:
+            value = _query_value(name, type_) if spec.method == "GET" else name
+            lines.append(f"    if {name} is not None:")
+            lines.append(f"        args[{name!r}] = {value}")
+        if spec.method == "GET":
+            query = "args"
+        else:
+            body = "args"
+    call = f"self._request({spec.name!r}, {spec.method!r}, url, {query}, {body}, {spec.auth})"
+    lines.append(f"    return {'await ' if asynchronous else ''}{call}")
+    return "\n".join(lines)
+
+
+def _iter_source(spec: Endpoint) -> str:
+    params = [p for p in spec.params if p[0] != "cursor"]
+    forwarded = "".join(f", {name}={name}" for name, _, _ in params)
+    return (
+        f"def Iter{spec.name[3:]}({_signature(params)}):\n"
+        f"    return _paginate(self.{spec.name}, {spec.page!r}{forwarded})"
+    )
+
+
+def _key_source(spec: Endpoint) -> str:
+    items = "".join(f"({name!r}, {name}), " for name, _, _ in spec.params)
+    return (
+        f"def _key(base_url, {_signature(spec.params)[len('self, '):]}):\n"
+        f"    return ({spec.name!r}, base_url, ({items}))"
+    )
+
+
+def _compile(source: str, name: str, namespace: dict):
+    exec(compile(source, f"<endpoint {name}>", "exec"), namespace)
+    return namespace[name]
+
+
+# Cache key builder of every cached endpoint, shared by its sync and async methods
+# so that both read and invalidate the same entries.
+KEYS = {
+    spec.name: _compile(_key_source(spec), "_key", {})
+    for spec in MARKET + EXCHANGE + COLLECTION + PORTFOLIO
+    if spec.cache
+}
+
+
+def build(spec: Endpoint, asynchronous: bool = False) -> dict:
+    """
+    Compile one endpoint into methods: ``{name: function}`` with the request method
+    and, for paginated endpoints, its ``Iter`` method.
+
+    Methods of cached endpoints serve responses from ``cache.response_cache`` while
+    it is enabled, and carry a ``cache_key(base_url, args, kwargs)`` attribute.
+    """
+    namespace = {
+        "_paginate": apaginate if asynchronous else paginate,
+        "_cache": cache,
+    }
+    if spec.cache:
+        key = namespace["_key"] = KEYS[spec.name]
+        namespace["_fetch"] = _compile(
+            _request_source(spec, asynchronous, "_fetch"), "_fetch", namespace
+        )
+    method = _compile(_request_source(spec, asynchronous, cached=spec.cache), spec.name, namespace)
+    method.__doc__ = f"``{spec.method} {spec.path}``"
+    if spec.cache:
+        method.cache_key = lambda base_url, args, kwargs: key(base_url, *args, **kwargs)
+    methods = {spec.name: method}
+    if spec.page is not None:
+        name = f"Iter{spec.name[3:]}"
+        iterator = _compile(_iter_source(spec), name, namespace)
+        iterator.__doc__ = f"Every record of :meth:`{spec.name}`, across all pages."
+        methods[name] = iterator
+    return methods
+
+
+def define(specs, asynchronous: bool = False):
+    """
+    Class decorator adding the compiled methods of ``specs`` to a resource class.
+    """
+
+    def decorate(cls):
+        for spec in specs:
+            for name, fn in build(spec, asynchronous).items():
+                fn.__module__ = cls.__module__
+                fn.__qualname__ = f"{cls.__name__}.{name}"
+                setattr(cls, name, fn)
+        return cls
+
+    return decorate
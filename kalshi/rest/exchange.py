@@ -1,22 +1,10 @@
-from .rest import get
-import kalshi.constants
+from .rest import Resource
+from .endpoints import EXCHANGE, define
 
 
-class Exchange:
-    def GetExchangeAnnouncements(self):
-        return get(
-            f"{kalshi.constants.BASE_URL}{kalshi.constants.BASE_PATH}/exchange/announcements"
-        )
-
-    def GetExchangeSchedule(self):
-        return get(
-            f"{kalshi.constants.BASE_URL}{kalshi.constants.BASE_PATH}/exchange/schedule"
-        )
-
-    def GetExchangeStatus(self):
-        return get(
-            f"{kalshi.constants.BASE_URL}{kalshi.constants.BASE_PATH}/exchange/status"
-        )
+@define(EXCHANGE)
+class Exchange(Resource):
+    pass
 
 
 exchange = Exchange()
@@ -0,0 +1,212 @@
+import os
+import struct
+import tempfile
+import threading
+import time
+
+# Requests per second allowed by each Kalshi API access tier.
+TIERS = {
+    "basic": {"read": 20, "write": 10},
+    "advanced": {"read": 30, "write": 30},
+    "premier": {"read": 100, "write": 100},
+}
+DEFAULT_TIER = "advanced"
+
+
+class TokenBucket:
+    """
+    A thread-safe token bucket.
+
+    Tokens refill continuously at ``rate`` per second up to ``burst``. A caller
+    takes its token immediately and, if the bucket is empty, sleeps only for the
+    time until that token is actually earned. Reservations are made under a
+    lock, so threads and coroutines sharing one bucket are paced together.
+    """
+
+    def __init__(self, rate: float, burst: float = None):
+        """
+        :param rate: Tokens added per second.
+        :param burst: Maximum number of tokens the bucket can hold (default = rate).
+        """
+        self._lock = threading.Lock()
+        self.configure(rate, burst)
+        self._tokens = self.burst
+        self._last = time.monotonic()
+
+    def configure(self, rate: float, burst: float = None) -> None:
+        """
+        Change the refill rate and burst size. Tokens already earned are kept.
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        with self._lock:
+            self.rate = float(rate)
+            self.burst = float(burst if burst is not None else rate)
+
+    def _take(self, tokens: float, now: float, level: float, last: float):
+        level = min(self.burst, level + (now - last) * self.rate)
+        level -= tokens
+        wait = -level / self.rate if level < 0 else 0.0
+        return level, wait
+
+    def reserve(self, tokens: float = 1) -> float:
+        """
+        Take ``tokens`` from the bucket and return the seconds to wait before using them.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens, wait = self._take(tokens, now, self._tokens, self._last)
+            self._last = now
+        return wait
+
+    def try_acquire(self, tokens: float = 1) -> bool:
+        """
+        Take ``tokens`` only if they are available right now.
+        """
+        with self._lock:
+            now = time.monotonic()
+            level = min(self.burst, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            if level < tokens:
+                self._tokens = level
+                return False
+            self._tokens = level - tokens
+            return True
+
+    def acquire(self, tokens: float = 1) -> float:
+        """
+        Block until ``tokens`` are available. Returns the time spent waiting.
+        """
+        wait = self.reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self, tokens: float = 1) -> float:
+        """
+        Wait without blocking the event loop until ``tokens`` are available.
+        Returns the time spent waiting.
+        """
+        import asyncio
+
+        wait = self.reserve(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+
+class SharedTokenBucket(TokenBucket):
+    """
+    A token bucket whose state lives in a small file so that every process on
+    the host using the same ``name`` draws from one budget.
+
+    Cross-process exclusion uses ``fcntl.flock``, so this is POSIX only.
+    """
+
+    _STATE = struct.Struct("dd")
+
+    def __init__(self, name: str, rate: float, burst: float = None, path: str = None):
+        """
+        :param name: Bucket name, e.g. ``"read"``. Processes sharing a name share tokens.
+        :param rate: Tokens added per second.
+        :param burst: Maximum number of tokens the bucket can hold (default = rate).
+        :param path: State file location (default = a file in the system temp directory).
+        """
+        import fcntl
+
+        self._flock = fcntl.flock
+        self._LOCK_EX = fcntl.LOCK_EX
+        self._LOCK_UN = fcntl.LOCK_UN
+        self.path = path or os.path.join(
+            tempfile.gettempdir(), f"kalshi-ratelimit-{name}.bin"
+        )
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        super().__init__(rate, burst)
+
+    def __del__(self):
+        fd = getattr(self, "_fd", None)
+        if fd is not None:
+            os.close(fd)
+
+    def _read_state(self, now: float):
+        data = os.pread(self._fd, self._STATE.size, 0)
+        if len(data) < self._STATE.size:
+            return self.burst, now
+        level, last = self._STATE.unpack(data)
+        if last > now:
+            # The monotonic clock was reset (e.g. a reboot); start from a full bucket.
+            return self.burst, now
+        return level, last
+
+    def _update(self, fn):
+        with self._lock:
+            self._flock(self._fd, self._LOCK_EX)
+            try:
+                now = time.monotonic()
+                level, last = self._read_state(now)
+                level, result = fn(now, level, last)
+                os.pwrite(self._fd, self._STATE.pack(level, now), 0)
+                return result
+            finally:
+                self._flock(self._fd, self._LOCK_UN)
+
+    def reserve(self, tokens: float = 1) -> float:
+        return self._update(lambda now, level, last: self._take(tokens, now, level, last))
+
+    def try_acquire(self, tokens: float = 1) -> bool:
+        def take(now, level, last):
+            level = min(self.burst, level + (now - last) * self.rate)
+            if level < tokens:
+                return level, False
+            return level - tokens, True
+
+        return self._update(take)
+
+
+read_limiter = TokenBucket(TIERS[DEFAULT_TIER]["read"])
+write_limiter = TokenBucket(TIERS[DEFAULT_TIER]["write"])
+
+
+def create(
+    tier: str = None,
+    read_rate: float = None,
+    write_rate: float = None,
+    burst: float = None,
+    shared: bool = False,
+    name: str = "",
+):
+    """
+    Build a ``(read, write)`` pair of limiters. Takes the arguments of :func:`configure`.
+
+    :param name: Prefix of the shared bucket names, so that processes sharing a
+        budget can be told apart from those of another account.
+    """
+    rates = TIERS[tier or DEFAULT_TIER]
+    read_rate = read_rate or rates["read"]
+    write_rate = write_rate or rates["write"]
+    if shared:
+        return (
+            SharedTokenBucket(f"{name}read", read_rate, burst),
+            SharedTokenBucket(f"{name}write", write_rate, burst),
+        )
+    return TokenBucket(read_rate, burst), TokenBucket(write_rate, burst)
+
+
+def configure(
+    tier: str = None,
+    read_rate: float = None,
+    write_rate: float = None,
+    burst: float = None,
+    shared: bool = False,
+) -> None:
+    """
+    Replace the module-wide read and write limiters used by the REST clients.
+
+    :param tier: Access tier name from ``TIERS`` (default = advanced).
+    :param read_rate: Reads per second, overriding the tier.
+    :param write_rate: Writes per second, overriding the tier.
+    :param burst: Bucket size for both limiters (default = one second of requests).
+    :param shared: Share the budget with every process on this host that also sets shared=True.
+    """
+    global read_limiter, write_limiter
+    read_limiter, write_limiter = create(tier, read_rate, write_rate, burst, shared)
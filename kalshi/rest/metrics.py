@@ -0,0 +1,286 @@
+"""
+Request hooks and per-endpoint latency metrics for the REST clients.
+
+While no hook is registered, requests take the uninstrumented path and the
+only cost is one flag check. Once a hook is registered, every request is
+described by a :class:`RequestRecord` holding the time spent in each phase:
+
+* ``limiter``: waiting for the rate limiter.
+* ``sign``: signing the request (authenticated endpoints only).
+* ``first_byte``: from sending the request until the response headers arrived.
+* ``send``: the whole HTTP exchange, including upload and body download.
+* ``decode``: decoding the JSON response.
+* ``total``: the whole call.
+
+:func:`enable` registers a :class:`Metrics` collector that aggregates these
+records into histograms and counters, exportable as a dict or in the
+Prometheus text format.
+"""
+import bisect
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds in seconds of the histogram buckets, as used by Prometheus clients.
+DEFAULT_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+# True while any hook is registered. Checked by the request functions on every call.
+active = False
+
+# Replaced rather than mutated, so requests can iterate them without a lock.
+_pre_hooks = ()
+_post_hooks = ()
+
+
+class RequestRecord:
+    """
+    One REST request as seen by the hooks.
+
+    ``status``, ``bytes_received`` and ``error`` are only set once the request
+    completes. ``timings`` maps phase names to seconds.
+    """
+
+    __slots__ = (
+        "endpoint",
+        "method",
+        "url",
+        "status",
+        "bytes_sent",
+        "bytes_received",
+        "error",
+        "timings",
+        "_start",
+    )
+
+    def __init__(self, endpoint: str, method: str, url: str):
+        self.endpoint = endpoint
+        self.method = method
+        self.url = url
+        self.status = None
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.error = None
+        self.timings = {}
+        self._start = time.perf_counter()
+
+    def mark(self, phase: str, since: float) -> float:
+        """
+        Record the time from ``since`` until now as ``phase`` and return now.
+        """
+        now = time.perf_counter()
+        self.timings[phase] = now - since
+        return now
+
+
+def _run(hooks: tuple, record: RequestRecord) -> None:
+    for hook in hooks:
+        try:
+            hook(record)
+        except Exception:
+            logger.exception("Request hook %r failed", hook)
+
+
+def start(endpoint: str, method: str, url: str) -> RequestRecord:
+    """
+    Create the record of a new request and run the pre-request hooks.
+    """
+    record = RequestRecord(endpoint, method, url)
+    _run(_pre_hooks, record)
+    return record
+
+
+def finish(record: RequestRecord) -> None:
+    """
+    Record the total time and run the post-request hooks.
+    """
+    record.mark("total", record._start)
+    _run(_post_hooks, record)
+
+
+def add_hook(pre=None, post=None) -> None:
+    """
+    Register functions called with the :class:`RequestRecord` of every request:
+    ``pre`` before it is rate limited and sent, ``post`` once it has completed or failed.
+    Hooks run on the requesting thread or event loop, so they should be fast.
+    """
+    global _pre_hooks, _post_hooks, active
+    if pre is not None:
+        _pre_hooks += (pre,)
+    if post is not None:
+        _post_hooks += (post,)
+    active = bool(_pre_hooks or _post_hooks)
+
+
+def remove_hook(hook) -> None:
+    """
+    Unregister ``hook`` as a pre- and post-request hook.
+    """
+    global _pre_hooks, _post_hooks, active
+    _pre_hooks = tuple(h for h in _pre_hooks if h is not hook)
+    _post_hooks = tuple(h for h in _post_hooks if h is not hook)
+    active = bool(_pre_hooks or _post_hooks)
+
+
+class Histogram:
+    """
+    Counts of observations per bucket, plus their sum.
+    """
+
+    def __init__(self, buckets: tuple = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> list:
+        """
+        ``(upper_bound, count)`` pairs with cumulative counts, ending with ``inf``.
+        """
+        total = 0
+        out = []
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            total += count
+            out.append((bound, total))
+        return out
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "mean": self.sum / self.count if self.count else 0.0,
+            "buckets": {str(bound): count for bound, count in self.cumulative()},
+        }
+
+
+class Metrics:
+    """
+    Aggregates request records into per-endpoint phase histograms and counters
+    of requests by status code and of bytes sent and received.
+
+    Use an instance as a post-request hook, or call :func:`enable`.
+    """
+
+    def __init__(self, buckets: tuple = DEFAULT_BUCKETS):
+        """
+        :param buckets: Histogram bucket upper bounds in seconds.
+        """
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.phases = {}
+            self.requests = {}
+            self.bytes_sent = {}
+            self.bytes_received = {}
+
+    def __call__(self, record: RequestRecord) -> None:
+        endpoint = record.endpoint
+        status = str(record.status) if record.status is not None else "error"
+        with self._lock:
+            for phase, seconds in record.timings.items():
+                histogram = self.phases.get((endpoint, phase))
+                if histogram is None:
+                    histogram = self.phases[(endpoint, phase)] = Histogram(self.buckets)
+                histogram.observe(seconds)
+            key = (endpoint, status)
+            self.requests[key] = self.requests.get(key, 0) + 1
+            self.bytes_sent[endpoint] = self.bytes_sent.get(endpoint, 0) + record.bytes_sent
+            self.bytes_received[endpoint] = (
+                self.bytes_received.get(endpoint, 0) + record.bytes_received
+            )
+
+    def to_dict(self) -> dict:
+        """
+        Everything collected, keyed by endpoint::
+
+            {"GetTrades": {"requests": {"200": 12}, "bytes_sent": 0,
+                           "bytes_received": 48213,
+                           "phases": {"send": {"count": 12, "sum": ..., "mean": ...,
+                                               "buckets": {"0.0005": 0, ...}}, ...}}}
+        """
+        with self._lock:
+            out = {}
+
+            def entry(endpoint):
+                return out.setdefault(
+                    endpoint,
+                    {"requests": {}, "bytes_sent": 0, "bytes_received": 0, "phases": {}},
+                )
+
+            for (endpoint, status), count in self.requests.items():
+                entry(endpoint)["requests"][status] = count
+            for endpoint, count in self.bytes_sent.items():
+                entry(endpoint)["bytes_sent"] = count
+            for endpoint, count in self.bytes_received.items():
+                entry(endpoint)["bytes_received"] = count
+            for (endpoint, phase), histogram in self.phases.items():
+                entry(endpoint)["phases"][phase] = histogram.to_dict()
+            return out
+
+    def to_prometheus(self, prefix: str = "kalshi_rest") -> str:
+        """
+        Everything collected in the Prometheus text exposition format.
+        """
+        lines = [
+            f"# HELP {prefix}_phase_seconds Time spent in each phase of a request.",
+            f"# TYPE {prefix}_phase_seconds histogram",
+        ]
+        with self._lock:
+            for (endpoint, phase), histogram in sorted(self.phases.items()):
+                labels = f'endpoint="{endpoint}",phase="{phase}"'
+                for bound, count in histogram.cumulative():
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    lines.append(f'{prefix}_phase_seconds_bucket{{{labels},le="{le}"}} {count}')
+                lines.append(f"{prefix}_phase_seconds_sum{{{labels}}} {histogram.sum!r}")
+                lines.append(f"{prefix}_phase_seconds_count{{{labels}}} {histogram.count}")
+            lines += [
+                f"# HELP {prefix}_requests_total Requests by endpoint and status code.",
+                f"# TYPE {prefix}_requests_total counter",
+            ]
+            for (endpoint, status), count in sorted(self.requests.items()):
+                lines.append(
+                    f'{prefix}_requests_total{{endpoint="{endpoint}",status="{status}"}} {count}'
+                )
+            for name, counts in (("sent", self.bytes_sent), ("received", self.bytes_received)):
+                lines += [
+                    f"# HELP {prefix}_{name}_bytes_total Bytes {name} by endpoint.",
+                    f"# TYPE {prefix}_{name}_bytes_total counter",
+                ]
+                for endpoint, count in sorted(counts.items()):
+                    lines.append(f'{prefix}_{name}_bytes_total{{endpoint="{endpoint}"}} {count}')
+        return "\n".join(lines) + "\n"
+
+
+collector = None
+
+
+def enable(buckets: tuple = DEFAULT_BUCKETS) -> Metrics:
+    """
+    Start collecting metrics for every REST request and return the collector.
+    """
+    global collector
+    disable()
+    collector = Metrics(buckets)
+    add_hook(post=collector)
+    return collector
+
+
+def disable() -> None:
+    """
+    Stop collecting metrics. Other hooks stay registered.
+    """
+    global collector
+    if collector is not None:
+        remove_hook(collector)
+        collector = None
@@ -0,0 +1,86 @@
+from concurrent.futures import ThreadPoolExecutor
+
+
+def paginate_pages(fetch, key: str, prefetch: bool = True, **params):
+    """
+    Lazily yield each page of records from a cursor-paginated endpoint as a list.
+
+    While the caller consumes page N, page N+1 is requested on a background
+    thread, so network time overlaps with processing and only about two pages
+    are held in memory at once.
+
+    :param fetch: A bound endpoint method accepting a ``cursor`` keyword, e.g. ``market.GetTrades``.
+    :param key: The response field holding the page's records, e.g. ``"trades"``.
+    :param prefetch: Request the next page in the background (default = True).
+    :param params: Remaining query parameters passed to ``fetch`` on every page.
+    """
+    if not prefetch:
+        cursor = None
+        while True:
+            resp = fetch(cursor=cursor, **params)
+            cursor = resp.get("cursor")
+            yield resp.get(key) or []
+            if not cursor:
+                return
+
+    pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="kalshi-prefetch")
+    future = None
+    try:
+        future = pool.submit(fetch, cursor=None, **params)
+        while future is not None:
+            resp = future.result()
+            cursor = resp.get("cursor")
+            future = pool.submit(fetch, cursor=cursor, **params) if cursor else None
+            yield resp.get(key) or []
+    finally:
+        if future is not None:
+            future.cancel()
+        pool.shutdown(wait=False)
+
+
+def paginate(fetch, key: str, prefetch: bool = True, **params):
+    """
+    Lazily yield every record from a cursor-paginated endpoint.
+    Takes the same arguments as :func:`paginate_pages`.
+    """
+    for page in paginate_pages(fetch, key, prefetch, **params):
+        yield from page
+
+
+async def apaginate_pages(fetch, key: str, prefetch: bool = True, **params):
+    """
+    Async counterpart of :func:`paginate_pages` for coroutine endpoint methods.
+
+    The next page is requested as a task on the running loop while the caller
+    consumes the current one.
+    """
+    import asyncio
+
+    if not prefetch:
+        cursor = None
+        while True:
+            resp = await fetch(cursor=cursor, **params)
+            cursor = resp.get("cursor")
+            yield resp.get(key) or []
+            if not cursor:
+                return
+
+    task = asyncio.ensure_future(fetch(cursor=None, **params))
+    try:
+        while task is not None:
+            resp = await task
+            cursor = resp.get("cursor")
+            task = asyncio.ensure_future(fetch(cursor=cursor, **params)) if cursor else None
+            yield resp.get(key) or []
+    finally:
+        if task is not None:
+            task.cancel()
+
+
+async def apaginate(fetch, key: str, prefetch: bool = True, **params):
+    """
+    Async counterpart of :func:`paginate` for coroutine endpoint methods.
+    """
+    async for page in apaginate_pages(fetch, key, prefetch, **params):
+        for record in page:
+            yield record
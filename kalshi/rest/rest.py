@@ -1,36 +1,19 @@
-import urllib.parse
 import requests
-import json
 import inspect
+import threading
 import time
-from datetime import datetime, timedelta
 
-# Rate limiter for advanced access tier: Read 30/sec, Write 30/sec
-_last_read_call_time = datetime.now()
-_last_write_call_time = datetime.now()
-_READ_THRESHOLD_MS = 33  # 1000ms / 30 = 33ms between read calls
-_WRITE_THRESHOLD_MS = 33  # 1000ms / 30 = 33ms between write calls
+import kalshi.auth
+import kalshi.constants
+from . import limiter, metrics, retry
+from .. import codec
+
+# Maximum number of pooled connections per host, sized for concurrent callers.
+POOL_MAXSIZE = 32
 
 # Reuse a single session so subsequent requests can reuse pooled connections.
 SESSION = requests.Session()
-
-
-def _rate_limit_read():
-	global _last_read_call_time
-	now = datetime.now()
-	threshold_delta = timedelta(milliseconds=_READ_THRESHOLD_MS)
-	if now - _last_read_call_time < threshold_delta:
-		time.sleep(_READ_THRESHOLD_MS / 1000)
-	_last_read_call_time = datetime.now()
-
-
-def _rate_limit_write():
-	global _last_write_call_time
-	now = datetime.now()
-	threshold_delta = timedelta(milliseconds=_WRITE_THRESHOLD_MS)
-	if now - _last_write_call_time < threshold_delta:
-		time.sleep(_WRITE_THRESHOLD_MS / 1000)
-	_last_write_call_time = datetime.now()
+SESSION.mount("https://", requests.adapters.HTTPAdapter(pool_maxsize=POOL_MAXSIZE))
 
 
 def get_kwargs():
@@ -47,28 +30,286 @@ def drop_none(dictionary: dict):
     return {i: dictionary[i] for i in dictionary if dictionary[i] is not None}
 
 
+def _json_body(headers, body):
+    """
+    Encode ``body`` with the active codec and add the JSON content type to ``headers``.
+    """
+    if body is None:
+        return headers, None
+    headers = dict(headers) if headers else {}
+    headers["Content-Type"] = "application/json"
+    return headers, codec.dumpb(body)
+
+
+# Status code of a successful response, per method.
+_SUCCESS = {"GET": 200, "POST": 201, "DELETE": 200}
+
+
+class KalshiHTTPError(Exception):
+    """
+    A response with an unexpected status. ``str(error)`` is the response body.
+    """
+
+    def __init__(self, status: int, body: str, retry_after: float = None, method: str = None, url: str = None):
+        super().__init__(body)
+        self.status = status
+        self.body = body
+        self.retry_after = retry_after
+        self.method = method
+        self.url = url
+
+
+def _http_error(method, url, status, content, headers) -> KalshiHTTPError:
+    return KalshiHTTPError(
+        status,
+        content.decode(errors="replace"),
+        retry.parse_retry_after(headers.get("Retry-After")),
+        method,
+        url,
+    )
+
+
+# Errors raised before a response arrived, retried like a retryable status.
+_TRANSPORT_ERRORS = (requests.ConnectionError, requests.Timeout)
+
+
+# Threads running hedged GETs, created on first use and shared by every transport.
+HEDGE_WORKERS = 16
+_hedge_executor = None
+_hedge_executor_lock = threading.Lock()
+
+
+def _hedge_pool():
+    global _hedge_executor
+    if _hedge_executor is None:
+        from concurrent.futures import ThreadPoolExecutor
+
+        with _hedge_executor_lock:
+            if _hedge_executor is None:
+                _hedge_executor = ThreadPoolExecutor(
+                    HEDGE_WORKERS, thread_name_prefix="kalshi-hedge"
+                )
+    return _hedge_executor
+
+
+class Transport:
+    """
+    The connection pool, rate limiters, credentials and environment requests are sent with.
+
+    Arguments left as None fall back, on every call, to the module-wide defaults:
+    ``SESSION``, the limiters of :mod:`kalshi.rest.limiter`, ``kalshi.auth.auth``
+    and ``kalshi.constants.BASE_URL``. The module-level API uses such a transport,
+    so it keeps following ``use_demo``/``use_prod``, ``limiter.configure`` and
+    ``auth.set_key``; a :class:`kalshi.client.KalshiClient` sets all of them.
+    """
+
+    def __init__(
+        self,
+        session: requests.Session = None,
+        read_limiter: limiter.TokenBucket = None,
+        write_limiter: limiter.TokenBucket = None,
+        auth: kalshi.auth.Auth = None,
+        base_url: str = None,
+    ):
+        """
+        :param session: Session whose connection pool requests are sent through.
+        :param read_limiter: Bucket paying for GET requests.
+        :param write_limiter: Bucket paying for POST and DELETE requests.
+        :param auth: Credentials signing authenticated endpoints.
+        :param base_url: Scheme and host of the API, e.g. ``kalshi.constants.PROD_BASE_URL``.
+        """
+        self._session = session
+        self._read_limiter = read_limiter
+        self._write_limiter = write_limiter
+        self._auth = auth
+        self._base_url = base_url
+        self._root = base_url + kalshi.constants.BASE_PATH if base_url else None
+
+    @property
+    def session(self) -> requests.Session:
+        return self._session or SESSION
+
+    @property
+    def read_limiter(self) -> limiter.TokenBucket:
+        return self._read_limiter or limiter.read_limiter
+
+    @property
+    def write_limiter(self) -> limiter.TokenBucket:
+        return self._write_limiter or limiter.write_limiter
+
+    @property
+    def auth(self) -> kalshi.auth.Auth:
+        return self._auth or kalshi.auth.auth
+
+    @property
+    def base_url(self) -> str:
+        return self._base_url or kalshi.constants.BASE_URL
+
+    @property
+    def root(self) -> str:
+        """
+        URL prefix of every endpoint path: the base URL followed by ``BASE_PATH``.
+        """
+        return self._root or kalshi.constants.BASE_URL + kalshi.constants.BASE_PATH
+
+    def _rate_limit(self, method):
+        if method == "GET":
+            (self._read_limiter or limiter.read_limiter).acquire()
+        else:
+            (self._write_limiter or limiter.write_limiter).acquire()
+
+    def _send_instrumented(self, method, url, params, body, headers, sign, endpoint):
+        record = metrics.start(endpoint or method, method, url)
+        try:
+            t = time.perf_counter()
+            self._rate_limit(method)
+            t = record.mark("limiter", t)
+            if sign is not None:
+                headers = {**headers, **sign(method, url)} if headers else sign(method, url)
+                t = record.mark("sign", t)
+            headers, data = _json_body(headers, body)
+            record.bytes_sent = len(data) if data else 0
+            response = self.session.request(method, url, params=params, headers=headers, data=data)
+            content = response.content
+            t = record.mark("send", t)
+            record.timings["first_byte"] = response.elapsed.total_seconds()
+            record.status = response.status_code
+            record.bytes_received = len(content)
+            if response.status_code != _SUCCESS[method]:
+                raise _http_error(method, url, response.status_code, content, response.headers)
+            result = codec.loads(content)
+            record.mark("decode", t)
+            return result
+        except BaseException as e:
+            record.error = e
+            raise
+        finally:
+            metrics.finish(record)
+
+    def _send(self, method, url, params, body, headers, sign, endpoint):
+        """
+        Make one attempt at a request.
+        """
+        if metrics.active:
+            return self._send_instrumented(method, url, params, body, headers, sign, endpoint)
+        self._rate_limit(method)
+        if sign is not None:
+            headers = {**headers, **sign(method, url)} if headers else sign(method, url)
+        headers, data = _json_body(headers, body)
+        response = self.session.request(method, url, params=params, headers=headers, data=data)
+        if response.status_code != _SUCCESS[method]:
+            raise _http_error(method, url, response.status_code, response.content, response.headers)
+        return codec.loads(response.content)
+
+    def _send_hedged(self, hedge, method, url, params, body, headers, sign, endpoint):
+        """
+        Make one attempt at a GET, sending a second copy if the first is slower than
+        the endpoint's hedge delay, and return the first successful response.
+        """
+        from concurrent.futures import FIRST_COMPLETED, wait
+
+        key = endpoint or method
+        delay = hedge.delay(key)
+        args = (method, url, params, body, headers, sign, endpoint)
+        if delay is None:
+            start = time.perf_counter()
+            result = self._send(*args)
+            hedge.observe(key, time.perf_counter() - start)
+            return result
+
+        def timed():
+            start = time.perf_counter()
+            result = self._send(*args)
+            hedge.observe(key, time.perf_counter() - start)
+            return result
+
+        executor = _hedge_pool()
+        first = executor.submit(timed)
+        done, _ = wait([first], timeout=delay)
+        if done:
+            return first.result()
+        hedge.sent()
+        second = executor.submit(timed)
+        pending = {first, second}
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    if future is second:
+                        hedge.won()
+                    return future.result()
+                error = error or future.exception()
+        raise error
+
+    def request(self, method, url, params=None, body=None, headers=None, sign=None, endpoint=None):
+        """
+        Send a rate-limited request and return the decoded response, retrying
+        failures according to :mod:`kalshi.rest.retry`.
+
+        :param params: Query parameters, already formatted as strings or numbers.
+        :param body: JSON body, encoded with the active codec.
+        :param sign: Function ``(method, url) -> headers`` adding authentication
+            headers, called after the rate limiter so the timestamp is fresh.
+        :param endpoint: Name reported to the :mod:`kalshi.rest.metrics` hooks
+            (default = the HTTP method).
+        :raises KalshiHTTPError: The final attempt got an unexpected status.
+        """
+        attempt = 0
+        while True:
+            try:
+                hedge = retry.hedge
+                if hedge is not None and method == "GET":
+                    return self._send_hedged(hedge, method, url, params, body, headers, sign, endpoint)
+                return self._send(method, url, params, body, headers, sign, endpoint)
+            except KalshiHTTPError as e:
+                policy = retry.policy
+                attempt += 1
+                delay = policy and policy.delay(method, body, attempt, e.status, e.retry_after)
+                if delay is None:
+                    raise
+            except _TRANSPORT_ERRORS:
+                policy = retry.policy
+                attempt += 1
+                delay = policy and policy.delay(method, body, attempt)
+                if delay is None:
+                    raise
+            time.sleep(delay)
+
+
+# Transport of the module-level API, resolving every setting from the module-wide defaults.
+default_transport = Transport()
+request = default_transport.request
+
+
 def get(url, headers=None, **kwargs):
-    _rate_limit_read()
     for i in kwargs:
         if isinstance(kwargs[i], bool):
             kwargs[i] = str(kwargs[i]).lower()
-    response = SESSION.get(url, params=kwargs, headers=headers)
-    if response.status_code != 200:
-        raise Exception(response.content.decode())
-    return json.loads(response.content)
+    return request("GET", url, params=kwargs, headers=headers)
 
 
 def post(url, headers=None, body=None):
-    _rate_limit_write()
-    response = SESSION.post(url, headers=headers, json=body)
-    if response.status_code != 201:
-        raise Exception(response.content.decode())
-    return json.loads(response.content)
+    return request("POST", url, body=body, headers=headers)
 
 
 def delete(url, headers=None, body=None):
-    _rate_limit_write()
-    response = SESSION.delete(url, headers=headers, json=body)
-    if response.status_code != 200:
-        raise Exception(response.content.decode())
-    return json.loads(response.content)
+    return request("DELETE", url, body=body, headers=headers)
+
+
+class Resource:
+    """
+    Base of the REST endpoint classes, whose methods are generated by
+    :func:`kalshi.rest.endpoints.define` and send requests through :meth:`_request`.
+    """
+
+    def __init__(self, transport: Transport = None):
+        """
+        :param transport: Where requests are sent (default = the module-wide defaults).
+        """
+        self._transport = transport or default_transport
+
+    def _request(self, endpoint, method, url, params, body, auth):
+        transport = self._transport
+        sign = transport.auth.request_headers if auth else None
+        return transport.request(method, url, params, body, None, sign, endpoint)
@@ -0,0 +1,240 @@
+"""
+Retry and hedging policies for the REST clients.
+
+Retries are off by default: every error is raised on the first failure until
+:func:`configure` installs a policy. Failed requests are then retried with
+exponential backoff and full jitter, waiting at least as long as the server's
+``Retry-After``. Requests are only repeated when that cannot execute something
+twice:
+
+* ``429 Too Many Requests`` is always retried, as the exchange rejected the
+  request without processing it.
+* GET and DELETE are retried on connection errors and on the statuses in
+  ``RETRY_STATUSES``.
+* POST is retried on those errors only when its body carries a
+  ``client_order_id`` (for batch creates, every order must), so the exchange
+  recognises a repeated create instead of placing a second order.
+
+Hedged GETs, off by default, send a second copy of a read once it has taken
+longer than the recent p95 latency of its endpoint and use whichever response
+arrives first.
+"""
+import random
+import threading
+import time
+from collections import deque
+
+# Statuses worth retrying besides 429: the server failed or was unavailable.
+RETRY_STATUSES = frozenset((500, 502, 503, 504))
+
+
+def parse_retry_after(value: str):
+    """
+    Seconds to wait from a ``Retry-After`` header, given in seconds or as an HTTP date.
+    Returns None when the header is missing or malformed.
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    from email.utils import parsedate_to_datetime
+
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class RetryPolicy:
+    """
+    When and how long to wait before repeating a failed request.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 4,
+        backoff: float = 0.25,
+        max_backoff: float = 10.0,
+        max_retry_after: float = 60.0,
+        statuses=RETRY_STATUSES,
+    ):
+        """
+        :param max_attempts: Total attempts per request, including the first.
+        :param backoff: Backoff cap after the first failure, doubling per failure.
+        :param max_backoff: Upper limit of the backoff cap.
+        :param max_retry_after: Longest ``Retry-After`` honoured; longer values are clipped.
+        :param statuses: Statuses other than 429 that are retried for safe requests.
+        """
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.max_retry_after = max_retry_after
+        self.statuses = frozenset(statuses)
+        self.retries = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def safe(method: str, body) -> bool:
+        """
+        Whether repeating the request cannot have a second effect.
+        """
+        if method in ("GET", "DELETE"):
+            return True
+        if method == "POST" and isinstance(body, dict):
+            if "client_order_id" in body:
+                return True
+            orders = body.get("orders")
+            return bool(orders) and all("client_order_id" in o for o in orders)
+        return False
+
+    def delay(self, method: str, body, attempt: int, status: int = None, retry_after: float = None):
+        """
+        Seconds to wait before the next attempt, or None to give up.
+
+        :param attempt: Number of attempts that have failed so far.
+        :param status: Response status, or None for a connection error.
+        :param retry_after: Parsed ``Retry-After`` of the response, if any.
+        """
+        if attempt >= self.max_attempts:
+            return None
+        if status != 429:
+            if status is not None and status not in self.statuses:
+                return None
+            if not self.safe(method, body):
+                return None
+        delay = random.uniform(0, min(self.max_backoff, self.backoff * 2 ** (attempt - 1)))
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.max_retry_after))
+        with self._lock:
+            self.retries += 1
+        return delay
+
+
+class HedgePolicy:
+    """
+    Tracks recent GET latencies per endpoint and decides when to send a hedge.
+    """
+
+    def __init__(
+        self,
+        quantile: float = 0.95,
+        window: int = 200,
+        min_samples: int = 20,
+        min_delay: float = 0.005,
+        max_delay: float = 2.0,
+    ):
+        """
+        :param quantile: Latency quantile after which a hedge is sent.
+        :param window: Recent latencies kept per endpoint.
+        :param min_samples: Latencies needed before an endpoint is hedged.
+        :param min_delay: Shortest hedge delay in seconds.
+        :param max_delay: Longest hedge delay in seconds.
+        """
+        self.quantile = quantile
+        self.window = window
+        self.min_samples = min_samples
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.hedged = 0
+        self.hedge_wins = 0
+        self._samples = {}
+        self._observed = {}
+        self._delays = {}
+        self._lock = threading.Lock()
+
+    def delay(self, endpoint: str):
+        """
+        Seconds to wait for the first response before hedging, or None while there
+        are too few samples for ``endpoint``.
+        """
+        return self._delays.get(endpoint)
+
+    def observe(self, endpoint: str, seconds: float) -> None:
+        """
+        Record the latency of a successful GET.
+        """
+        with self._lock:
+            samples = self._samples.get(endpoint)
+            if samples is None:
+                samples = self._samples[endpoint] = deque(maxlen=self.window)
+            samples.append(seconds)
+            n = len(samples)
+            self._observed[endpoint] = observed = self._observed.get(endpoint, 0) + 1
+            # Re-estimate the quantile every few samples rather than on every call.
+            if n >= self.min_samples and (observed % 10 == 0 or endpoint not in self._delays):
+                ordered = sorted(samples)
+                value = ordered[int(self.quantile * (n - 1))]
+                self._delays[endpoint] = min(self.max_delay, max(self.min_delay, value))
+
+    def sent(self) -> None:
+        """
+        Count a hedge sent.
+        """
+        with self._lock:
+            self.hedged += 1
+
+    def won(self) -> None:
+        """
+        Count a hedge that answered before the original request.
+        """
+        with self._lock:
+            self.hedge_wins += 1
+
+    def stats(self) -> dict:
+        return {
+            "hedged": self.hedged,
+            "hedge_wins": self.hedge_wins,
+            "delays": dict(self._delays),
+        }
+
+
+# Active policies; None disables retries and hedging.
+policy = None
+hedge = None
+
+
+def configure(
+    max_attempts: int = 4,
+    backoff: float = 0.25,
+    max_backoff: float = 10.0,
+    max_retry_after: float = 60.0,
+    statuses=RETRY_STATUSES,
+) -> RetryPolicy:
+    """
+    Start retrying failed REST requests, replacing any previous policy, and return it.
+    Takes the same arguments as :class:`RetryPolicy`.
+    """
+    global policy
+    policy = RetryPolicy(max_attempts, backoff, max_backoff, max_retry_after, statuses)
+    return policy
+
+
+def disable() -> None:
+    """
+    Stop retrying: every error is raised on the first failure, as before :func:`configure`.
+    """
+    global policy
+    policy = None
+
+
+def enable_hedging(
+    quantile: float = 0.95,
+    window: int = 200,
+    min_samples: int = 20,
+    min_delay: float = 0.005,
+    max_delay: float = 2.0,
+) -> HedgePolicy:
+    """
+    Start hedging GET requests and return the policy.
+    Takes the same arguments as :class:`HedgePolicy`.
+    """
+    global hedge
+    hedge = HedgePolicy(quantile, window, min_samples, min_delay, max_delay)
+    return hedge
+
+
+def disable_hedging() -> None:
+    global hedge
+    hedge = None
@@ -0,0 +1,207 @@
+"""
+Local SQLite store of trades with per-ticker watermarks for incremental sync.
+"""
+import calendar
+import sqlite3
+import time
+from typing import Dict, List, Optional
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS trades (
+    trade_id TEXT PRIMARY KEY,
+    ticker TEXT NOT NULL,
+    ts INTEGER NOT NULL,
+    created_time TEXT NOT NULL,
+    yes_price INTEGER,
+    no_price INTEGER,
+    count INTEGER,
+    taker_side TEXT
+);
+CREATE INDEX IF NOT EXISTS trades_ticker_ts ON trades (ticker, ts);
+CREATE TABLE IF NOT EXISTS watermarks (
+    ticker TEXT PRIMARY KEY,
+    max_ts INTEGER NOT NULL
+);
+"""
+
+_COLUMNS = (
+    "trade_id",
+    "ticker",
+    "ts",
+    "created_time",
+    "yes_price",
+    "no_price",
+    "count",
+    "taker_side",
+)
+
+
+def _created_ts(created_time: str) -> int:
+    """
+    Unix seconds of an API ``created_time`` such as ``2025-01-18T20:59:59.123456Z``.
+    """
+    return calendar.timegm(time.strptime(created_time[:19], "%Y-%m-%dT%H:%M:%S"))
+
+
+def _row(trade: Dict) -> tuple:
+    return (
+        trade["trade_id"],
+        trade["ticker"],
+        _created_ts(trade["created_time"]),
+        trade["created_time"],
+        trade.get("yes_price"),
+        trade.get("no_price"),
+        trade.get("count"),
+        trade.get("taker_side"),
+    )
+
+
+class TradeStore:
+    """
+    Trades kept on disk in SQLite, keyed by ``trade_id``, with a ``max_ts``
+    watermark per ticker.
+
+    :meth:`sync` fetches only trades from a ticker's watermark on and inserts
+    them idempotently. It asks for trades from one second before the watermark,
+    so trades later in the watermark second are fetched whether the API treats
+    ``min_ts`` as inclusive or exclusive; the overlap is already stored and ignored.
+    The watermark only advances once a sync has paged through everything, so a
+    sync interrupted by a crash simply resumes from the old watermark next time
+    and skips the trades it already stored.
+    """
+
+    def __init__(self, path: str):
+        """
+        :param path: SQLite database file, created if it does not exist.
+        """
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def watermark(self, ticker: str) -> Optional[int]:
+        """
+        Timestamp of the newest trade fully synced for ``ticker``, or None if never synced.
+        """
+        row = self._conn.execute(
+            "SELECT max_ts FROM watermarks WHERE ticker = ?", (ticker,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def _insert(self, rows: list) -> int:
+        with self._conn:
+            before = self._conn.total_changes
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO trades VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows
+            )
+            return self._conn.total_changes - before
+
+    def add(self, trades: List[Dict]) -> int:
+        """
+        Insert trades, ignoring ones already stored. Returns how many were new.
+        """
+        return self._insert([_row(t) for t in trades])
+
+    def sync(self, ticker: str, min_ts: int = None, limit: int = 1000, client=None) -> int:
+        """
+        Fetch trades for ``ticker`` from its watermark on and store them.
+
+        :param ticker: Market ticker.
+        :param min_ts: Where to start when the ticker has never been synced (default = full history).
+        :param limit: Trades per request.
+        :param client: :class:`kalshi.client.KalshiClient` to fetch through (default = the module-level API).
+        :return: Number of new trades stored.
+        """
+        if client is None:
+            from kalshi.rest import market
+        else:
+            market = client.market
+
+        start = self.watermark(ticker)
+        if start is None:
+            start = min_ts
+        else:
+            start -= 1
+        newest = start
+        added = 0
+        rows = []
+        for trade in market.IterTrades(limit=limit, ticker=ticker, min_ts=start):
+            row = _row(trade)
+            rows.append(row)
+            if newest is None or row[2] > newest:
+                newest = row[2]
+            if len(rows) >= limit:
+                added += self._insert(rows)
+                rows = []
+        if rows:
+            added += self._insert(rows)
+        if newest is not None:
+            with self._conn:
+                self._conn.execute(
+                    "INSERT INTO watermarks VALUES (?, ?) "
+                    "ON CONFLICT(ticker) DO UPDATE SET max_ts = MAX(max_ts, excluded.max_ts)",
+                    (ticker, newest),
+                )
+        return added
+
+    def sync_many(
+        self, tickers: List[str], min_ts: int = None, limit: int = 1000, client=None
+    ) -> Dict[str, int]:
+        """
+        :meth:`sync` each ticker in turn. Returns the number of new trades per ticker.
+        """
+        return {
+            ticker: self.sync(ticker, min_ts=min_ts, limit=limit, client=client)
+            for ticker in tickers
+        }
+
+    def _query(self, columns: str, ticker: str, min_ts: int, max_ts: int, order: bool = True):
+        clauses = []
+        params = []
+        if ticker is not None:
+            clauses.append("ticker = ?")
+            params.append(ticker)
+        if min_ts is not None:
+            clauses.append("ts >= ?")
+            params.append(min_ts)
+        if max_ts is not None:
+            clauses.append("ts <= ?")
+            params.append(max_ts)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        order_by = " ORDER BY ts, trade_id" if order else ""
+        return f"SELECT {columns} FROM trades{where}{order_by}", params
+
+    def count(self, ticker: str = None) -> int:
+        """
+        Number of stored trades, optionally for one ticker.
+        """
+        sql, params = self._query("COUNT(*)", ticker, None, None, order=False)
+        return self._conn.execute(sql, params).fetchone()[0]
+
+    def trades(self, ticker: str = None, min_ts: int = None, max_ts: int = None) -> List[Dict]:
+        """
+        Stored trades in time order, as dicts with the API fields plus ``ts``.
+        """
+        sql, params = self._query(", ".join(_COLUMNS), ticker, min_ts, max_ts)
+        return [dict(zip(_COLUMNS, row)) for row in self._conn.execute(sql, params)]
+
+    def to_dataframe(self, ticker: str = None, min_ts: int = None, max_ts: int = None):
+        """
+        Stored trades in time order as a pandas DataFrame with a datetime ``created_time``.
+        """
+        import pandas as pd
+
+        sql, params = self._query(", ".join(_COLUMNS), ticker, min_ts, max_ts)
+        df = pd.read_sql_query(sql, self._conn, params=params)
+        df["created_time"] = pd.to_datetime(df["created_time"], utc=True)
+        return df
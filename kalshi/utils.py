@@ -1,23 +1,53 @@
-import pandas as pd
-import numpy as np
+from __future__ import annotations
+
 import re
-import matplotlib.pyplot as plt
-import matplotlib.dates as mdates
-from matplotlib.colors import Normalize
-from matplotlib.cm import ScalarMappable
+from array import array
+from operator import itemgetter
 from datetime import datetime, timedelta
-from typing import Dict, List, Tuple, Optional
+from typing import TYPE_CHECKING, Dict, Iterable, List, Tuple, Optional, Union
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+
+def _page_trades(market, limit: int, ticker: str, min_ts: int, max_ts: int) -> List[Dict]:
+    """
+    Walk the GetTrades cursor for one time window and return its trades.
+    """
+    return list(market.IterTrades(limit=limit, ticker=ticker,
+                                  min_ts=min_ts, max_ts=max_ts))
+
+
+def _trade_shards(min_ts: int, max_ts: int, shards: int) -> List[Tuple[int, int]]:
+    """
+    Split [min_ts, max_ts] into at most `shards` windows, newest first.
+    Adjacent windows share their boundary second so no trade falls in a gap.
+    """
+    span = max_ts - min_ts
+    shards = max(1, min(shards, span))
+    edges = [min_ts + span * i // shards for i in range(shards + 1)]
+    return [(edges[i], edges[i + 1]) for i in reversed(range(shards))]
+
 
 def get_all_trades(limit: int = 100, ticker: str = None, 
-                  min_ts: int = None, max_ts: int = None):
+                  min_ts: int = None, max_ts: int = None,
+                  shards: int = 1, max_workers: Optional[int] = None):
     """
     Get all trades with pagination support.
     
+    With shards > 1 the [min_ts, max_ts] range is split into time windows that
+    are paged concurrently; every request still goes through the read rate
+    limiter, so throughput is bounded by the allowed request rate rather than
+    by round-trip latency. Results are merged newest first, as the API returns
+    them, with duplicate trades removed.
+    
     Args:
         limit: Maximum trades per request
         ticker: Ticker filter
-        min_ts: Minimum timestamp filter
-        max_ts: Maximum timestamp filter
+        min_ts: Minimum timestamp filter (required when shards > 1)
+        max_ts: Maximum timestamp filter (defaults to now when shards > 1)
+        shards: Number of time windows to fetch concurrently
+        max_workers: Worker threads for sharded fetches (defaults to shards)
         
     Returns:
         List of all trades
@@ -25,19 +55,170 @@ def get_all_trades(limit: int = 100, ticker: str = None,
     from kalshi.rest.market import Market
     
     market = Market()
-    all_trades = []
-    cursor = None
-    while True:
-        resp = market.GetTrades(limit=limit, cursor=cursor, ticker=ticker,
-                               min_ts=min_ts, max_ts=max_ts)
-        all_trades.extend(resp.get("trades", []))
-        cursor = resp.get("cursor")
-        if not cursor:
-            break
+    if shards <= 1:
+        return _page_trades(market, limit, ticker, min_ts, max_ts)
+
+    if min_ts is None:
+        raise ValueError("min_ts is required for a sharded backfill")
+    if max_ts is None:
+        max_ts = int(datetime.now().timestamp())
+
+    from concurrent.futures import ThreadPoolExecutor
+
+    windows = _trade_shards(min_ts, max_ts, shards)
+    with ThreadPoolExecutor(max_workers=max_workers or len(windows)) as pool:
+        pages = pool.map(lambda w: _page_trades(market, limit, ticker, *w), windows)
+        all_trades = []
+        seen = set()
+        for trades in pages:
+            for trade in trades:
+                trade_id = trade.get("trade_id")
+                if trade_id in seen:
+                    continue
+                seen.add(trade_id)
+                all_trades.append(trade)
     return all_trades
 
 
 
+class TradeColumns:
+    """
+    Typed column buffers that trade pages are appended to directly.
+    
+    Prices and counts are stored as int32, created_time as int64 microseconds
+    since the epoch, and ticker and taker_side as int32 category codes, so no
+    per-trade Python objects outlive the page they arrived in.
+    """
+    
+    _get_yes_price = itemgetter("yes_price")
+    _get_no_price = itemgetter("no_price")
+    _get_count = itemgetter("count")
+    _get_created_time = itemgetter("created_time")
+    _get_ticker = itemgetter("ticker")
+    _get_taker_side = itemgetter("taker_side")
+    _get_trade_id = itemgetter("trade_id")
+    
+    def __init__(self, include_trade_id: bool = False):
+        self.yes_price = array("i")
+        self.no_price = array("i")
+        self.count = array("i")
+        self.created_time = array("q")
+        self.ticker = array("i")
+        self.taker_side = array("i")
+        self.trade_id = [] if include_trade_id else None
+        self.tickers: Dict[str, int] = {}
+        self.taker_sides: Dict[str, int] = {}
+    
+    def __len__(self) -> int:
+        return len(self.count)
+    
+    @staticmethod
+    def _codes(categories: Dict[str, int], values: Iterable[str]) -> List[int]:
+        setdefault = categories.setdefault
+        return [setdefault(v, len(categories)) for v in values]
+    
+    def extend(self, page: List[Dict]) -> None:
+        """
+        Append one page of trade dicts as returned by GetTrades.
+        """
+        import numpy as np
+
+        if not page:
+            return
+        self.yes_price.extend(map(self._get_yes_price, page))
+        self.no_price.extend(map(self._get_no_price, page))
+        self.count.extend(map(self._get_count, page))
+        times = np.array([t.rstrip("Z") for t in map(self._get_created_time, page)],
+                         dtype="datetime64[us]")
+        self.created_time.frombytes(times.astype(np.int64).tobytes())
+        self.ticker.extend(self._codes(self.tickers, map(self._get_ticker, page)))
+        self.taker_side.extend(self._codes(self.taker_sides, map(self._get_taker_side, page)))
+        if self.trade_id is not None:
+            self.trade_id.extend(map(self._get_trade_id, page))
+    
+    @staticmethod
+    def _column(buffer: array, dtype) -> np.ndarray:
+        # Copy rather than view: a view keeps the buffer exported, and the next
+        # extend() would fail with BufferError.
+        import numpy as np
+
+        return np.frombuffer(buffer, dtype=dtype).copy()
+    
+    def to_dataframe(self) -> pd.DataFrame:
+        """
+        Columns as a DataFrame: int32 prices and counts, a UTC datetime created_time
+        and categorical ticker and taker_side. The data is copied, so more pages can
+        be appended afterwards.
+        """
+        import numpy as np
+        import pandas as pd
+
+        data = {}
+        if self.trade_id is not None:
+            data["trade_id"] = self.trade_id
+        data["ticker"] = pd.Categorical.from_codes(
+            self._column(self.ticker, np.int32), categories=list(self.tickers))
+        data["count"] = self._column(self.count, np.int32)
+        data["created_time"] = pd.to_datetime(
+            self._column(self.created_time, np.int64), unit="us", utc=True)
+        data["yes_price"] = self._column(self.yes_price, np.int32)
+        data["no_price"] = self._column(self.no_price, np.int32)
+        data["taker_side"] = pd.Categorical.from_codes(
+            self._column(self.taker_side, np.int32), categories=list(self.taker_sides))
+        return pd.DataFrame(data, copy=False)
+    
+    def to_records(self) -> np.ndarray:
+        """
+        Columns as a NumPy structured array. ticker and taker_side hold codes into
+        the ``tickers`` and ``taker_sides`` mappings. The buffers are copied into the
+        array, so more pages can be appended afterwards.
+        """
+        import numpy as np
+
+        out = np.empty(len(self), dtype=[
+            ("ticker", np.int32), ("count", np.int32), ("created_time", "datetime64[us]"),
+            ("yes_price", np.int32), ("no_price", np.int32), ("taker_side", np.int32),
+        ])
+        out["ticker"] = self.ticker
+        out["count"] = self.count
+        out["created_time"] = self.created_time
+        out["yes_price"] = self.yes_price
+        out["no_price"] = self.no_price
+        out["taker_side"] = self.taker_side
+        return out
+
+
+def get_all_trades_df(limit: int = 1000, ticker: str = None,
+                      min_ts: int = None, max_ts: int = None,
+                      include_trade_id: bool = False, as_records: bool = False):
+    """
+    Get all trades as columns, without building a list of per-trade dicts.
+    
+    Each page is appended straight into typed column buffers (see TradeColumns)
+    while the next page is prefetched, so peak memory stays close to the size
+    of the final columns.
+    
+    Args:
+        limit: Maximum trades per request
+        ticker: Ticker filter
+        min_ts: Minimum timestamp filter
+        max_ts: Maximum timestamp filter
+        include_trade_id: Also return the trade_id column (stored as Python strings)
+        as_records: Return a NumPy structured array instead of a DataFrame
+        
+    Returns:
+        DataFrame (or structured array) of all trades, newest first
+    """
+    from kalshi.rest.market import market
+    from kalshi.rest.pagination import paginate_pages
+    
+    columns = TradeColumns(include_trade_id=include_trade_id)
+    for page in paginate_pages(market.GetTrades, "trades", limit=limit, ticker=ticker,
+                               min_ts=min_ts, max_ts=max_ts):
+        columns.extend(page)
+    return columns.to_records() if as_records else columns.to_dataframe()
+
+
 def get_all_orders(limit: int = 100, status: str = None, 
                   ticker: str = None, event_ticker: str = None):
     """
@@ -52,50 +233,68 @@ def get_all_orders(limit: int = 100, status: str = None,
     Returns:
         List of all orders
     """
-    from kalshi_api.rest import portfolio
+    from kalshi.rest import portfolio
     
-    all_orders = []
-    cursor = None
-    while True:
-        resp = portfolio.GetOrders(limit=limit, cursor=cursor, status=status, 
-                                 ticker=ticker, event_ticker=event_ticker)
-        all_orders.extend(resp.get("orders", []))
-        cursor = resp.get("cursor")
-        if not cursor:
-            break
-    return all_orders
+    return list(portfolio.IterOrders(limit=limit, status=status,
+                                     ticker=ticker, event_ticker=event_ticker))
 
 
-def cancel_all_resting_orders(ticker: str = None, event_ticker: str = None) -> Dict:
+def cancel_all_resting_orders(ticker: str = None, event_ticker: str = None,
+                              use_batch: bool = True) -> Dict:
     """
     Cancel all resting (open) orders.
     
+    Cancels are sent concurrently (as batch cancels by default) and the call
+    returns once every one has been acknowledged.
+    
     Args:
         ticker: Optional ticker filter
         event_ticker: Optional event ticker filter
+        use_batch: Cancel through the batch endpoint instead of one request per order
         
     Returns:
         Dictionary with cancellation results
     """
-    from kalshi_api.rest import portfolio
+    from kalshi.rest import bulk
     
     to_cancel = get_all_orders(status="resting", ticker=ticker, event_ticker=event_ticker)
-    results = []
-    for o in to_cancel:
-        oid = o.get("order_id")
-        try:
-            resp = portfolio.CancelOrder(order_id=oid)
-            results.append({"order_id": oid, "ok": True, "response": resp})
-        except Exception as e:
-            results.append({"order_id": oid, "ok": False, "error": str(e)})
+    results = bulk.cancel_orders([o.get("order_id") for o in to_cancel], use_batch=use_batch)
     return {"requested": len(to_cancel), "cancelled": sum(r["ok"] for r in results), "results": results} 
 
 
+def _downsample_trades(df: pd.DataFrame, max_points: int) -> pd.DataFrame:
+    """
+    Reduce trades to at most max_points rows by binning the time range and keeping
+    each bin's highest- and lowest-priced trade. Kept rows carry the bin's total
+    count and the side of its net taker flow.
+    """
+    import numpy as np
+
+    df = df.reset_index(drop=True)
+    t = df['created_time'].astype('int64').to_numpy()
+    n_bins = max(1, max_points // 2)
+    span = t.max() - t.min()
+    bins = ((t - t.min()) / (span + 1) * n_bins).astype(np.int64)
+    
+    by_bin = df.groupby(bins)
+    keep = np.union1d(by_bin['yes_price'].idxmax().to_numpy(),
+                      by_bin['yes_price'].idxmin().to_numpy())
+    signed = df['count'].where(df['taker_side'] == 'yes', -df['count'])
+    volume = by_bin['count'].transform('sum').to_numpy()
+    net = signed.groupby(bins).transform('sum').to_numpy()
+    
+    out = df.loc[keep].copy()
+    out['count'] = volume[keep]
+    out['taker_side'] = np.where(net[keep] >= 0, 'yes', 'no')
+    return out
+
+
 def plot_trades(trades_df: pd.DataFrame, 
                 start_timestamp: Optional[datetime] = None,
                 duration_hours: Optional[float] = None,
                 title: str = "Trade History",
-                figsize: Tuple[int, int] = (12, 8)) -> None:
+                figsize: Tuple[int, int] = (12, 8),
+                max_points: Optional[int] = 5000) -> None:
     """
     Plot trades over time with size-based coloring and taker direction arrows.
     
@@ -106,7 +305,16 @@ def plot_trades(trades_df: pd.DataFrame,
         duration_hours: Optional duration in hours from start_timestamp
         title: Plot title
         figsize: Figure size as (width, height)
+        max_points: Above this many trades, bin the time range and plot only each
+                    bin's highest and lowest trade, colored by the bin's volume and
+                    pointing in its net taker direction (None = plot every trade)
     """
+    import numpy as np
+    import pandas as pd
+    import matplotlib.pyplot as plt
+    import matplotlib.dates as mdates
+    from matplotlib.colors import Normalize
+
     if len(trades_df) == 0:
         print("No trade data to plot")
         return
@@ -138,6 +346,14 @@ def plot_trades(trades_df: pd.DataFrame,
         print(f"No trades found in specified time range for {title}")
         return
     
+    # Calculate summary statistics over every trade, even when the plot is downsampled
+    total_volume = df['count'].sum()
+    weighted_avg_price = (df['yes_price'] * df['count']).sum() / df['count'].sum()
+    
+    downsampled = max_points is not None and len(df) > max_points
+    if downsampled:
+        df = _downsample_trades(df, max_points)
+    
     # Create figure
     fig, ax = plt.subplots(figsize=figsize)
     
@@ -152,31 +368,25 @@ def plot_trades(trades_df: pd.DataFrame,
     
     # Add colorbar for trade size
     cbar = plt.colorbar(scatter, ax=ax)
-    cbar.set_label('Trade Size (contracts)', rotation=270, labelpad=20)
+    cbar.set_label('Bin Volume (contracts)' if downsampled else 'Trade Size (contracts)',
+                   rotation=270, labelpad=20)
     
-    # Add arrows for taker direction - positioned to the side of points
+    # Add arrows for taker direction - positioned to the side of points, drawn in one call:
+    # up and to the right for yes takers, down and to the left for no takers
     time_range = (df['created_time'].max() - df['created_time'].min()).total_seconds()
-    arrow_offset_x = pd.Timedelta(seconds=time_range * 0.01)  # 1% of time range
+    arrow_offset_x = time_range * 0.01 / 86400  # 1% of time range, in matplotlib date units
     arrow_size = 0.015 * (df['yes_price'].max() - df['yes_price'].min())
     
-    # Calculate summary statistics
-    total_volume = df['count'].sum()
-    weighted_avg_price = (df['yes_price'] * df['count']).sum() / df['count'].sum()
-    
-    for _, trade in df.iterrows():
-        x = trade['created_time']
-        y = trade['yes_price']
-        
-        if trade['taker_side'] == 'yes':
-            # Up arrow for yes taker - positioned to the right
-            arrow_x = x + arrow_offset_x
-            ax.annotate('', xy=(arrow_x, y + arrow_size), xytext=(arrow_x, y - arrow_size),
-                       arrowprops=dict(arrowstyle='->', color='green', lw=2, alpha=0.9))
-        else:
-            # Down arrow for no taker - positioned to the left
-            arrow_x = x - arrow_offset_x
-            ax.annotate('', xy=(arrow_x, y - arrow_size), xytext=(arrow_x, y + arrow_size),
-                       arrowprops=dict(arrowstyle='->', color='red', lw=2, alpha=0.9))
+    times = df['created_time']
+    if times.dt.tz is not None:
+        times = times.dt.tz_convert(None)
+    x = mdates.date2num(times.to_numpy())
+    y = df['yes_price'].to_numpy(dtype=float)
+    direction = np.where((df['taker_side'] == 'yes').to_numpy(), 1.0, -1.0)
+    ax.quiver(x + direction * arrow_offset_x, y - direction * arrow_size,
+              np.zeros_like(y), direction * 2 * arrow_size,
+              color=np.where(direction > 0, 'green', 'red'), alpha=0.9,
+              angles='xy', scale_units='xy', scale=1, width=0.003)
     
     # Format plot
     ax.set_ylabel('Yes Price (cents)')
@@ -288,16 +498,18 @@ def calculate_volume_stats(trades_df: pd.DataFrame) -> Dict[str, float]:
         }
     
     # Calculate taker volume on yes vs no side
-    yes_taker_volume = trades_df[trades_df['taker_side'] == 'yes']['count'].sum()
-    no_taker_volume = trades_df[trades_df['taker_side'] == 'no']['count'].sum()
+    is_yes = trades_df['taker_side'] == 'yes'
+    is_no = trades_df['taker_side'] == 'no'
+    yes_trades = trades_df[is_yes]
+    no_trades = trades_df[is_no]
+    yes_taker_volume = yes_trades['count'].sum()
+    no_taker_volume = no_trades['count'].sum()
     total_volume = yes_taker_volume + no_taker_volume
     
     # Calculate dollar volume for each side
-    yes_taker_dollar_volume = (trades_df[trades_df['taker_side'] == 'yes']['yes_price'] * 
-                              trades_df[trades_df['taker_side'] == 'yes']['count']).sum() / 100
+    yes_taker_dollar_volume = (yes_trades['yes_price'] * yes_trades['count']).sum() / 100
     # For no takers, they pay the no_price which is (100 - yes_price)
-    no_taker_dollar_volume = ((100 - trades_df[trades_df['taker_side'] == 'no']['yes_price']) * 
-                             trades_df[trades_df['taker_side'] == 'no']['count']).sum() / 100
+    no_taker_dollar_volume = ((100 - no_trades['yes_price']) * no_trades['count']).sum() / 100
     total_dollar_volume = yes_taker_dollar_volume + no_taker_dollar_volume
     
     return {
@@ -311,4 +523,102 @@ def calculate_volume_stats(trades_df: pd.DataFrame) -> Dict[str, float]:
         'total_dollar_volume': total_dollar_volume,
         'yes_dollar_percentage': yes_taker_dollar_volume/total_dollar_volume*100 if total_dollar_volume > 0 else 0,
         'no_dollar_percentage': no_taker_dollar_volume/total_dollar_volume*100 if total_dollar_volume > 0 else 0
-    }
\ No newline at end of file
+    }
+
+
+def _sum_values(column: pd.Series) -> np.ndarray:
+    """
+    Column values for summing: int64 when the column holds only integers, else
+    float64, whose NaNs the groupby sums skip just as pandas' sum does.
+    """
+    import numpy as np
+    import pandas as pd
+
+    if pd.api.types.is_integer_dtype(column.dtype) and not column.hasnans:
+        return column.to_numpy(dtype=np.int64)
+    return column.to_numpy(dtype=np.float64, na_value=np.nan)
+
+
+def calculate_trade_stats(trades_df: pd.DataFrame, by: Union[str, List[str], None] = 'ticker',
+                          freq: Optional[str] = None, price_col: str = 'yes_price',
+                          volume_col: str = 'count') -> pd.DataFrame:
+    """
+    VWAP and taker-flow statistics for many tickers and time buckets in one groupby pass.
+    
+    Every group's values equal what calculate_vwap and calculate_volume_stats
+    return for that group's trades alone. Per-trade products are computed once,
+    as int64 columns (float64 when prices or counts are not integers), then
+    summed in a single groupby. Missing prices and counts add nothing to the
+    sums, as pandas' sum skips them.
+    
+    Args:
+        trades_df: DataFrame containing trade data with columns:
+                   taker_side, count, yes_price, plus created_time when freq is given
+        by: Column name or list of column names to group by, or None
+        freq: Optional time bucket for created_time, e.g. '1min', '5min' or '1h'.
+              Buckets are labelled by their start; empty buckets are omitted.
+        price_col: Column name containing prices
+        volume_col: Column name containing volumes
+        
+    Returns:
+        DataFrame indexed by the group keys with columns vwap and the keys of
+        calculate_volume_stats
+    """
+    import numpy as np
+    import pandas as pd
+
+    if isinstance(by, str):
+        by = [by]
+    keys = list(by or [])
+    
+    count = _sum_values(trades_df[volume_col])
+    price = _sum_values(trades_df[price_col])
+    is_yes = trades_df['taker_side'].eq('yes').to_numpy()
+    is_no = trades_df['taker_side'].eq('no').to_numpy()
+    pv = price * count
+    yes_count = np.where(is_yes, count, 0)
+    no_count = np.where(is_no, count, 0)
+    sums = pd.DataFrame({
+        'volume': count,
+        'pv': pv,
+        'yes_taker_volume': yes_count,
+        'no_taker_volume': no_count,
+        'yes_pv': np.where(is_yes, pv, 0),
+        'no_pv': (100 - price) * no_count,
+    }, index=trades_df.index)
+    
+    groupers = [trades_df[k] for k in keys]
+    if freq is not None:
+        times = trades_df['created_time']
+        if not pd.api.types.is_datetime64_any_dtype(times):
+            times = pd.to_datetime(times)
+        groupers.append(times.dt.floor(freq).rename('created_time'))
+    
+    if groupers:
+        totals = sums.groupby(groupers, observed=True, sort=True).sum()
+    else:
+        totals = sums.sum().to_frame().T
+    
+    yes_volume = totals['yes_taker_volume']
+    no_volume = totals['no_taker_volume']
+    total_volume = yes_volume + no_volume
+    yes_dollar = totals['yes_pv'] / 100
+    no_dollar = totals['no_pv'] / 100
+    total_dollar = yes_dollar + no_dollar
+    
+    def pct(part, whole):
+        return (part / whole.where(whole > 0) * 100).fillna(0)
+    
+    return pd.DataFrame({
+        'vwap': (totals['pv'] / totals['volume'].where(totals['volume'] > 0)).fillna(0.0),
+        'yes_taker_volume': yes_volume,
+        'no_taker_volume': no_volume,
+        'total_volume': total_volume,
+        'yes_taker_percentage': pct(yes_volume, total_volume),
+        'no_taker_percentage': pct(no_volume, total_volume),
+        'yes_taker_dollar_volume': yes_dollar,
+        'no_taker_dollar_volume': no_dollar,
+        'total_dollar_volume': total_dollar,
+        'yes_dollar_percentage': pct(yes_dollar, total_dollar),
+        'no_dollar_percentage': pct(no_dollar, total_dollar),
+    })
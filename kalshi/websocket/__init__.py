@@ -1 +1,29 @@
-from .client import Client
+import importlib
+
+# Public names and the submodule defining each. Submodules are imported on first
+# access, so e.g. the order books never pull in websockets or the recorder.
+_EXPORTS = {
+    "OrderBook": "orderbook",
+    "OrderBooks": "orderbook",
+    "Dispatcher": "dispatch",
+    "Route": "dispatch",
+    "Recorder": "recorder",
+    "Replay": "recorder",
+    "PortfolioState": "portfolio",
+    "Client": "client",
+    "ShardManager": "shards",
+    "Shard": "shards",
+}
+_SUBMODULES = frozenset(_EXPORTS.values())
+
+
+def __getattr__(name: str):
+    if name in _EXPORTS:
+        return getattr(importlib.import_module(f".{_EXPORTS[name]}", __name__), name)
+    if name in _SUBMODULES:
+        return importlib.import_module(f".{name}", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS) | _SUBMODULES)
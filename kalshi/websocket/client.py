@@ -1,35 +1,121 @@
+import asyncio
 import inspect
-import json
 import logging
 
 import websockets
 
 import kalshi.auth
+from .. import codec
+from .orderbook import OrderBooks
+from .dispatch import Dispatcher
+from .portfolio import TYPES
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
 
+DEFAULT_URL = "wss://api.elections.kalshi.com/trade-api/ws/v2"
+
 
 class Client:
     """
     A WebSocket client for connecting to the Kalshi trade API.
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        orderbooks: OrderBooks = None,
+        dispatcher: Dispatcher = None,
+        auth=None,
+        market=None,
+        url: str = None,
+        recorder=None,
+        portfolio_state=None,
+    ):
         """
         Initialize the Client with a message ID counter.
+
+        :param orderbooks: Optional order books to keep current from orderbook_snapshot
+            and orderbook_delta messages. Each message is applied before on_message runs.
+        :param dispatcher: Optional dispatcher that queues messages for its routes'
+            handlers instead of awaiting them in the reader. Messages that match no
+            route still go to on_message.
+        :param auth: Credentials signing the connection (default = ``kalshi.auth.auth``).
+        :param market: REST market resource used by :meth:`resync` (default = ``kalshi.rest.market``).
+        :param url: Endpoint :meth:`connect` uses when none is given (default = ``DEFAULT_URL``).
+        :param recorder: Optional :class:`~kalshi.websocket.recorder.Recorder` that every
+            received frame is appended to, for replay with
+            :class:`~kalshi.websocket.recorder.Replay`. Each client needs its own.
+        :param portfolio_state: Optional :class:`~kalshi.websocket.portfolio.PortfolioState`
+            to keep current from fill and user_order messages. While connected, the client
+            reconciles it with REST in the background; subscribe to its ``CHANNELS``.
         """
+        self.auth = auth
+        self.market = market
+        self.url = url
+        self.recorder = recorder
+        if recorder is not None:
+            recorder.attach(self)
+        self.portfolio_state = portfolio_state
         self.message_id = 0
         self.ws = None
+        self.orderbooks = orderbooks
+        self.dispatcher = dispatcher
+        # (channels, tickers) of every subscribe call, replayed after a reconnect.
+        self.subscriptions = []
+        # Last seq seen per subscription id, and the order book tickers each one carries.
+        self._seqs = {}
+        self._sid_tickers = {}
+        self._closing = False
 
-    async def connect(self, url="wss://api.elections.kalshi.com/trade-api/ws/v2"):
+    async def connect(
+        self,
+        url: str = None,
+        reconnect: bool = False,
+        backoff: float = 0.1,
+        max_backoff: float = 30.0,
+    ):
         """
         Connect to the WebSocket server.
 
-        :param url: The WebSocket endpoint to connect to (default = wss://api.elections.kalshi.com/trade-api/ws/v2).
+        With ``reconnect=True`` the connection is supervised: whenever it drops,
+        the client reconnects with exponential backoff, signs fresh headers and
+        calls :meth:`on_reconnect`, which replays every subscription. ``on_open``
+        only runs for the first connection. Call :meth:`close` to stop.
+
+        :param url: The WebSocket endpoint to connect to (default = the client's ``url``,
+            else wss://api.elections.kalshi.com/trade-api/ws/v2).
+        :param reconnect: Reconnect automatically after the connection is lost (default = False).
+        :param backoff: Delay in seconds before the first reconnect attempt (default = 0.1).
+        :param max_backoff: Upper bound for the doubling reconnect delay (default = 30).
+        """
+        url = url or self.url or DEFAULT_URL
+        self._closing = False
+        delay = backoff
+        connected = False
+        while True:
+            try:
+                await self._connect_once(url, reconnected=connected)
+                connected = True
+                delay = backoff
+            except (OSError, asyncio.TimeoutError, websockets.WebSocketException) as e:
+                await self.on_error(e)
+            if not reconnect or self._closing:
+                break
+            logger.info("Reconnecting to WebSocket in %.2fs", delay)
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, max_backoff)
+
+    async def close(self):
         """
+        Close the connection and stop reconnecting.
+        """
+        self._closing = True
+        if self.ws is not None:
+            await self.ws.close()
+
+    async def _connect_once(self, url: str, reconnected: bool):
         logger.info("Attempting to connect to WebSocket: %s", url)
-        headers = kalshi.auth.request_headers("GET", url)
+        headers = (self.auth or kalshi.auth.auth).request_headers("GET", url)
         connect_kwargs = {}
         signature = inspect.signature(websockets.connect)
         if "additional_headers" in signature.parameters:
@@ -42,9 +128,22 @@ class Client:
             **connect_kwargs,
         ) as websocket:
             self.ws = websocket
+            self._seqs.clear()
+            self._sid_tickers.clear()
             logger.info("Connected to WebSocket: %s", url)
-            await self.on_open()
-            await self.handler()
+            if reconnected:
+                await self.on_reconnect()
+            else:
+                await self.on_open()
+            # Bootstrap the portfolio state, then reconcile it for as long as this connection lasts.
+            maintain = None
+            if self.portfolio_state is not None:
+                maintain = asyncio.create_task(self.portfolio_state.run())
+            try:
+                await self.handler()
+            finally:
+                if maintain is not None:
+                    maintain.cancel()
 
     async def on_open(self):
         """
@@ -53,6 +152,88 @@ class Client:
         """
         logger.debug("WebSocket connection opened.")
 
+    async def on_reconnect(self):
+        """
+        Called instead of ``on_open`` after an automatic reconnect.
+        By default, replays every subscription made on earlier connections.
+        """
+        subscriptions = self.subscriptions
+        self.subscriptions = []
+        for channels, tickers in subscriptions:
+            await self.subscribe(channels, tickers)
+
+    async def on_gap(self, sid: int, expected: int, received: int, message: dict):
+        """
+        Called when a message's seq skips ahead, meaning messages for subscription
+        ``sid`` were dropped. By default, asks for fresh snapshots of the order books
+        carried by that subscription with :meth:`resubscribe`, so they are not left stale.
+
+        :param sid: The subscription id.
+        :param expected: The seq that should have arrived.
+        :param received: The seq that actually arrived.
+        :param message: The message that revealed the gap.
+        """
+        logger.warning(
+            "Sequence gap on sid=%s: expected seq=%s, received seq=%s",
+            sid,
+            expected,
+            received,
+        )
+        if self.portfolio_state is not None and message.get("type") in TYPES:
+            self.portfolio_state.request_reconcile()
+        tickers = self._sid_tickers.get(sid)
+        if self.orderbooks is not None and tickers and self.ws is not None:
+            await self.resubscribe(sid, sorted(tickers))
+
+    async def resubscribe(self, sid: int, tickers: list[str]):
+        """
+        Remove ``tickers`` from subscription ``sid`` and add them back, so the server
+        sends a fresh orderbook_snapshot for each. The snapshots arrive in order with
+        the deltas and replace the books, which keep applying deltas until then.
+        Only sends the commands; the reader is never blocked waiting for them.
+
+        :param sid: The orderbook_delta subscription id.
+        :param tickers: Market tickers whose books should be replaced.
+        """
+        for action in ("delete_markets", "add_markets"):
+            update_message = {
+                "id": self.message_id,
+                "cmd": "update_subscription",
+                "params": {"sids": [sid], "market_tickers": tickers, "action": action},
+            }
+            self.message_id += 1
+            await self.ws.send(codec.dumps(update_message))
+        logger.info("Requested fresh order book snapshots on sid=%s for %s", sid, tickers)
+
+    async def resync(self, tickers: list[str]):
+        """
+        Reload the order books for ``tickers`` from ``Market.GetMarketOrderbook``.
+        The blocking REST calls run on the default executor. The REST books carry no
+        seq, so deltas received while they load may be applied twice; after a gap,
+        :meth:`resubscribe` is the consistent way to recover.
+
+        :param tickers: Market tickers whose books should be replaced.
+        """
+        market = self.market
+        if market is None:
+            from kalshi.rest import market
+
+        loop = asyncio.get_running_loop()
+        responses = await asyncio.gather(
+            *(
+                loop.run_in_executor(None, market.GetMarketOrderbook, ticker)
+                for ticker in tickers
+            ),
+            return_exceptions=True,
+        )
+        for ticker, response in zip(tickers, responses):
+            if isinstance(response, Exception):
+                await self.on_error(response)
+                continue
+            book = response.get("orderbook") or {}
+            self.orderbooks.load(ticker, book.get("yes"), book.get("no"))
+            logger.info("Resynced order book for %s", ticker)
+
     async def on_message(self, message: dict):
         """
         Called whenever a new message is received.
@@ -99,6 +280,7 @@ class Client:
         }
         if tickers:
             subscription_message["params"]["market_tickers"] = tickers
+        self.subscriptions.append((list(channels), list(tickers)))
 
         logger.info(
             "Subscribing with message_id=%s to channels=%s, tickers=%s",
@@ -107,21 +289,71 @@ class Client:
             tickers,
         )
 
-        await self.ws.send(json.dumps(subscription_message))
+        await self.ws.send(codec.dumps(subscription_message))
         self.message_id += 1
         logger.debug(
             "Subscription message sent. Incremented message_id to %s",
             self.message_id,
         )
 
+    async def process_frame(self, frame):
+        """
+        Decode one raw frame and run it through the client: order books, sequence
+        checks, then the dispatcher's routes or `on_message`.
+
+        :param frame: The frame payload as ``bytes`` or ``str``.
+        """
+        message = codec.loads(frame)
+        orderbooks = self.orderbooks
+        if orderbooks is not None:
+            orderbooks.apply(message)
+        portfolio_state = self.portfolio_state
+        if portfolio_state is not None:
+            portfolio_state.apply(message)
+        seq = message.get("seq")
+        if seq is not None:
+            sid = message.get("sid")
+            if message.get("type") == "orderbook_snapshot":
+                ticker = message["msg"]["market_ticker"]
+                self._sid_tickers.setdefault(sid, set()).add(ticker)
+            last = self._seqs.get(sid)
+            self._seqs[sid] = seq
+            if last is not None and seq != last + 1:
+                await self.on_gap(sid, last + 1, seq, message)
+        if self.dispatcher is None or not await self.dispatcher.dispatch(message):
+            await self.on_message(message)
+
+    def _frames(self):
+        """
+        Iterate over raw frames, as undecoded bytes when the websockets version allows it.
+        """
+        if "decode" not in inspect.signature(self.ws.recv).parameters:
+            return self.ws
+
+        async def frames(recv):
+            while True:
+                yield await recv(decode=False)
+
+        return frames(self.ws.recv)
+
     async def handler(self):
         """
         Main loop that listens for messages on the WebSocket.
         It calls `on_message` for each received message and handles errors and closure.
+        Messages carrying a ``seq`` are checked for gaps, which are reported to `on_gap`.
         """
         try:
-            async for message in self.ws:
-                await self.on_message(json.loads(message))
+            process_frame = self.process_frame
+            recorder = self.recorder
+            if recorder is None:
+                async for frame in self._frames():
+                    await process_frame(frame)
+            else:
+                recorder.mark_connection()
+                record = recorder.record
+                async for frame in self._frames():
+                    record(frame)
+                    await process_frame(frame)
         except websockets.ConnectionClosed as e:
             await self.on_close(e.code, e.reason)
         except Exception as e:
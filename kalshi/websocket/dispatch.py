@@ -0,0 +1,267 @@
+import asyncio
+import inspect
+import logging
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+POLICIES = ("block", "drop_oldest", "coalesce")
+
+
+class Route:
+    """
+    A handler fed from its own bounded queue by a dedicated worker task.
+
+    Overflow policies when the queue is full:
+
+    * ``"block"``: the reader waits for space (back-pressure, nothing is lost).
+    * ``"drop_oldest"``: the oldest queued message is discarded.
+    * ``"coalesce"``: only the latest pending message per ticker is kept; a new
+      message replaces the queued one for its ticker. Suitable for state-like
+      channels such as ``ticker``, not for incremental ``orderbook_delta``.
+    """
+
+    def __init__(
+        self,
+        handler,
+        type: str = None,
+        channel: str = None,
+        ticker: str = None,
+        maxsize: int = 1000,
+        policy: str = "block",
+        name: str = None,
+    ):
+        if policy not in POLICIES:
+            raise ValueError(f"policy must be one of {POLICIES}, not {policy!r}")
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.handler = handler
+        self.type = type
+        self.channel = channel
+        self.ticker = ticker
+        self.maxsize = maxsize
+        self.policy = policy
+        self.name = name or getattr(handler, "__name__", repr(handler))
+        self.processed = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.errors = 0
+        self._is_coroutine = inspect.iscoroutinefunction(handler)
+        self._items = deque()
+        self._latest = {}
+        self._not_empty = None
+        self._not_full = None
+        self._idle = None
+        self._task = None
+
+    @property
+    def depth(self) -> int:
+        """
+        Number of messages waiting to be handled.
+        """
+        return len(self._items)
+
+    def matches(self, message: dict, channel: str) -> bool:
+        if self.type is not None and message.get("type") != self.type:
+            return False
+        if self.channel is not None and channel != self.channel:
+            return False
+        if self.ticker is not None:
+            return (message.get("msg") or {}).get("market_ticker") == self.ticker
+        return True
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._not_empty = asyncio.Event()
+            self._not_full = asyncio.Event()
+            self._idle = asyncio.Event()
+            if not self._items:
+                self._idle.set()
+            self._task = asyncio.ensure_future(self._worker())
+
+    async def put(self, message: dict) -> None:
+        """
+        Queue a message according to the overflow policy.
+        """
+        items = self._items
+        if self.policy == "coalesce":
+            key = (message.get("msg") or {}).get("market_ticker") or message.get("type")
+            if key in self._latest:
+                self._latest[key] = message
+                self.coalesced += 1
+                return
+            if len(items) >= self.maxsize:
+                del self._latest[items.popleft()]
+                self.dropped += 1
+            self._latest[key] = message
+            items.append(key)
+        elif len(items) >= self.maxsize:
+            if self.policy == "drop_oldest":
+                items.popleft()
+                self.dropped += 1
+                items.append(message)
+            else:
+                while len(items) >= self.maxsize:
+                    self._not_full.clear()
+                    await self._not_full.wait()
+                items.append(message)
+        else:
+            items.append(message)
+        self._idle.clear()
+        self._not_empty.set()
+
+    def _pop(self) -> dict:
+        item = self._items.popleft()
+        if self.policy == "coalesce":
+            item = self._latest.pop(item)
+        self._not_full.set()
+        return item
+
+    async def _worker(self):
+        while True:
+            if not self._items:
+                self._idle.set()
+                self._not_empty.clear()
+                await self._not_empty.wait()
+                continue
+            message = self._pop()
+            try:
+                if self._is_coroutine:
+                    await self.handler(message)
+                else:
+                    self.handler(message)
+            except Exception:
+                self.errors += 1
+                logger.exception("Handler %s failed on message", self.name)
+            self.processed += 1
+
+    async def drain(self) -> None:
+        """
+        Wait until every queued message has been handled.
+        """
+        if self._idle is not None:
+            await self._idle.wait()
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> dict:
+        return {
+            "depth": self.depth,
+            "maxsize": self.maxsize,
+            "policy": self.policy,
+            "processed": self.processed,
+            "dropped": self.dropped,
+            "coalesced": self.coalesced,
+            "errors": self.errors,
+        }
+
+
+class Dispatcher:
+    """
+    Routes websocket messages to handlers by message ``type``, channel and ticker.
+
+    Each route has its own bounded queue and worker task, so a slow handler only
+    delays its own messages and never the socket reader. Channels are learned
+    from the server's ``subscribed`` responses, which map subscription ids to
+    channel names.
+
+    Pass an instance to :class:`kalshi.websocket.Client`. Messages that match
+    no route are handed to ``on_message`` as usual.
+    """
+
+    def __init__(self):
+        self.routes = []
+        self._sid_channels = {}
+        self._started = False
+
+    def route(
+        self,
+        handler=None,
+        type: str = None,
+        channel: str = None,
+        ticker: str = None,
+        maxsize: int = 1000,
+        policy: str = "block",
+        name: str = None,
+    ):
+        """
+        Register ``handler`` (a function or coroutine function taking the message dict)
+        for messages matching every given filter. Without ``handler``, returns a decorator.
+
+        :param type: Message type, e.g. ``"orderbook_delta"`` or ``"ticker"``.
+        :param channel: Subscription channel, e.g. ``"orderbook_delta"``.
+        :param ticker: Market ticker.
+        :param maxsize: Queue capacity (default = 1000).
+        :param policy: Overflow policy: ``"block"``, ``"drop_oldest"`` or ``"coalesce"``.
+        :param name: Name reported by :meth:`stats` (default = the handler's name).
+        """
+        if handler is None:
+
+            def decorator(fn):
+                self.route(fn, type, channel, ticker, maxsize, policy, name)
+                return fn
+
+            return decorator
+        route = Route(handler, type, channel, ticker, maxsize, policy, name)
+        self.routes.append(route)
+        if self._started:
+            route.start()
+        return route
+
+    def start(self) -> None:
+        """
+        Start a worker task for every route. Called automatically on the first dispatch.
+        """
+        self._started = True
+        for route in self.routes:
+            route.start()
+
+    async def dispatch(self, message: dict, channel: str = None) -> bool:
+        """
+        Queue ``message`` on every matching route. Returns whether any route matched.
+
+        :param channel: The message's channel, when the caller already knows it.
+            Otherwise it is looked up from the subscription id; pass it when
+            messages come from several connections, whose ids may collide.
+        """
+        if not self._started:
+            self.start()
+        if channel is None:
+            if message.get("type") == "subscribed":
+                msg = message.get("msg") or {}
+                self._sid_channels[msg.get("sid")] = msg.get("channel")
+            channel = self._sid_channels.get(message.get("sid"))
+        matched = False
+        for route in self.routes:
+            if route.matches(message, channel):
+                await route.put(message)
+                matched = True
+        return matched
+
+    async def drain(self) -> None:
+        """
+        Wait until every route's queue is empty.
+        """
+        for route in self.routes:
+            await route.drain()
+
+    async def close(self) -> None:
+        """
+        Stop every worker task. Queued messages are discarded; call :meth:`drain` first to keep them.
+        """
+        for route in self.routes:
+            await route.stop()
+        self._started = False
+
+    def stats(self) -> dict:
+        """
+        Queue depth and processed/dropped/coalesced/error counts per route name.
+        """
+        return {route.name: route.stats() for route in self.routes}
@@ -0,0 +1,206 @@
+from array import array
+
+SIDES = ("yes", "no")
+_EMPTY_LEVELS = array("i", [0] * 100)
+
+
+class OrderBook:
+    """
+    Resting quantity for one market, stored as two fixed arrays indexed by price in cents.
+
+    Kalshi books hold only bids: a "yes" bid at p cents is equivalent to a "no"
+    ask at 100 - p. Index 0 of each array is unused; prices run from 1 to 99.
+    The best bid of each side and the total resting quantity are maintained on
+    every update, so top-of-book and size queries are O(1).
+    """
+
+    __slots__ = ("ticker", "yes", "no", "_best", "_total")
+
+    def __init__(self, ticker: str):
+        self.ticker = ticker
+        self.yes = array("i", _EMPTY_LEVELS)
+        self.no = array("i", _EMPTY_LEVELS)
+        self._best = {"yes": 0, "no": 0}
+        self._total = {"yes": 0, "no": 0}
+
+    def _levels(self, side: str) -> array:
+        if side == "yes":
+            return self.yes
+        if side == "no":
+            return self.no
+        raise ValueError(f"side must be 'yes' or 'no', not {side!r}")
+
+    def load(self, yes: list = None, no: list = None) -> None:
+        """
+        Replace the book with full snapshots of ``[[price, quantity], ...]`` levels,
+        as sent in ``orderbook_snapshot`` messages and returned by GetMarketOrderbook.
+        """
+        for side, snapshot in (("yes", yes), ("no", no)):
+            levels = self._levels(side)
+            levels[:] = _EMPTY_LEVELS
+            best = 0
+            total = 0
+            for price, quantity in snapshot or ():
+                levels[price] = quantity
+                total += quantity
+                if quantity > 0 and price > best:
+                    best = price
+            self._best[side] = best
+            self._total[side] = total
+
+    def apply_delta(self, side: str, price: int, delta: int) -> int:
+        """
+        Change the resting quantity at ``price`` by ``delta`` and return the new quantity.
+        """
+        levels = self.yes if side == "yes" else self._levels(side)
+        quantity = levels[price] + delta
+        if quantity < 0:
+            delta -= quantity
+            quantity = 0
+        levels[price] = quantity
+        self._total[side] += delta
+        best = self._best[side]
+        if quantity:
+            if price > best:
+                self._best[side] = price
+        elif price == best:
+            while price and not levels[price]:
+                price -= 1
+            self._best[side] = price
+        return quantity
+
+    def quantity(self, side: str, price: int) -> int:
+        """
+        Resting quantity bid at ``price`` on ``side``.
+        """
+        return self._levels(side)[price]
+
+    def total(self, side: str) -> int:
+        """
+        Total resting quantity across every price on ``side``.
+        """
+        return self._total[side]
+
+    def best_bid(self, side: str = "yes"):
+        """
+        Highest bid on ``side`` as ``(price, quantity)``, or None if the side is empty.
+        """
+        price = self._best[side]
+        if not price:
+            return None
+        return price, self._levels(side)[price]
+
+    def best_ask(self, side: str = "yes"):
+        """
+        Lowest ask on ``side`` as ``(price, quantity)``, implied by the best bid on the
+        opposite side, or None if there is no such bid.
+        """
+        other = "no" if side == "yes" else "yes"
+        price = self._best[other]
+        if not price:
+            return None
+        return 100 - price, self._levels(other)[price]
+
+    def spread(self, side: str = "yes"):
+        """
+        Best ask minus best bid on ``side`` in cents, or None if either is missing.
+        """
+        bid = self._best[side]
+        other = self._best["no" if side == "yes" else "yes"]
+        if not bid or not other:
+            return None
+        return 100 - other - bid
+
+    def depth(self, side: str = "yes", levels: int = None) -> list:
+        """
+        Non-empty bid levels on ``side`` as ``[(price, quantity), ...]``, best first.
+
+        :param levels: Maximum number of levels to return (default = all).
+        """
+        book = self._levels(side)
+        result = []
+        price = self._best[side]
+        while price and (levels is None or len(result) < levels):
+            if book[price]:
+                result.append((price, book[price]))
+            price -= 1
+        return result
+
+    def to_dict(self) -> dict:
+        """
+        The book in the REST ``orderbook`` layout: ascending ``[[price, quantity], ...]`` per side.
+        """
+        return {
+            side: [[p, q] for p, q in enumerate(self._levels(side)) if q] or None
+            for side in SIDES
+        }
+
+    def __repr__(self):
+        return (
+            f"OrderBook({self.ticker!r}, yes_bid={self.best_bid('yes')}, "
+            f"yes_ask={self.best_ask('yes')})"
+        )
+
+
+class OrderBooks:
+    """
+    Order books for many markets, maintained from ``orderbook_snapshot`` and
+    ``orderbook_delta`` websocket messages.
+
+    Pass an instance to :class:`kalshi.websocket.Client` to have every received
+    message applied before ``on_message`` is called, or call :meth:`apply` yourself.
+    """
+
+    def __init__(self):
+        self._books = {}
+
+    def apply(self, message: dict):
+        """
+        Apply a websocket message. Returns the updated book, or None if the
+        message is not an order book update or its market has no snapshot yet.
+        """
+        kind = message.get("type")
+        if kind == "orderbook_delta":
+            msg = message["msg"]
+            book = self._books.get(msg["market_ticker"])
+            if book is not None:
+                book.apply_delta(msg["side"], msg["price"], msg["delta"])
+            return book
+        if kind == "orderbook_snapshot":
+            msg = message["msg"]
+            return self.load(msg["market_ticker"], msg.get("yes"), msg.get("no"))
+        return None
+
+    def load(self, ticker: str, yes: list = None, no: list = None) -> OrderBook:
+        """
+        Replace the book for ``ticker`` with a full snapshot, creating it if needed.
+        """
+        book = self._books.get(ticker)
+        if book is None:
+            book = self._books[ticker] = OrderBook(ticker)
+        book.load(yes, no)
+        return book
+
+    def discard(self, ticker: str) -> None:
+        """
+        Forget the book for ``ticker``.
+        """
+        self._books.pop(ticker, None)
+
+    def get(self, ticker: str, default=None):
+        return self._books.get(ticker, default)
+
+    def tickers(self) -> list:
+        return list(self._books)
+
+    def __getitem__(self, ticker: str) -> OrderBook:
+        return self._books[ticker]
+
+    def __contains__(self, ticker: str) -> bool:
+        return ticker in self._books
+
+    def __iter__(self):
+        return iter(self._books.values())
+
+    def __len__(self) -> int:
+        return len(self._books)
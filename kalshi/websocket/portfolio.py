@@ -0,0 +1,322 @@
+"""
+Live portfolio state kept current from the ``fill`` and ``user_orders`` channels.
+
+A :class:`PortfolioState` loads balance, positions and resting orders from the
+REST portfolio endpoints, then applies every ``fill`` and ``user_order``
+message as it arrives, so position, exposure and open-order queries are answered
+from memory without spending the read budget. Pass it to
+:class:`~kalshi.websocket.Client` and subscribe to :data:`CHANNELS`: while the
+client is connected it bootstraps from REST and reconciles every
+``reconcile_interval`` seconds, after each reconnect and after a sequence gap on
+those channels.
+
+Positions are signed yes contracts: +10 holds 10 yes, -10 holds 10 no. Exposure
+is what the open position cost, in cents, at average cost; closing trades move
+the difference to realized P&L. A fill buying ``no`` against a ``yes`` position
+nets against it, as the exchange does. Fees are not in fill messages, so balance
+and realized P&L only pick them up at the next reconcile.
+
+A reconcile is applied only if no fill or order update arrived while its REST
+snapshot was being fetched, since the snapshot may or may not include them.
+After ``max_skips`` skipped attempts in a row it is applied anyway. A fill whose
+``post_position`` disagrees with the computed position is taken at its word and
+requests a reconcile for the cost.
+"""
+import asyncio
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+# Channels to subscribe to, and the message types they carry.
+CHANNELS = ["fill", "user_orders"]
+TYPES = frozenset(("fill", "user_order"))
+# Order statuses that take an order off the book.
+_CLOSED = frozenset(("canceled", "executed"))
+
+
+class PortfolioState:
+    """
+    In-memory balance, positions and resting orders of one account.
+    """
+
+    def __init__(
+        self,
+        portfolio=None,
+        reconcile_interval: float = 60.0,
+        retry_interval: float = 1.0,
+        max_skips: int = 5,
+    ):
+        """
+        :param portfolio: REST portfolio resource to load from
+            (default = ``kalshi.rest.portfolio``).
+        :param reconcile_interval: Seconds between reconciles while connected.
+        :param retry_interval: Seconds before retrying a skipped or failed reconcile.
+        :param max_skips: Apply a reconcile after this many consecutive skips.
+        """
+        self.portfolio = portfolio
+        self.reconcile_interval = reconcile_interval
+        self.retry_interval = retry_interval
+        self.max_skips = max_skips
+        self.balance = 0
+        self.loaded = False
+        self._positions = {}
+        self._costs = {}
+        self._realized = {}
+        self._total_exposure = 0
+        self._orders = {}
+        # ticker -> {order_id: order}
+        self._by_ticker = {}
+        self.events = 0
+        self.fills = 0
+        self.order_updates = 0
+        self.reconciles = 0
+        self.skipped = 0
+        self.mismatches = 0
+        self.last_reconcile = None
+        self._skips = 0
+        self._wake = None
+        self._handlers = {"fill": self._fill, "user_order": self._order}
+
+    def apply(self, message: dict) -> bool:
+        """
+        Apply a websocket message. Returns whether it was a fill or order update.
+        """
+        handler = self._handlers.get(message.get("type"))
+        if handler is None:
+            return False
+        self.events += 1
+        handler(message["msg"])
+        return True
+
+    def _fill(self, msg: dict) -> None:
+        ticker = msg["market_ticker"]
+        count = msg["count"]
+        delta = count if (msg["action"] == "buy") == (msg["side"] == "yes") else -count
+        self.trade(ticker, delta, msg["yes_price"])
+        position = msg.get("post_position")
+        computed = self._positions.get(ticker, 0)
+        if position is not None and position != computed:
+            # The state missed something: trust the exchange's position, keep the
+            # average cost per contract where it can and fetch the real cost.
+            if computed and (computed > 0) == (position > 0):
+                cost = self._costs[ticker] * abs(position) // abs(computed)
+            else:
+                yes_price = msg["yes_price"]
+                cost = abs(position) * (yes_price if position > 0 else 100 - yes_price)
+            self._set(ticker, position, cost)
+            self.request_reconcile()
+        self.fills += 1
+
+    def trade(self, ticker: str, delta: int, yes_price: int) -> None:
+        """
+        Apply a trade of ``delta`` yes contracts (negative for no) at ``yes_price`` cents.
+        """
+        position = self._positions.get(ticker, 0)
+        cost = self._costs.get(ticker, 0)
+        if position and (position > 0) != (delta > 0):
+            closing = min(abs(delta), abs(position))
+            removed = cost * closing // abs(position)
+            proceeds = closing * (yes_price if position > 0 else 100 - yes_price)
+            self._realized[ticker] = self._realized.get(ticker, 0) + proceeds - removed
+            self.balance += proceeds
+            cost -= removed
+            if delta > 0:
+                position += closing
+                delta -= closing
+            else:
+                position -= closing
+                delta += closing
+        if delta:
+            paid = abs(delta) * (yes_price if delta > 0 else 100 - yes_price)
+            self.balance -= paid
+            cost += paid
+            position += delta
+        self._set(ticker, position, cost)
+
+    def _set(self, ticker: str, position: int, cost: int) -> None:
+        if position:
+            self._positions[ticker] = position
+            self._total_exposure += cost - self._costs.get(ticker, 0)
+            self._costs[ticker] = cost
+        else:
+            self._positions.pop(ticker, None)
+            self._total_exposure -= self._costs.pop(ticker, 0)
+
+    def _order(self, msg: dict) -> None:
+        self.order_updates += 1
+        self._update_order(msg)
+
+    def _update_order(self, msg: dict) -> None:
+        order_id = msg["order_id"]
+        order = self._orders.get(order_id)
+        if msg.get("status") in _CLOSED or msg.get("remaining_count") == 0:
+            if order is not None:
+                self._remove_order(order_id, order)
+            return
+        if order is None:
+            ticker = msg.get("ticker") or msg.get("market_ticker")
+            order = self._orders[order_id] = {"ticker": ticker}
+            self._by_ticker.setdefault(ticker, {})[order_id] = order
+        order.update(msg)
+
+    def _remove_order(self, order_id: str, order: dict) -> None:
+        del self._orders[order_id]
+        orders = self._by_ticker[order["ticker"]]
+        del orders[order_id]
+        if not orders:
+            del self._by_ticker[order["ticker"]]
+
+    def position(self, ticker: str) -> int:
+        """
+        Signed position in ``ticker``: positive for yes contracts, negative for no.
+        """
+        return self._positions.get(ticker, 0)
+
+    def positions(self) -> dict:
+        """
+        Every open position as ``{ticker: position}``.
+        """
+        return dict(self._positions)
+
+    def exposure(self, ticker: str = None) -> int:
+        """
+        Cost in cents of the open position in ``ticker``, or of all positions.
+        """
+        if ticker is None:
+            return self._total_exposure
+        return self._costs.get(ticker, 0)
+
+    def realized_pnl(self, ticker: str) -> int:
+        """
+        Realized P&L in cents of ``ticker``.
+        """
+        return self._realized.get(ticker, 0)
+
+    def order(self, order_id: str):
+        """
+        The resting order ``order_id``, or None.
+        """
+        return self._orders.get(order_id)
+
+    def open_orders(self, ticker: str = None) -> list:
+        """
+        Resting orders in ``ticker``, or in every market.
+        """
+        if ticker is None:
+            return list(self._orders.values())
+        return list(self._by_ticker.get(ticker, {}).values())
+
+    def resting_count(self, ticker: str, side: str = None) -> int:
+        """
+        Contracts resting in ``ticker``, optionally only on ``side``.
+        """
+        return sum(
+            order.get("remaining_count", 0)
+            for order in self._by_ticker.get(ticker, {}).values()
+            if side is None or order.get("side") == side
+        )
+
+    def load(self, balance: int, positions: list, orders: list) -> None:
+        """
+        Replace the state with a REST snapshot: the ``balance`` of GetBalance, the
+        ``market_positions`` records of GetPositions and the resting orders of GetOrders.
+        Position and order differences from the current state are counted in
+        ``mismatches`` and logged. Balance differences are expected, as fills do not
+        carry fees, and are only logged at debug level.
+        """
+        held = {p["ticker"]: p["position"] for p in positions if p.get("position")}
+        if self.loaded:
+            if balance != self.balance:
+                logger.debug("Portfolio reconcile moved balance by %s", balance - self.balance)
+            tickers = held.keys() | self._positions.keys()
+            differences = sum(held.get(t, 0) != self._positions.get(t, 0) for t in tickers)
+            differences += len({o["order_id"] for o in orders} ^ self._orders.keys())
+            if differences:
+                self.mismatches += differences
+                logger.warning("Portfolio reconcile corrected %s differences", differences)
+        self.balance = balance
+        self._positions = held
+        self._costs = {
+            p["ticker"]: p.get("market_exposure", 0) for p in positions if p["ticker"] in held
+        }
+        self._realized = {p["ticker"]: p.get("realized_pnl", 0) for p in positions}
+        self._total_exposure = sum(self._costs.values())
+        self._orders = {}
+        self._by_ticker = {}
+        for order in orders:
+            self._update_order(order)
+        self.loaded = True
+        self.reconciles += 1
+        self.last_reconcile = time.time()
+
+    def fetch(self) -> tuple:
+        """
+        Fetch ``(balance, positions, orders)`` from REST, blocking.
+        """
+        portfolio = self.portfolio
+        if portfolio is None:
+            from kalshi.rest import portfolio
+        balance = portfolio.GetBalance()["balance"]
+        positions = list(portfolio.IterPositions(limit=1000))
+        orders = list(portfolio.IterOrders(status="resting", limit=1000))
+        return balance, positions, orders
+
+    def refresh(self) -> None:
+        """
+        Load the state from REST, blocking. Use this when no websocket client keeps it current.
+        """
+        self.load(*self.fetch())
+
+    async def reconcile(self, force: bool = False) -> bool:
+        """
+        Fetch a REST snapshot on the default executor and load it, unless a fill or
+        order update arrived meanwhile. Returns whether it was loaded.
+        """
+        events = self.events
+        snapshot = await asyncio.get_running_loop().run_in_executor(None, self.fetch)
+        if self.events != events and not force:
+            self.skipped += 1
+            return False
+        self.load(*snapshot)
+        return True
+
+    def request_reconcile(self) -> None:
+        """
+        Make :meth:`run` reconcile now instead of at the next interval.
+        """
+        if self._wake is not None:
+            self._wake.set()
+
+    async def run(self) -> None:
+        """
+        Reconcile now and then every ``reconcile_interval`` seconds until cancelled.
+        :class:`~kalshi.websocket.Client` runs this while it is connected.
+        """
+        self._wake = asyncio.Event()
+        while True:
+            self._wake.clear()
+            try:
+                done = await self.reconcile(force=self._skips >= self.max_skips)
+            except Exception as e:
+                logger.error("Portfolio reconcile failed: %s", e)
+                done = False
+            self._skips = 0 if done else self._skips + 1
+            delay = self.reconcile_interval if done else self.retry_interval
+            try:
+                await asyncio.wait_for(self._wake.wait(), delay)
+            except asyncio.TimeoutError:
+                pass
+
+    def stats(self) -> dict:
+        return {
+            "loaded": self.loaded,
+            "positions": len(self._positions),
+            "open_orders": len(self._orders),
+            "fills": self.fills,
+            "order_updates": self.order_updates,
+            "reconciles": self.reconciles,
+            "skipped": self.skipped,
+            "mismatches": self.mismatches,
+            "last_reconcile": self.last_reconcile,
+        }
@@ -0,0 +1,390 @@
+"""
+Record raw websocket frames and replay them through a client.
+
+A :class:`Recorder` passed to :class:`~kalshi.websocket.Client` appends every
+received frame with its receive time (``time.time_ns()``) to a log directory.
+The log is a series of append-only segment files, each a header followed by
+compressed blocks. A block stores its frames column-wise: all timestamps, then
+all lengths, then the frame bytes back to back. Compression and disk writes
+happen on a background thread, so the socket reader only appends to a list.
+A block is written once it reaches ``block_size`` bytes or ``flush_interval``
+seconds after its first frame, and a crash loses at most that much. A truncated
+trailing block is ignored when reading.
+
+:class:`Replay` memory-maps the segments and feeds the frames back through
+:meth:`Client.process_frame <kalshi.websocket.Client.process_frame>`, so order
+books, sequence checks, the dispatcher and ``on_message`` behave as they did
+live. It replays in real time, ``speed`` times faster, or as fast as possible.
+
+Reading and replaying run at very different rates. :meth:`Replay.blocks` and
+:meth:`Replay.frames` only decompress and slice, and read over a million frames
+per second. :meth:`Replay.run` does not reach that: it is bounded by
+``process_frame``, and decoding a frame and applying it to the books each cost
+close to a microsecond, so the on_message and dispatcher path replays 0.2 to 0.3
+million frames per second (``benchmarks/bench_replay.py`` measures both).
+Decoding and applying whole blocks at once was measured to gain nothing. Bulk
+analysis that needs millions of frames per second should read the blocks and
+decode only the frames it needs.
+
+An empty frame marks the start of each connection; replay resets the client's
+sequence tracking there, as a reconnect does.
+"""
+import asyncio
+import mmap
+import os
+import queue
+import struct
+import threading
+import time
+import weakref
+import zlib
+from itertools import accumulate
+
+MAGIC = b"KWSLOG"
+VERSION = 1
+# Codec ids stored in the segment header.
+CODECS = {"none": 0, "zlib": 1}
+_FILE_HEADER = struct.Struct("<6sBB")
+# Compressed size, raw size, frame count, first and last receive time in ns.
+_BLOCK_HEADER = struct.Struct("<IIIqq")
+SEGMENT_SUFFIX = ".seg"
+
+
+def _segments(path: str) -> list:
+    if os.path.isfile(path):
+        return [path]
+    names = sorted(n for n in os.listdir(path) if n.endswith(SEGMENT_SUFFIX))
+    return [os.path.join(path, n) for n in names]
+
+
+class Recorder:
+    """
+    Appends frames to a segment log in ``path``, starting a new segment after the
+    existing ones. Thread-safe, but it records a single client: subscription ids
+    and seqs are per connection, so the frames of several clients in one log
+    could not be replayed apart. Give each client its own recorder and directory.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        compression: str = "zlib",
+        level: int = 1,
+        block_size: int = 256 * 1024,
+        segment_size: int = 64 * 1024 * 1024,
+        flush_interval: float = 1.0,
+    ):
+        """
+        :param path: Log directory, created if missing.
+        :param compression: ``"zlib"`` or ``"none"``.
+        :param level: zlib compression level; 1 favours speed.
+        :param block_size: Uncompressed bytes of frames per block.
+        :param segment_size: A new segment file is started once one reaches this size.
+        :param flush_interval: Longest time in seconds a frame waits in memory.
+        """
+        if compression not in CODECS:
+            raise ValueError(f"compression must be one of {tuple(CODECS)}, not {compression!r}")
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self.compression = compression
+        self.level = level
+        self.block_size = block_size
+        self.segment_size = segment_size
+        self.flush_interval_ns = int(flush_interval * 1e9)
+        self.frames = 0
+        self.bytes = 0
+        self.bytes_written = 0
+        self.blocks = 0
+        existing = _segments(path)
+        self._segment_index = (
+            int(os.path.basename(existing[-1])[: -len(SEGMENT_SUFFIX)]) + 1 if existing else 0
+        )
+        self._file = None
+        self._lock = threading.Lock()
+        self._times = []
+        self._data = []
+        self._size = 0
+        self._started = 0
+        self._queue = queue.Queue()
+        self._closed = False
+        self._client = None
+        self._writer = threading.Thread(
+            target=self._write_loop, name="kalshi-recorder", daemon=True
+        )
+        self._writer.start()
+
+    def attach(self, client) -> None:
+        """
+        Bind the recorder to ``client``.
+
+        :raises ValueError: Another client is already recording here.
+        """
+        with self._lock:
+            owner = self._client and self._client()
+            if owner is not None and owner is not client:
+                raise ValueError("a Recorder records one client; create one per client")
+            self._client = weakref.ref(client)
+
+    def record(self, frame, ts: int = None) -> None:
+        """
+        Append one frame.
+
+        :param frame: Frame payload as ``bytes`` or ``str``.
+        :param ts: Receive time in ns since the epoch (default = now).
+        """
+        if isinstance(frame, str):
+            frame = frame.encode()
+        if ts is None:
+            ts = time.time_ns()
+        with self._lock:
+            if not self._times:
+                self._started = ts
+            self._times.append(ts)
+            self._data.append(frame)
+            self._size += len(frame)
+            self.frames += 1
+            self.bytes += len(frame)
+            if self._size >= self.block_size or ts - self._started >= self.flush_interval_ns:
+                self._hand_off()
+
+    def mark_connection(self) -> None:
+        """
+        Record the start of a new connection.
+        """
+        self.record(b"")
+
+    def _hand_off(self) -> None:
+        """
+        Queue the pending frames as a block. Caller holds the lock.
+        """
+        if self._times:
+            self._queue.put((self._times, self._data))
+            self._times = []
+            self._data = []
+            self._size = 0
+
+    def flush(self) -> None:
+        """
+        Write every recorded frame and wait until it is on disk.
+        """
+        with self._lock:
+            self._hand_off()
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait()
+
+    def close(self) -> None:
+        """
+        Write every recorded frame and stop the writer thread.
+        """
+        if self._closed:
+            return
+        with self._lock:
+            self._hand_off()
+        self._queue.put(None)
+        self._writer.join()
+        self._closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _open_segment(self):
+        name = os.path.join(self.path, f"{self._segment_index:08d}{SEGMENT_SUFFIX}")
+        self._segment_index += 1
+        self._file = open(name, "ab")
+        self._file.write(_FILE_HEADER.pack(MAGIC, VERSION, CODECS[self.compression]))
+
+    def _write_block(self, times: list, data: list) -> None:
+        count = len(times)
+        raw = b"".join(
+            (
+                struct.pack(f"<{count}q", *times),
+                struct.pack(f"<{count}I", *map(len, data)),
+                *data,
+            )
+        )
+        payload = zlib.compress(raw, self.level) if self.compression == "zlib" else raw
+        if self._file is None or self._file.tell() >= self.segment_size:
+            if self._file is not None:
+                self._file.close()
+            self._open_segment()
+        self._file.write(_BLOCK_HEADER.pack(len(payload), len(raw), count, times[0], times[-1]))
+        self._file.write(payload)
+        self._file.flush()
+        self.bytes_written += _BLOCK_HEADER.size + len(payload)
+        self.blocks += 1
+
+    def _write_loop(self) -> None:
+        interval = self.flush_interval_ns / 1e9
+        while True:
+            try:
+                item = self._queue.get(timeout=interval)
+            except queue.Empty:
+                # Nothing arrived for a while: write frames that have waited too long.
+                with self._lock:
+                    if self._times and time.time_ns() - self._started >= self.flush_interval_ns:
+                        self._hand_off()
+                continue
+            if item is None:
+                break
+            if isinstance(item, threading.Event):
+                item.set()
+                continue
+            self._write_block(*item)
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def stats(self) -> dict:
+        return {
+            "frames": self.frames,
+            "bytes": self.bytes,
+            "bytes_written": self.bytes_written,
+            "blocks": self.blocks,
+            "ratio": self.bytes / self.bytes_written if self.bytes_written else 0.0,
+        }
+
+
+class Replay:
+    """
+    Reads a segment log written by :class:`Recorder` and replays it.
+    """
+
+    def __init__(self, path: str):
+        """
+        :param path: Log directory, or a single segment file.
+        """
+        self.path = path
+        self.segments = _segments(path)
+
+    def _blocks(self, start: int = None, end: int = None):
+        """
+        Yield ``(codec, view, body, end, header)`` for each complete block overlapping the
+        time range, ``view[body:end]`` being its payload. ``view`` is only valid until the
+        next block is requested, and slices of it must be released by then.
+        """
+        for segment in self.segments:
+            with open(segment, "rb") as f:
+                if os.fstat(f.fileno()).st_size <= _FILE_HEADER.size:
+                    continue
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    magic, version, codec = _FILE_HEADER.unpack_from(mm, 0)
+                    if magic != MAGIC or version != VERSION:
+                        raise ValueError(f"{segment} is not a version {VERSION} frame log")
+                    view = memoryview(mm)
+                    try:
+                        pos = _FILE_HEADER.size
+                        size = len(mm)
+                        while pos + _BLOCK_HEADER.size <= size:
+                            header = _BLOCK_HEADER.unpack_from(mm, pos)
+                            body = pos + _BLOCK_HEADER.size
+                            pos = body + header[0]
+                            if pos > size:
+                                break
+                            if start is not None and header[4] < start:
+                                continue
+                            if end is not None and header[3] > end:
+                                return
+                            yield codec, view, body, pos, header
+                    finally:
+                        view.release()
+
+    def blocks(self, start: int = None, end: int = None):
+        """
+        Yield the log one block at a time as ``(times, frames)``: the receive times in
+        ns and the raw frames as ``bytes``. Cheaper than :meth:`frames` for bulk reads.
+
+        :param start: Skip frames received before this time (ns since the epoch).
+        :param end: Stop after frames received at this time.
+        """
+        for codec, view, body, stop, (_, raw_size, count, _, _) in self._blocks(start, end):
+            with view[body:stop] as payload:
+                raw = zlib.decompress(payload, bufsize=raw_size) if codec else bytes(payload)
+            times = struct.unpack_from(f"<{count}q", raw, 0)
+            lengths = struct.unpack_from(f"<{count}I", raw, 8 * count)
+            offsets = list(accumulate(lengths, initial=12 * count))
+            frames = list(map(raw.__getitem__, map(slice, offsets, offsets[1:])))
+            if (start is not None and times[0] < start) or (end is not None and times[-1] > end):
+                keep = [
+                    i
+                    for i, ts in enumerate(times)
+                    if (start is None or ts >= start) and (end is None or ts <= end)
+                ]
+                times = tuple(times[i] for i in keep)
+                frames = [frames[i] for i in keep]
+            yield times, frames
+
+    def frames(self, start: int = None, end: int = None):
+        """
+        Yield ``(ts, frame)`` for every recorded frame, ``ts`` being the receive time
+        in ns and ``frame`` the raw bytes. Empty frames mark new connections.
+
+        :param start: Skip frames received before this time (ns since the epoch).
+        :param end: Stop after frames received at this time.
+        """
+        for times, frames in self.blocks(start, end):
+            yield from zip(times, frames)
+
+    def count(self) -> int:
+        """
+        Number of recorded frames, read from the block headers without decompressing.
+        """
+        return sum(block[-1][2] for block in self._blocks())
+
+    def time_range(self):
+        """
+        ``(first, last)`` receive times in ns, or None for an empty log.
+        """
+        first = last = None
+        for *_, header in self._blocks():
+            if first is None:
+                first = header[3]
+            last = header[4]
+        return None if first is None else (first, last)
+
+    async def run(self, client, speed: float = None, start: int = None, end: int = None) -> int:
+        """
+        Feed the frames to ``client.process_frame`` and return how many were replayed.
+        Throughput is that of ``process_frame``; use :meth:`blocks` to read faster.
+
+        :param client: A :class:`~kalshi.websocket.Client`; it does not need to be connected.
+        :param speed: 1 replays in real time, N at N times real time, None as fast as possible.
+        :param start: Skip frames received before this time (ns since the epoch).
+        :param end: Stop after frames received at this time.
+        """
+        process_frame = client.process_frame
+        replayed = 0
+        if not speed:
+            for _, frames in self.blocks(start, end):
+                for frame in frames:
+                    if frame:
+                        await process_frame(frame)
+                    else:
+                        _reset(client)
+                replayed += len(frames)
+                # Let dispatcher workers and other tasks run between blocks.
+                await asyncio.sleep(0)
+            return replayed
+        origin = None
+        for ts, frame in self.frames(start, end):
+            if origin is None:
+                origin = ts
+                wall = time.perf_counter()
+            ahead = (ts - origin) / 1e9 / speed - (time.perf_counter() - wall)
+            if ahead > 0.001:
+                await asyncio.sleep(ahead)
+            if frame:
+                await process_frame(frame)
+            else:
+                _reset(client)
+            replayed += 1
+        return replayed
+
+
+def _reset(client) -> None:
+    # Mirror a fresh connection: sequence numbers and subscription ids restart.
+    client._seqs.clear()
+    client._sid_tickers.clear()
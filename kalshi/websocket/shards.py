@@ -0,0 +1,436 @@
+"""
+Spread a large ticker universe across several websocket connections.
+
+One :class:`~kalshi.websocket.Client` reads one socket on one coroutine, which
+becomes the bottleneck when thousands of markets stream ``orderbook_delta``.
+A :class:`ShardManager` assigns every ticker to one of N :class:`Shard`
+connections and funnels their messages into a single stream: its own
+``on_message`` or a shared :class:`~kalshi.websocket.Dispatcher`, exactly as
+for a single client.
+
+Each shard counts the messages of its tickers. Every ``rebalance_interval``
+seconds the manager compares the shards' message rates and moves hot tickers
+from the busiest shard to the quietest (see :func:`plan_moves`). A move first
+removes the ticker from its old shard with ``update_subscription`` and waits
+for the acknowledgement, so no further messages for it arrive there, then adds
+it to the new shard, whose snapshot reloads the order book.
+"""
+import asyncio
+import logging
+import time
+
+from .. import codec
+from .client import Client
+
+logger = logging.getLogger(__name__)
+
+# Seconds to wait for the server to acknowledge a command before going on.
+COMMAND_TIMEOUT = 5.0
+
+
+def plan_moves(loads: list, tolerance: float = 1.25, max_moves: int = 20) -> list:
+    """
+    Choose tickers to move so that no shard carries much more than its share.
+
+    Repeatedly takes the busiest and the quietest shard and, while the busiest is
+    above ``tolerance`` times the mean, moves the ticker whose rate is closest to
+    half the difference between them. Only moves that shrink that difference are made.
+
+    :param loads: Per shard, a dict of ticker -> observed message rate.
+    :param tolerance: Allowed ratio of a shard's rate to the mean rate.
+    :param max_moves: Upper bound on the number of moves.
+    :return: ``(ticker, from_shard, to_shard)`` tuples, in the order to apply them.
+    """
+    loads = [dict(load) for load in loads]
+    totals = [sum(load.values()) for load in loads]
+    if len(loads) < 2 or not sum(totals):
+        return []
+    mean = sum(totals) / len(totals)
+    moves = []
+    while len(moves) < max_moves:
+        hot = max(range(len(totals)), key=totals.__getitem__)
+        cold = min(range(len(totals)), key=totals.__getitem__)
+        gap = totals[hot] - totals[cold]
+        if totals[hot] <= tolerance * mean:
+            break
+        candidates = [
+            (abs(gap / 2 - rate), ticker) for ticker, rate in loads[hot].items() if 0 < rate < gap
+        ]
+        if not candidates:
+            break
+        _, ticker = min(candidates)
+        rate = loads[hot].pop(ticker)
+        loads[cold][ticker] = rate
+        totals[hot] -= rate
+        totals[cold] += rate
+        moves.append((ticker, hot, cold))
+    return moves
+
+
+class Shard(Client):
+    """
+    One connection of a :class:`ShardManager`, subscribed to the manager's channels
+    for the tickers assigned to it. Its messages are handed to the manager.
+    """
+
+    def __init__(self, manager: "ShardManager", index: int, tickers=()):
+        super().__init__(
+            orderbooks=manager.orderbooks,
+            auth=manager.auth,
+            market=manager.market,
+            url=manager.url,
+        )
+        self.manager = manager
+        self.index = index
+        self.tickers = set(tickers)
+        self.connected = False
+        self.connects = 0
+        self.messages = 0
+        self.bytes = 0
+        self.gaps = 0
+        self.errors = 0
+        self.last_message = None
+        # Messages per ticker since the manager last looked, and when it did.
+        self.counts = {}
+        self.counted_since = time.monotonic()
+        self.rate = 0.0
+        # Subscription ids of this connection, with their channels.
+        self.sids = {}
+        self._pending = {}
+
+    async def on_open(self):
+        await self._subscribe_all()
+
+    async def on_reconnect(self):
+        await self._subscribe_all()
+
+    async def _subscribe_all(self):
+        self.connected = True
+        self.connects += 1
+        self.sids.clear()
+        self.subscriptions = []
+        if self.tickers:
+            await self.subscribe(self.manager.channels, sorted(self.tickers))
+
+    async def handler(self):
+        try:
+            await super().handler()
+        finally:
+            self.connected = False
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_result(None)
+            self._pending.clear()
+
+    async def process_frame(self, frame):
+        self.bytes += len(frame)
+        await super().process_frame(frame)
+
+    async def on_gap(self, sid: int, expected: int, received: int, message: dict):
+        self.gaps += 1
+        await super().on_gap(sid, expected, received, message)
+
+    async def on_error(self, error):
+        self.errors += 1
+        logger.error("Shard %s: %s", self.index, error)
+
+    async def on_close(self, close_status_code, close_msg):
+        logger.warning(
+            "Shard %s closed with code=%s, message=%s", self.index, close_status_code, close_msg
+        )
+
+    async def on_message(self, message: dict):
+        self.messages += 1
+        self.last_message = time.monotonic()
+        msg = message.get("msg") or {}
+        kind = message.get("type")
+        if kind == "subscribed":
+            self.sids[msg.get("sid")] = msg.get("channel")
+        elif kind == "unsubscribed":
+            self.sids.pop(message.get("sid"), None)
+        if kind in ("ok", "error", "unsubscribed"):
+            future = self._pending.pop(message.get("id"), None)
+            if future is not None and not future.done():
+                future.set_result(message)
+        ticker = msg.get("market_ticker")
+        if ticker is not None:
+            counts = self.counts
+            counts[ticker] = counts.get(ticker, 0) + 1
+        await self.manager.deliver(self, message)
+
+    async def command(self, cmd: str, params: dict, timeout: float = COMMAND_TIMEOUT):
+        """
+        Send a command and wait for its ``ok``, ``error`` or ``unsubscribed`` response.
+        Returns the response, or None if the connection dropped or the wait timed out.
+        """
+        message_id = self.message_id
+        self.message_id += 1
+        future = self._pending[message_id] = asyncio.get_running_loop().create_future()
+        await self.ws.send(codec.dumps({"id": message_id, "cmd": cmd, "params": params}))
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            self._pending.pop(message_id, None)
+            logger.warning("Shard %s: no response to %s", self.index, cmd)
+            return None
+
+    async def add(self, tickers: list) -> None:
+        """
+        Start streaming ``tickers`` on this connection.
+        """
+        new = [t for t in tickers if t not in self.tickers]
+        self.tickers.update(new)
+        if not new or not self.connected:
+            return
+        if self.sids:
+            await self.command(
+                "update_subscription",
+                {"sids": list(self.sids), "market_tickers": new, "action": "add_markets"},
+            )
+        else:
+            await self.subscribe(self.manager.channels, new)
+
+    async def remove(self, tickers: list) -> None:
+        """
+        Stop streaming ``tickers`` on this connection. Returns once the server has
+        acknowledged, so no more of their messages arrive here.
+        """
+        gone = [t for t in tickers if t in self.tickers]
+        self.tickers.difference_update(gone)
+        for ticker in gone:
+            self.counts.pop(ticker, None)
+        for tickers_of_sid in self._sid_tickers.values():
+            tickers_of_sid.difference_update(gone)
+        if not gone or not self.connected or not self.sids:
+            return
+        if self.tickers:
+            await self.command(
+                "update_subscription",
+                {"sids": list(self.sids), "market_tickers": gone, "action": "delete_markets"},
+            )
+        else:
+            # A subscription without tickers would stream every market, so drop it.
+            await self.command("unsubscribe", {"sids": list(self.sids)})
+            self.sids.clear()
+
+    def take_counts(self) -> dict:
+        """
+        Return the message rate per ticker since the previous call and start counting anew.
+        """
+        now = time.monotonic()
+        elapsed = max(now - self.counted_since, 1e-9)
+        counts, self.counts = self.counts, {}
+        self.counted_since = now
+        rates = {ticker: counts.get(ticker, 0) / elapsed for ticker in self.tickers}
+        self.rate = sum(rates.values())
+        return rates
+
+    def stats(self) -> dict:
+        return {
+            "connected": self.connected,
+            "connects": self.connects,
+            "tickers": len(self.tickers),
+            "messages": self.messages,
+            "bytes": self.bytes,
+            "rate": self.rate,
+            "last_message_age": (
+                time.monotonic() - self.last_message if self.last_message is not None else None
+            ),
+            "gaps": self.gaps,
+            "errors": self.errors,
+        }
+
+
+class ShardManager:
+    """
+    Streams ``channels`` for many tickers over ``shards`` websocket connections and
+    presents their messages as one stream.
+
+    Override :meth:`on_message`, or pass a :class:`~kalshi.websocket.Dispatcher`,
+    to handle messages from every shard. Order books, when given, are shared by
+    all shards; each ticker is only ever streamed by one of them.
+    """
+
+    def __init__(
+        self,
+        channels: list,
+        tickers: list = (),
+        shards: int = 4,
+        orderbooks=None,
+        dispatcher=None,
+        auth=None,
+        market=None,
+        url: str = None,
+        rebalance_interval: float = 30.0,
+        tolerance: float = 1.25,
+        max_moves: int = 20,
+    ):
+        """
+        :param channels: Channels every shard subscribes to, e.g. ``["orderbook_delta"]``.
+        :param tickers: Initial market tickers, dealt round-robin across the shards.
+        :param shards: Number of connections.
+        :param orderbooks: Optional :class:`~kalshi.websocket.OrderBooks` kept current by every shard.
+        :param dispatcher: Optional dispatcher receiving the messages of every shard.
+        :param auth: Credentials signing the connections (default = ``kalshi.auth.auth``).
+        :param market: REST market resource used to resync order books (default = ``kalshi.rest.market``).
+        :param url: Websocket endpoint (default = the client default).
+        :param rebalance_interval: Seconds between rebalancing rounds; 0 or None disables them.
+        :param tolerance: Allowed ratio of a shard's message rate to the mean before tickers move.
+        :param max_moves: Maximum tickers moved per rebalancing round.
+        """
+        if shards < 1:
+            raise ValueError("shards must be at least 1")
+        self.channels = list(channels)
+        self.orderbooks = orderbooks
+        self.dispatcher = dispatcher
+        self.auth = auth
+        self.market = market
+        self.url = url
+        self.rebalance_interval = rebalance_interval
+        self.tolerance = tolerance
+        self.max_moves = max_moves
+        self.moves = 0
+        self.rebalances = 0
+        self.shards = [Shard(self, i) for i in range(shards)]
+        for i, ticker in enumerate(dict.fromkeys(tickers)):
+            self.shards[i % shards].tickers.add(ticker)
+        # Held while add, remove, move or rebalance change ticker assignments, so a
+        # ticker is never subscribed on two shards.
+        self._lock = asyncio.Lock()
+        self._tasks = []
+
+    def shard_of(self, ticker: str):
+        """
+        The shard currently streaming ``ticker``, or None.
+        """
+        for shard in self.shards:
+            if ticker in shard.tickers:
+                return shard
+        return None
+
+    async def connect(self, reconnect: bool = True, backoff: float = 0.1, max_backoff: float = 30.0):
+        """
+        Connect every shard and rebalance periodically until :meth:`close` is called.
+        Takes the reconnection arguments of :meth:`Client.connect`.
+        """
+        self._tasks = [
+            asyncio.ensure_future(
+                shard.connect(reconnect=reconnect, backoff=backoff, max_backoff=max_backoff)
+            )
+            for shard in self.shards
+        ]
+        if self.rebalance_interval:
+            self._tasks.append(asyncio.ensure_future(self._rebalance_loop()))
+        try:
+            await asyncio.gather(*self._tasks[: len(self.shards)])
+        finally:
+            for task in self._tasks[len(self.shards) :]:
+                task.cancel()
+
+    async def close(self) -> None:
+        """
+        Close every connection and stop rebalancing.
+        """
+        for shard in self.shards:
+            await shard.close()
+
+    async def add(self, tickers: list) -> None:
+        """
+        Stream more tickers, each on the shard with the lowest message rate and,
+        among equals, the fewest tickers.
+        """
+        async with self._lock:
+            for ticker in dict.fromkeys(tickers):
+                if self.shard_of(ticker) is None:
+                    shard = min(self.shards, key=lambda s: (s.rate, len(s.tickers)))
+                    await shard.add([ticker])
+
+    async def remove(self, tickers: list) -> None:
+        """
+        Stop streaming ``tickers``.
+        """
+        async with self._lock:
+            for shard in self.shards:
+                owned = [t for t in tickers if t in shard.tickers]
+                if owned:
+                    await shard.remove(owned)
+
+    async def move(self, ticker: str, to: int) -> None:
+        """
+        Move ``ticker`` to shard ``to``: removed from its current shard first, then
+        added, so its messages never come from two connections at once.
+        """
+        async with self._lock:
+            await self._move(ticker, to)
+
+    async def _move(self, ticker: str, to: int) -> None:
+        source = self.shard_of(ticker)
+        target = self.shards[to]
+        if source is target:
+            return
+        if source is not None:
+            await source.remove([ticker])
+        await target.add([ticker])
+        self.moves += 1
+        logger.info(
+            "Moved %s from shard %s to shard %s",
+            ticker,
+            source.index if source is not None else None,
+            to,
+        )
+
+    async def rebalance(self) -> list:
+        """
+        Measure each shard's message rate per ticker since the last round and move
+        tickers according to :func:`plan_moves`. Returns the moves made.
+        """
+        async with self._lock:
+            loads = [shard.take_counts() for shard in self.shards]
+            moves = plan_moves(loads, self.tolerance, self.max_moves)
+            self.rebalances += 1
+            for ticker, _, to in moves:
+                await self._move(ticker, to)
+        return moves
+
+    async def _rebalance_loop(self):
+        while True:
+            await asyncio.sleep(self.rebalance_interval)
+            try:
+                await self.rebalance()
+            except Exception as e:
+                await self.on_error(e)
+
+    async def deliver(self, shard: Shard, message: dict) -> None:
+        """
+        Pass a message from ``shard`` to the dispatcher or :meth:`on_message`.
+        """
+        dispatcher = self.dispatcher
+        if dispatcher is not None:
+            channel = shard.sids.get(message.get("sid"))
+            if await dispatcher.dispatch(message, channel=channel):
+                return
+        await self.on_message(message)
+
+    async def on_message(self, message: dict):
+        """
+        Called for every message of every shard that no dispatcher route took.
+        Override this method to implement custom processing logic.
+        """
+        logger.debug("Received message: %s", str(message))
+
+    async def on_error(self, error):
+        """
+        Called when a rebalancing round fails.
+        """
+        logger.error("Rebalancing failed: %s", error)
+
+    def stats(self) -> dict:
+        """
+        Health of every shard, plus the manager's rebalancing counters.
+        """
+        return {
+            "shards": [shard.stats() for shard in self.shards],
+            "messages": sum(shard.messages for shard in self.shards),
+            "moves": self.moves,
+            "rebalances": self.rebalances,
+        }
@@ -13,6 +13,7 @@ setup(
     url="https://github.com/humz2k/kalshi-python-unofficial",  # Replace with your repo URL
     packages=find_packages(exclude=["tests", "tests.*"]),
     install_requires=["websockets>=10.0", "Requests", "cryptography"],
+    extras_require={"async": ["aiohttp>=3.8"], "fast": ["orjson"]},
     classifiers=[
         "Programming Language :: Python :: 3",
         "License :: OSI Approved :: MIT License",  # Choose your license